@@ -1,7 +1,13 @@
 import NXOpen
 import NXOpen.Features
 import math
-from itertools import combinations
+import os
+import sys
+
+# sketchprofiles.py liegt neben dem Journal
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sketchprofiles import find_closed_profiles, segment_from_curve
 
 # Konvertiert Edge-Typen in lesbare Strings
 def edge_type_to_string(edge_type):
@@ -267,13 +273,14 @@ def check_pattern_feature(all_edges):
             return False
     return True
 
-# Analysiert Kanten für Rechtecke
+# Analysiert die Skizzenkurven auf geschlossene Profile und gibt die gefundenen Rechtecke aus
 def analyze_edges_for_rectangle(lw, all_edges, sketch):
     found_edges = []
-    for combo in combinations(all_edges, 4):
-        if is_rectangle(combo):
-            print_rectangle_details(lw, combo, sketch)
-            found_edges.extend(combo)
+    segments = [segment for segment in map(segment_from_curve, all_edges) if segment is not None]
+    for profile in find_closed_profiles(segments):
+        if profile.shape == "Rechteck":
+            print_rectangle_details(lw, profile, sketch)
+            found_edges.extend(segment.curve for segment in profile.segments)
     return found_edges
 
 # Gibt Details eines Kreises aus
@@ -284,20 +291,11 @@ def print_circle_details(lw, circle, sketch):
     return circle
 
 # Gibt Details eines Rechtecks aus
-def print_rectangle_details(lw, rectangle_edges, sketch):
-    lengths = sorted([edge.GetLength() for edge in rectangle_edges])
+def print_rectangle_details(lw, profile, sketch):
+    lengths = sorted(profile.side_lengths)
     lw.WriteLine(f"Rechteck gefunden in Skizze: {sketch.Name}")
     lw.WriteLine(f"Seitenlängen: {lengths[0]:.3f}, {lengths[2]:.3f} (Länge, Breite)")
-    return rectangle_edges
-
-# Überprüft, ob die gegebenen Kanten ein Rechteck bilden
-def is_rectangle(edges):
-    # Sort the edges by length
-    sorted_edges = sorted(edges, key=lambda e: e.GetLength())
-    # Check if two pairs of edges are each of equal length
-    if math.isclose(sorted_edges[0].GetLength(), sorted_edges[1].GetLength()) and math.isclose(sorted_edges[2].GetLength(), sorted_edges[3].GetLength()):
-        return True
-    return False
+    return profile
 
 def get_curve_length(curve):
     """
@@ -1,6 +1,13 @@
 import NXOpen
 import NXOpen.Features
 import math
+import os
+import sys
+
+# sketchprofiles.py liegt neben dem Journal
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sketchprofiles import find_closed_profiles, segment_from_curve
 
 def edge_type_to_string(edge_type):
     edge_type_mapping = {
@@ -99,16 +106,6 @@ def list_features_and_geometries():
 
     lw.Close()
 
-def is_rectangle(edges):
-    if len(edges) != 4:
-        return False
-    # Sortiere die Kanten nach Länge
-    sorted_edges = sorted(edges, key=lambda e: e.GetLength())
-    # Prüfe, ob zwei Paare von Kanten jeweils gleich lang sind
-    if math.isclose(sorted_edges[0].GetLength(), sorted_edges[1].GetLength()) and math.isclose(sorted_edges[2].GetLength(), sorted_edges[3].GetLength()):
-        return True
-    return False
-
 def list_geometry_properties_in_sketches():
     theSession = NXOpen.Session.GetSession()
     workPart = theSession.Parts.Work
@@ -123,26 +120,27 @@ def list_geometry_properties_in_sketches():
 
     for sketch_idx, sketch in enumerate(workPart.Sketches, start=1):
         lw.WriteLine(f"Skizze {sketch_idx}: {sketch.Name}")
-        all_edges = []
+        segments = []
         circles = []
 
         for curve in sketch.GetAllGeometry():
             if isinstance(curve, NXOpen.Arc):
                 circles.append(curve)
-            elif isinstance(curve, NXOpen.Line):
-                all_edges.append(curve)
+            segment = segment_from_curve(curve)
+            if segment is not None:
+                segments.append(segment)
 
         lw.WriteLine("\n")
 
-        # Suche nach Rechtecken
-        if len(all_edges) >= 4:
-            # Prüfe jede mögliche Kombination von vier Kanten
-            from itertools import combinations
-            for combo in combinations(all_edges, 4):
-                if is_rectangle(combo):
-                    lengths = sorted([e.GetLength() for e in combo])
-                    lw.WriteLine(f"Rechteck gefunden in Skizze: {sketch.Name}")
-                    lw.WriteLine(f"Seitenlängen: {lengths[0]:.3f}, {lengths[2]:.3f} (Länge, Breite)")
+        # Suche nach geschlossenen Profilen über die verbundenen Endpunkte der Skizzenkurven
+        for profile in find_closed_profiles(segments):
+            lengths = sorted(profile.side_lengths)
+            if profile.shape == "Rechteck":
+                lw.WriteLine(f"Rechteck gefunden in Skizze: {sketch.Name}")
+                lw.WriteLine(f"Seitenlängen: {lengths[0]:.3f}, {lengths[2]:.3f} (Länge, Breite)")
+            elif profile.shape != "Kreis":
+                lw.WriteLine(f"{profile.shape} gefunden in Skizze: {sketch.Name}")
+                lw.WriteLine(f"Seitenlängen: {', '.join(f'{length:.3f}' for length in profile.side_lengths)}")
 
         for circle in circles:
             lw.WriteLine(f"Kreis gefunden in Skizze: {sketch.Name}")
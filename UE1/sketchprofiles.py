@@ -0,0 +1,184 @@
+import math
+from collections import defaultdict, namedtuple
+
+# Ein Skizzensegment mit Endpunkten; center und radius nur bei Bögen
+ProfileSegment = namedtuple("ProfileSegment", "curve kind start end length center radius")
+# Ein geschlossener Linienzug: Form ("Rechteck", "Langloch", "Polygon", "Kreis", "Kontur"),
+# Segmente in Umlaufrichtung und die Seitenlängen nach dem Zusammenfassen kollinearer Linien
+ClosedProfile = namedtuple("ClosedProfile", "shape segments side_lengths")
+
+# Endpunkte werden auf dieses Raster gerundet, um gemeinsame Eckpunkte zu erkennen
+POINT_TOLERANCE = 1e-4
+# Toleranz für Winkel (Bogenmaß) und Längenvergleiche
+ANGLE_TOLERANCE = 1e-3
+LENGTH_TOLERANCE = 1e-6
+
+
+def _point(point3d):
+    return (point3d.X, point3d.Y, point3d.Z)
+
+
+def segment_from_curve(curve):
+    """
+    Liest Endpunkte und Länge einer Skizzenkurve einmal aus. Liefert None für Kurven,
+    die weder Linie noch Bogen sind. Nur diese Funktion greift auf NX zu; NXOpen wird erst
+    hier importiert, damit Verbindungsgraph und Klassifizierung ohne NX nutzbar bleiben.
+    Die Endpunkte eines Bogens liefert UF_MODL_ask_curve_props an den normierten Parametern
+    0 und 1, ohne Umweg über die Bogenmatrix.
+    """
+    import NXOpen
+    import NXOpen.UF
+
+    if isinstance(curve, NXOpen.Line):
+        return line_segment(curve, _point(curve.StartPoint), _point(curve.EndPoint))
+    if isinstance(curve, NXOpen.Arc):
+        uf_session = NXOpen.UF.UFSession.GetUFSession()
+        start = tuple(uf_session.Modl.AskCurveProps(curve.Tag, 0.0)[0])
+        end = tuple(uf_session.Modl.AskCurveProps(curve.Tag, 1.0)[0])
+        return arc_segment(curve, start, end, curve.GetLength(), _point(curve.CenterPoint), curve.Radius)
+    return None
+
+
+def arc_segment(curve, start, end, length, center, radius):
+    """Bogensegment aus bereits gelesenen Werten (auch für Tests ohne NX)."""
+    return ProfileSegment(curve, "Arc", tuple(start), tuple(end), length, tuple(center), radius)
+
+
+def line_segment(curve, start, end):
+    """Liniensegment aus bereits gelesenen Endpunkten (auch für Tests ohne NX)."""
+    return ProfileSegment(curve, "Line", tuple(start), tuple(end), math.dist(start, end), None, None)
+
+
+def _key(point):
+    return tuple(round(value / POINT_TOLERANCE) for value in point)
+
+
+def _direction(start, end):
+    length = math.dist(start, end)
+    return tuple((end[i] - start[i]) / length for i in range(3)) if length > 0 else (0.0, 0.0, 0.0)
+
+
+def _turn_angle(first, second):
+    # Richtungsänderung zwischen zwei aufeinanderfolgenden Seiten
+    dot = sum(a * b for a, b in zip(first, second))
+    return math.acos(max(-1.0, min(1.0, dot)))
+
+
+def _isclose(first, second):
+    return math.isclose(first, second, rel_tol=LENGTH_TOLERANCE, abs_tol=LENGTH_TOLERANCE)
+
+
+def connectivity_graph(segments):
+    """
+    Verbindungsgraph der Segmente: Eckpunkte sind die gerundeten Endpunkte, jeder Eckpunkt
+    kennt die Segmente, die an ihm enden. Aufbau in O(n) über ein Dictionary.
+    """
+    vertex_segments = defaultdict(list)
+    segment_vertices = []
+    for segment_idx, segment in enumerate(segments):
+        start_key, end_key = _key(segment.start), _key(segment.end)
+        segment_vertices.append((start_key, end_key))
+        vertex_segments[start_key].append(segment_idx)
+        if end_key != start_key:
+            vertex_segments[end_key].append(segment_idx)
+    return vertex_segments, segment_vertices
+
+
+def _walk_cycle(first_idx, vertex_segments, segment_vertices, visited):
+    """
+    Läuft von einem Segment aus den Linienzug entlang. Liefert die Segmente in Umlaufrichtung
+    mit ihrer Orientierung (True = von start nach end durchlaufen) oder None, wenn der Zug
+    offen ist oder sich verzweigt.
+    """
+    start_key, current_key = segment_vertices[first_idx]
+    cycle = [(first_idx, True)]
+    visited.add(first_idx)
+    closed = True
+    while current_key != start_key:
+        neighbours = vertex_segments[current_key]
+        if len(neighbours) != 2:
+            closed = False
+            break
+        next_idx = neighbours[0] if neighbours[1] == cycle[-1][0] else neighbours[1]
+        if next_idx in visited:
+            closed = False
+            break
+        visited.add(next_idx)
+        forward = segment_vertices[next_idx][0] == current_key
+        cycle.append((next_idx, forward))
+        current_key = segment_vertices[next_idx][1] if forward else segment_vertices[next_idx][0]
+    if closed and (len(cycle) == 1 or len(vertex_segments[start_key]) == 2):
+        return cycle
+    return None
+
+
+def _merge_collinear_lines(oriented):
+    """Fasst aufeinanderfolgende kollineare Linien zu einer Seite zusammen (geteilte Rechteckseiten)."""
+    sides = []
+    for segment, start, end in oriented:
+        direction = _direction(start, end)
+        if sides and segment.kind == "Line" and sides[-1][0] == "Line" and _turn_angle(sides[-1][3], direction) < ANGLE_TOLERANCE:
+            kind, side_start, _, side_direction, length = sides[-1]
+            sides[-1] = (kind, side_start, end, side_direction, length + segment.length)
+        else:
+            sides.append((segment.kind, start, end, direction, segment.length))
+    if len(sides) > 1 and sides[0][0] == "Line" and sides[-1][0] == "Line" and _turn_angle(sides[-1][3], sides[0][3]) < ANGLE_TOLERANCE:
+        kind, _, end, direction, length = sides[0]
+        last_start, last_length = sides[-1][1], sides[-1][4]
+        sides[0] = (kind, last_start, end, direction, length + last_length)
+        sides.pop()
+    return sides
+
+
+def classify_profile(segments):
+    """
+    Bestimmt die Form eines geschlossenen Linienzugs aus Winkeln und Seitenlängen.
+    segments ist eine Liste von (Segment, Start, Ende) in Umlaufrichtung.
+    """
+    sides = _merge_collinear_lines(segments)
+    kinds = [side[0] for side in sides]
+    lengths = [side[4] for side in sides]
+
+    if kinds == ["Arc"]:
+        return "Kreis", lengths
+    if all(kind == "Line" for kind in kinds):
+        turns = [_turn_angle(sides[idx][3], sides[(idx + 1) % len(sides)][3]) for idx in range(len(sides))]
+        if len(sides) == 4 and all(abs(turn - math.pi / 2) < ANGLE_TOLERANCE for turn in turns) \
+                and _isclose(lengths[0], lengths[2]) and _isclose(lengths[1], lengths[3]):
+            return "Rechteck", lengths
+        if len(sides) >= 3:
+            return "Polygon", lengths
+    if len(sides) == 4 and sorted(kinds) == ["Arc", "Arc", "Line", "Line"] \
+            and all(kinds[idx] != kinds[(idx + 1) % 4] for idx in range(4)):
+        arcs = [segment for segment, _, _ in segments if segment.kind == "Arc"]
+        lines = [side for side in sides if side[0] == "Line"]
+        if len(arcs) == 2 and _isclose(arcs[0].radius, arcs[1].radius) and _isclose(lines[0][4], lines[1][4]) \
+                and abs(_turn_angle(lines[0][3], lines[1][3]) - math.pi) < ANGLE_TOLERANCE \
+                and all(_isclose(arc.length, math.pi * arc.radius) for arc in arcs):
+            return "Langloch", lengths
+    return "Kontur", lengths
+
+
+def find_closed_profiles(segments):
+    """
+    Findet alle geschlossenen Linienzüge einer Skizze in O(n): Verbindungsgraph über gerundete
+    Endpunkte, danach ein Umlauf je Zusammenhangskomponente. Nur Züge, in denen jeder Eckpunkt
+    genau zwei Segmente verbindet, gelten als geschlossenes Profil.
+    """
+    vertex_segments, segment_vertices = connectivity_graph(segments)
+    visited = set()
+    profiles = []
+    for segment_idx in range(len(segments)):
+        if segment_idx in visited:
+            continue
+        cycle = _walk_cycle(segment_idx, vertex_segments, segment_vertices, visited)
+        if cycle is None:
+            continue
+        oriented = [
+            (segments[idx], segments[idx].start, segments[idx].end) if forward
+            else (segments[idx], segments[idx].end, segments[idx].start)
+            for idx, forward in cycle
+        ]
+        shape, side_lengths = classify_profile(oriented)
+        profiles.append(ClosedProfile(shape, [segment for segment, _, _ in oriented], side_lengths))
+    return profiles
@@ -0,0 +1,168 @@
+import os
+import time
+from collections import namedtuple
+
+from results import GradingResult, append_result
+from snapshotcache import part_file_hash
+
+PART_SUFFIX = ".prt"
+
+# Ein zu prüfendes Teil mit der Übung ("ue1", "vt1", ...), deren Prüfungen laufen sollen
+BatchItem = namedtuple("BatchItem", "part_path exercise")
+# Ausgang der Prüfung eines Teils; status "ok", "ladefehler" oder "pruefungsfehler"
+BatchOutcome = namedtuple("BatchOutcome", "part_path exercise status error seconds result")
+
+
+def parts_in_directory(directory, exercise):
+    """Alle Teiledateien unterhalb eines Verzeichnisses in fester (sortierter) Reihenfolge."""
+    items = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(PART_SUFFIX):
+                items.append(BatchItem(os.path.join(root, name), exercise))
+    return items
+
+
+def read_manifest(path, default_exercise):
+    """
+    Liest eine Liste zu prüfender Teile: je Zeile ein Pfad, optional gefolgt von ";" und der Übung.
+    Relative Pfade beziehen sich auf das Verzeichnis der Liste, Zeilen mit # sind Kommentare.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    items = []
+    with open(path, encoding="utf-8") as manifest:
+        for line in manifest:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            part_path, _, exercise = (entry.strip() for entry in line.partition(";"))
+            items.append(BatchItem(os.path.join(base, part_path), exercise or default_exercise))
+    return items
+
+
+def collect_parts(source, default_exercise):
+    """Teile aus einem Verzeichnis oder aus einer Liste (siehe read_manifest)."""
+    if os.path.isdir(source):
+        return parts_in_directory(source, default_exercise)
+    return read_manifest(source, default_exercise)
+
+
+def default_results_file(source):
+    """Ergebnisdatei eines Batch-Laufs ohne --results: ergebnisse.jsonl im Verzeichnis bzw. neben der Liste."""
+    source_dir = source if os.path.isdir(source) else os.path.dirname(os.path.abspath(source))
+    return os.path.join(source_dir, "ergebnisse.jsonl")
+
+
+def pop_option(args, name):
+    """Entfernt eine Option "--name Wert" aus den Kommandozeilenargumenten und liefert den Wert."""
+    if name not in args or args.index(name) + 1 >= len(args):
+        return None
+    option_idx = args.index(name)
+    value = args[option_idx + 1]
+    del args[option_idx:option_idx + 2]
+    return value
+
+
+def failed_result(item, error, extractor_version, seconds):
+    """Ergebnis für ein Teil, das nicht geladen oder nicht geprüft werden konnte."""
+    return GradingResult(item.exercise, os.path.basename(item.part_path), part_file_hash(item.part_path),
+                         extractor_version, {}, None, None, {"gesamt": round(seconds, 6)}, error)
+
+
+class BatchRunner:
+    """
+    Prüft viele Teile nacheinander in derselben Sitzung: öffnen, prüfen, schließen. Ein Teil, das
+    sich nicht laden oder prüfen lässt, wird als Fehler festgehalten, danach geht es mit dem
+    nächsten Teil weiter.
+
+    session muss nur session.Parts.OpenBaseDisplay(pfad) -> (Teil, Ladestatus) bereitstellen, die
+    Teile nur Close(*close_args). grade(teil, übung) liefert einen GradingResult. Damit lässt sich
+    der Ablauf ohne NX mit StandInSession prüfen.
+    """
+
+    def __init__(self, session, grade, close_args=(), results_file=None, extractor_version=None, log=None):
+        self.session = session
+        self.grade = grade
+        self.close_args = close_args
+        self.results_file = results_file
+        self.extractor_version = extractor_version
+        self.log = log or (lambda text: None)
+
+    def open_part(self, part_path):
+        part, load_status = self.session.Parts.OpenBaseDisplay(part_path)
+        load_status.Dispose()
+        return part
+
+    def run_item(self, item):
+        start = time.perf_counter()
+        try:
+            part = self.open_part(item.part_path)
+        except Exception as e:
+            return self._failed(item, "ladefehler", f"Teil konnte nicht geladen werden: {e}", start)
+
+        try:
+            result = self.grade(part, item.exercise)
+        except Exception as e:
+            return self._failed(item, "pruefungsfehler", f"Prüfung fehlgeschlagen: {e}", start)
+        finally:
+            try:
+                part.Close(*self.close_args)
+            except Exception as e:
+                self.log(f"Teil {item.part_path} konnte nicht geschlossen werden: {e}")
+
+        if self.results_file:
+            append_result(self.results_file, result)
+        return BatchOutcome(item.part_path, item.exercise, "ok", None, time.perf_counter() - start, result)
+
+    def _failed(self, item, status, error, start):
+        seconds = time.perf_counter() - start
+        result = failed_result(item, error, self.extractor_version, seconds)
+        if self.results_file:
+            append_result(self.results_file, result)
+        self.log(f"{item.part_path}: {error}")
+        return BatchOutcome(item.part_path, item.exercise, status, error, seconds, result)
+
+    def run(self, items):
+        outcomes = []
+        for item_no, item in enumerate(items, start=1):
+            outcome = self.run_item(item)
+            self.log(f"[{item_no}/{len(items)}] {item.part_path}: {outcome.status} ({outcome.seconds:.1f} s)")
+            outcomes.append(outcome)
+        return outcomes
+
+
+class StandInPart:
+    """Ersatz für ein NX-Teil in Tests: kennt nur seinen Pfad und ob es geschlossen wurde."""
+
+    def __init__(self, session, part_path):
+        self.session = session
+        self.FullPath = part_path
+        self.Leaf = os.path.splitext(os.path.basename(part_path))[0]
+
+    def Close(self, *args):
+        self.session.closed.append(self.FullPath)
+
+
+class _StandInLoadStatus:
+    def Dispose(self):
+        pass
+
+
+class StandInSession:
+    """
+    Ersatz für NXOpen.Session in Tests ohne NX. OpenBaseDisplay öffnet jede vorhandene Datei als
+    StandInPart; fehlende Dateien und Pfade in failing lösen wie in NX eine Ausnahme aus.
+    """
+
+    def __init__(self, failing=()):
+        self.Parts = self
+        self.failing = set(failing)
+        self.opened = []
+        self.closed = []
+
+    def OpenBaseDisplay(self, part_path):
+        if part_path in self.failing or not os.path.isfile(part_path):
+            raise RuntimeError(f"Datei nicht lesbar: {part_path}")
+        self.opened.append(part_path)
+        return StandInPart(self, part_path), _StandInLoadStatus()
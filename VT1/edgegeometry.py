@@ -0,0 +1,106 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Zeilen je Block beim blockweisen Berechnen von Abständen
+DEFAULT_CHUNK_ROWS = 256
+
+# Reihenfolgeunabhängiger Formdeskriptor einer Kantenmenge (siehe shape_descriptor)
+ShapeDescriptor = namedtuple("ShapeDescriptor", "point_count radial_profile d2_histogram d2_range")
+ShapeComparison = namedtuple("ShapeComparison", "matches profile_deviation histogram_deviation")
+
+# Stützstellen des Radialprofils, Klassen des D2-Histogramms und Obergrenze exakt ausgewerteter Punktpaare
+PROFILE_SAMPLES = 32
+D2_BINS = 64
+D2_MAX_PAIRS = 200000
+
+# Formdeskriptoren der Referenzpakete, Schlüssel (Paketpfad, Paketversion)
+_reference_descriptors = {}
+
+
+def distance_matrix(points_a, points_b):
+    """Euklidische Abstände zwischen allen Punkten aus points_a und points_b als len(a) x len(b) Matrix."""
+    points_a = np.asarray(points_a, dtype=np.float64).reshape(-1, 3)
+    points_b = np.asarray(points_b, dtype=np.float64).reshape(-1, 3)
+    return np.sqrt(((points_a[:, None, :] - points_b[None, :, :]) ** 2).sum(axis=2))
+
+
+def edge_points(starts, ends):
+    """Start-, End- und Mittelpunkte aller Kanten als eine Punktwolke."""
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+    return np.vstack([starts, ends, (starts + ends) / 2])
+
+
+def pair_distances(points, max_pairs=D2_MAX_PAIRS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Abstände der Punktpaare einer Punktwolke. Bis max_pairs Paare werden alle Paare blockweise
+    ausgewertet, darüber eine feste Stichprobe von max_pairs Paaren. Die Punkte werden vor der
+    Stichprobe nach ihren gerundeten Koordinaten sortiert, damit das Ergebnis nicht von der
+    Reihenfolge abhängt, in der NX die Kanten liefert.
+    """
+    point_count = len(points)
+    if point_count * (point_count - 1) // 2 <= max_pairs:
+        columns = np.arange(point_count)
+        blocks = [np.zeros(0)]
+        for first in range(0, point_count, chunk_rows):
+            last = min(first + chunk_rows, point_count)
+            upper = columns[first:last, None] < columns[None, :]
+            blocks.append(distance_matrix(points[first:last], points)[upper])
+        return np.concatenate(blocks)
+
+    points = points[np.lexsort(np.round(points, 3).T[::-1])]
+    generator = np.random.default_rng(0)
+    first = generator.integers(0, point_count, max_pairs)
+    second = generator.integers(0, point_count - 1, max_pairs)
+    second[second >= first] += 1
+    return np.sqrt(((points[first] - points[second]) ** 2).sum(axis=1))
+
+
+def shape_descriptor(starts, ends, d2_range=None, bins=D2_BINS, samples=PROFILE_SAMPLES):
+    """
+    Reihenfolgeunabhängiger Deskriptor einer Kantenmenge aus zwei Verteilungen über die
+    Punktwolke der Kantenpunkte:
+
+    - Radialprofil: sortierte Abstände zum Schwerpunkt, auf samples Stützstellen abgetastet
+      (O(n log n)).
+    - D2-Histogramm: relative Häufigkeiten der Punktpaarabstände in bins Klassen auf
+      [0, d2_range]. Für den Vergleich mit einer Referenz wird deren d2_range übergeben.
+
+    Beide Verteilungen sind unabhängig von Kantenreihenfolge, Verschiebung und Drehung.
+    """
+    points = edge_points(starts, ends)
+    if len(points) == 0:
+        return ShapeDescriptor(0, np.zeros(samples), np.zeros(bins), 0.0)
+
+    radial = np.sort(np.sqrt(((points - points.mean(axis=0)) ** 2).sum(axis=1)))
+    profile = np.interp(np.linspace(0, len(radial) - 1, samples), np.arange(len(radial)), radial)
+
+    distances = pair_distances(points)
+    if d2_range is None:
+        d2_range = float(distances.max()) if len(distances) else 0.0
+    histogram, _ = np.histogram(np.minimum(distances, d2_range), bins=bins, range=(0.0, max(d2_range, 1e-12)))
+    return ShapeDescriptor(len(points), profile, histogram / max(len(distances), 1), d2_range)
+
+
+def compare_shape_descriptors(reference, test, tolerance=1e-1, histogram_tolerance=1e-1):
+    """
+    Vergleicht zwei Formdeskriptoren. Das Radialprofil darf je Stützstelle relativ um höchstens
+    tolerance abweichen, die D2-Histogramme um höchstens histogram_tolerance (halbe L1-Norm,
+    also der Anteil verschobener Punktpaare).
+    """
+    if reference.point_count != test.point_count:
+        return ShapeComparison(False, float("inf"), float("inf"))
+    scale = np.maximum(np.maximum(np.abs(reference.radial_profile), np.abs(test.radial_profile)), 1e-12)
+    profile_deviation = float((np.abs(reference.radial_profile - test.radial_profile) / scale).max(initial=0.0))
+    histogram_deviation = float(np.abs(reference.d2_histogram - test.d2_histogram).sum() / 2)
+    matches = profile_deviation <= tolerance and histogram_deviation <= histogram_tolerance
+    return ShapeComparison(matches, profile_deviation, histogram_deviation)
+
+
+def reference_shape_descriptor(pack):
+    """Formdeskriptor der Referenzkanten eines Pakets, einmal je Paketversion berechnet."""
+    key = (pack.path, pack.pack_version)
+    if key not in _reference_descriptors:
+        _reference_descriptors[key] = shape_descriptor(pack.array("edge_starts"), pack.array("edge_ends"))
+    return _reference_descriptors[key]
@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batchgrading import pop_option
+from grading import EXERCISE_NUMBERS, grade_snapshot
+from listing import FULL, VERBOSITY_LEVELS, BufferedListing, NullSink, sink_from_name
+from results import ResultRecorder, append_result
+from snapshotcache import EXTRACTOR_VERSION, load_snapshot, snapshot_info
+
+# Prüft gespeicherte Momentaufnahmen (dividedcode.py -args --extract <Verzeichnis>) ohne NX.
+# Importiert kein NXOpen und läuft damit auf jedem Rechner mit Python und NumPy.
+
+SNAPSHOT_SUFFIX = ".npz"
+
+
+def snapshots_in(source):
+    """Eine Momentaufnahme oder alle .npz-Dateien unterhalb eines Verzeichnisses in sortierter Reihenfolge."""
+    if not os.path.isdir(source):
+        return [source]
+    paths = []
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(SNAPSHOT_SUFFIX))
+    return paths
+
+
+def evaluate_snapshot(path, exercise=None, output=None, verbosity=FULL):
+    """
+    Prüft eine Momentaufnahme mit den Prüfungen ihrer Übung (exercise überschreibt die beim Auslesen
+    abgelegte Übung) und liefert einen GradingResult. Momentaufnahmen einer anderen Extraktorversion
+    werden nicht geprüft, sondern mit Fehlertext zurückgegeben. Die Ausgaben eines Teils werden
+    gesammelt und am Ende in einem Block geschrieben, sodass parallele Prüfungen in derselben Datei
+    nicht ineinanderlaufen.
+    """
+    info = snapshot_info(path) or {}
+    exercise = exercise or info.get("exercise")
+    result = ResultRecorder(exercise, info.get("part_name") or os.path.basename(path), info.get("part_hash"),
+                            info.get("extractor_version"))
+    if info and info.get("extractor_version") != EXTRACTOR_VERSION:
+        # Ältere Momentaufnahmen haben einen anderen Aufbau (z. B. fehlen vor Version 5 die Masseneigenschaften)
+        return result.record()._replace(error=f"Momentaufnahme mit Extraktorversion {info.get('extractor_version')}, "
+                                              f"erwartet {EXTRACTOR_VERSION}; Teil bitte neu auslesen")
+    with result.timed("laden"):
+        snapshot = load_snapshot(path, EXTRACTOR_VERSION)
+    if snapshot is None:
+        return result.record()._replace(error=f"Momentaufnahme nicht lesbar: {path}")
+    if exercise not in EXERCISE_NUMBERS:
+        return result.record()._replace(error=f"Unbekannte Übung '{exercise}', erlaubt sind {', '.join(EXERCISE_NUMBERS)}")
+
+    lw = BufferedListing(sink_from_name(output) or NullSink(), chunk_lines=sys.maxsize, verbosity=verbosity)
+    lw.Open()
+    try:
+        grade_snapshot(snapshot, EXERCISE_NUMBERS[exercise], lw, result)
+    except Exception as e:
+        return result.record()._replace(error=f"Prüfung fehlgeschlagen: {e}")
+    finally:
+        lw.Close()
+    return result.record()
+
+
+def _evaluate_job(job):
+    return evaluate_snapshot(*job)
+
+
+def evaluate_snapshots(paths, exercise=None, output=None, verbosity=FULL, workers=1):
+    """Prüft mehrere Momentaufnahmen, bei workers > 1 in eigenen Prozessen; Ergebnisse in der Reihenfolge von paths."""
+    jobs = [(path, exercise, output, verbosity) for path in paths]
+    if workers <= 1 or len(jobs) <= 1:
+        return [_evaluate_job(job) for job in jobs]
+    with Pool(min(workers, len(jobs))) as pool:
+        return pool.map(_evaluate_job, jobs, chunksize=1)
+
+
+def main():
+    """
+    Aufruf: python evaluate.py <Momentaufnahme|Verzeichnis> [--exercise vt1] [--results Datei]
+            [--output Datei] [--verbosity summary|failures|full] [--workers N]
+    Ohne --output werden keine Details geschrieben, ohne --results nur eine Zeile je Teil ausgegeben.
+    """
+    args = sys.argv[1:]
+    exercise = pop_option(args, "--exercise")
+    results_file = pop_option(args, "--results")
+    output = pop_option(args, "--output")
+    verbosity = pop_option(args, "--verbosity") or FULL
+    workers = int(pop_option(args, "--workers") or os.cpu_count() or 1)
+    if len(args) != 1 or verbosity not in VERBOSITY_LEVELS:
+        print(main.__doc__)
+        return
+
+    start = time.perf_counter()
+    results = evaluate_snapshots(snapshots_in(args[0]), exercise, output, verbosity, workers)
+    for result in results:
+        if results_file:
+            append_result(results_file, result)
+        score = f"{result.score}/{result.max_score}" if result.score is not None else "ohne Bewertung"
+        print(f"{result.part_name} ({result.exercise}): {result.error or score}")
+    failed = [result for result in results if result.error]
+    print(f"{len(results) - len(failed)} von {len(results)} Momentaufnahmen in {time.perf_counter() - start:.1f} s geprüft")
+
+
+if __name__ == '__main__':
+    main()
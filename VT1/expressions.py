@@ -0,0 +1,193 @@
+import ast
+import math
+from collections import deque
+
+# Funktionen der NX-Ausdruckssprache; Winkelfunktionen arbeiten wie in NX in Grad
+_FUNCTIONS = {
+    "sin": lambda x: math.sin(math.radians(x)),
+    "cos": lambda x: math.cos(math.radians(x)),
+    "tan": lambda x: math.tan(math.radians(x)),
+    "asin": lambda x: math.degrees(math.asin(x)),
+    "acos": lambda x: math.degrees(math.acos(x)),
+    "atan": lambda x: math.degrees(math.atan(x)),
+    "atan2": lambda y, x: math.degrees(math.atan2(y, x)),
+    "sqrt": math.sqrt,
+    "abs": abs,
+    "exp": math.exp,
+    "ln": math.log,
+    "log": math.log,
+    "log10": math.log10,
+    "ceiling": math.ceil,
+    "floor": math.floor,
+    "round": round,
+    "min": min,
+    "max": max,
+    "pi": lambda: math.pi
+}
+
+_BINARY_OPERATORS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Mod: lambda a, b: a % b,
+    ast.Pow: lambda a, b: a ** b
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: lambda a: a,
+    ast.USub: lambda a: -a
+}
+
+
+class ExpressionError(ValueError):
+    """Ein Ausdruck kann nicht ausgewertet werden (Syntax, unbekannter Name, Zyklus, Rechenfehler)."""
+
+
+def parse_expression(right_hand_side):
+    """
+    Zerlegt die rechte Seite eines NX-Ausdrucks in einen Syntaxbaum. NX schreibt Potenzen als ^
+    und Kommentare nach //.
+    """
+    text = str(right_hand_side).split("//", 1)[0].strip().replace("^", "**")
+    try:
+        return ast.parse(text, mode="eval").body
+    except SyntaxError as e:
+        raise ExpressionError(f"Ausdruck '{right_hand_side}' ist nicht lesbar: {e.msg}")
+
+
+def expression_names(tree):
+    """Namen anderer Ausdrücke, auf die sich ein Syntaxbaum bezieht (ohne Funktionsnamen)."""
+    functions = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and id(node) not in functions}
+
+
+def evaluate_tree(tree, values):
+    """Wertet einen Syntaxbaum aus; values liefert die Werte der referenzierten Ausdrücke."""
+    if isinstance(tree, ast.Constant) and isinstance(tree.value, (int, float)) and not isinstance(tree.value, bool):
+        return float(tree.value)
+    if isinstance(tree, ast.Name):
+        if tree.id not in values:
+            raise ExpressionError(f"Unbekannter Ausdruck '{tree.id}'")
+        return values[tree.id]
+    if isinstance(tree, ast.BinOp) and type(tree.op) in _BINARY_OPERATORS:
+        left = evaluate_tree(tree.left, values)
+        right = evaluate_tree(tree.right, values)
+        try:
+            return float(_BINARY_OPERATORS[type(tree.op)](left, right))
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise ExpressionError(str(e))
+    if isinstance(tree, ast.UnaryOp) and type(tree.op) in _UNARY_OPERATORS:
+        return _UNARY_OPERATORS[type(tree.op)](evaluate_tree(tree.operand, values))
+    if isinstance(tree, ast.Call) and isinstance(tree.func, ast.Name) and tree.func.id in _FUNCTIONS and not tree.keywords:
+        arguments = [evaluate_tree(argument, values) for argument in tree.args]
+        try:
+            return float(_FUNCTIONS[tree.func.id](*arguments))
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise ExpressionError(f"{tree.func.id}: {e}")
+    raise ExpressionError(f"Nicht unterstützter Ausdruck: {ast.dump(tree)}")
+
+
+class ExpressionTable:
+    """
+    Ausdruckstabelle eines Teils (Name -> rechte Seite), einmal aus workPart.Expressions gelesen.
+
+    Alle Ausdrücke werden beim ersten Zugriff in topologischer Reihenfolge ihrer Abhängigkeiten
+    ausgewertet, sodass jeder Wert genau einmal berechnet wird und nur auf bereits berechnete
+    Werte zugreift. Ausdrücke mit Fehlern (auch Zyklen) und alle von ihnen abhängigen Ausdrücke
+    erhalten einen Fehlertext statt eines Werts.
+    """
+
+    def __init__(self, right_hand_sides):
+        self.right_hand_sides = dict(right_hand_sides)
+        self._values = None
+        self._errors = None
+        self._resolved = {}
+
+    def __len__(self):
+        return len(self.right_hand_sides)
+
+    def __contains__(self, name):
+        return name in self.right_hand_sides
+
+    def _evaluate_all(self):
+        self._values = {}
+        self._errors = {}
+        trees = {}
+        dependencies = {}
+        for name, right_hand_side in self.right_hand_sides.items():
+            try:
+                trees[name] = parse_expression(right_hand_side)
+                dependencies[name] = expression_names(trees[name])
+            except ExpressionError as e:
+                self._errors[name] = str(e)
+
+        # Kahn-Verfahren: ein Ausdruck ist bereit, sobald alle referenzierten Ausdrücke ausgewertet sind
+        dependents = {name: [] for name in trees}
+        waiting = {}
+        for name, names in dependencies.items():
+            known = [dependency for dependency in names if dependency in trees]
+            waiting[name] = len(known)
+            for dependency in known:
+                dependents[dependency].append(name)
+        ready = deque(name for name, count in waiting.items() if count == 0)
+        while ready:
+            name = ready.popleft()
+            failed = [dependency for dependency in dependencies[name] if dependency in self._errors]
+            if failed:
+                self._errors[name] = f"Abhängiger Ausdruck '{failed[0]}' ist nicht auswertbar"
+            else:
+                try:
+                    self._values[name] = evaluate_tree(trees[name], self._values)
+                except ExpressionError as e:
+                    self._errors[name] = str(e)
+            for dependent in dependents[name]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        for name in trees:
+            if name not in self._values and name not in self._errors:
+                self._errors[name] = "Zyklische Abhängigkeit"
+
+    @property
+    def values(self):
+        """Alle auswertbaren Ausdrücke als {Name: Wert}."""
+        if self._values is None:
+            self._evaluate_all()
+        return self._values
+
+    @property
+    def errors(self):
+        """Alle nicht auswertbaren Ausdrücke als {Name: Fehlertext}."""
+        if self._errors is None:
+            self._evaluate_all()
+        return self._errors
+
+    def value(self, name):
+        """Wert eines Ausdrucks der Tabelle."""
+        if name in self.values:
+            return self.values[name]
+        raise ExpressionError(self.errors.get(name, f"Unbekannter Ausdruck '{name}'"))
+
+    def resolve(self, right_hand_side):
+        """
+        Wertet eine beliebige rechte Seite (z. B. eine Feature-Grenze wie "p5*2") gegen die Tabelle
+        aus. Zahlen und Ausdrucksnamen werden direkt beantwortet, Formeln einmal je Text berechnet.
+        """
+        if right_hand_side is None:
+            raise ExpressionError("Kein Ausdruck vorhanden")
+        try:
+            return float(right_hand_side)
+        except (TypeError, ValueError):
+            pass
+        if right_hand_side in self.right_hand_sides:
+            return self.value(right_hand_side)
+        if right_hand_side not in self._resolved:
+            try:
+                self._resolved[right_hand_side] = evaluate_tree(parse_expression(right_hand_side), self.values)
+            except ExpressionError as e:
+                self._resolved[right_hand_side] = e
+        result = self._resolved[right_hand_side]
+        if isinstance(result, ExpressionError):
+            raise result
+        return result
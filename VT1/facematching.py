@@ -0,0 +1,231 @@
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+# Ergebnis der Zuordnung; assigned[i] ist der aktuelle Index zur Referenzfläche i oder None, found
+# die innerhalb der Toleranz gefundenen Referenzflächen, missing alle übrigen
+FaceAssignment = namedtuple("FaceAssignment", "assigned scores total found missing")
+
+# Anzahl der Stützstellen, auf die sortierte Kantenlängen für den Deskriptor abgetastet werden
+DESCRIPTOR_SAMPLES = 8
+
+
+def face_descriptor(sorted_lengths, samples=DESCRIPTOR_SAMPLES):
+    """
+    Deskriptor fester Länge für eine Fläche mit beliebig vielen Kanten: die sortierten
+    Kantenlängen, linear auf samples Stützstellen abgetastet, gefolgt von der Kantenanzahl.
+    """
+    if len(sorted_lengths) == 0:
+        return np.zeros(samples + 1)
+    positions = np.linspace(0, len(sorted_lengths) - 1, samples)
+    sampled = np.interp(positions, np.arange(len(sorted_lengths)), sorted_lengths)
+    return np.append(sampled, len(sorted_lengths))
+
+
+class FaceIndex:
+    """
+    Index über die Flächen eines Teils.
+
+    Exakt gleiche Signaturen liegen in Slotlisten je (Typ, sortierte Kantenlängen). Für den
+    toleranten Vergleich sind Flächen gleichen Typs und gleicher Kantenanzahl zusätzlich nach
+    ihrem quantisierten Kantenumfang in Zellen einsortiert: weicht keine Kante um mehr als
+    tolerance ab, unterscheidet sich der Umfang um höchstens k * tolerance, sodass nur die
+    eigene und die beiden Nachbarzellen verglichen werden müssen. Zusätzlich hält der Index je
+    Flächentyp eine Deskriptormatrix für die Suche nach der ähnlichsten Fläche.
+    """
+
+    def __init__(self, faces, decimals=3, tolerance=2e-3):
+        self.faces = [(face_type, np.sort(np.round(np.asarray(edge_lengths, dtype=np.float64), decimals)))
+                      for face_type, edge_lengths in faces]
+        self.tolerance = tolerance
+        self.available = np.ones(len(self.faces), dtype=bool)
+        self._signature_slots = defaultdict(list)
+        cells = defaultdict(list)
+        by_type = defaultdict(list)
+        for face_idx, (face_type, lengths) in enumerate(self.faces):
+            self._signature_slots[(face_type, tuple(lengths.tolist()))].append(face_idx)
+            cells[self._cell_key(face_type, lengths)].append(face_idx)
+            by_type[face_type].append(face_idx)
+        for slots in self._signature_slots.values():
+            slots.reverse()
+        self._cells = {
+            key: (np.asarray(members), np.vstack([self.faces[idx][1] for idx in members]))
+            for key, members in cells.items()
+        }
+        self.descriptors = np.vstack([face_descriptor(lengths) for _, lengths in self.faces]) if self.faces \
+            else np.zeros((0, DESCRIPTOR_SAMPLES + 1))
+        self._descriptors = {
+            face_type: (np.asarray(members), self.descriptors[members])
+            for face_type, members in by_type.items()
+        }
+
+    def _cell_key(self, face_type, sorted_lengths, offset=0):
+        count = len(sorted_lengths)
+        cell_size = max(count, 1) * self.tolerance
+        cell = int(np.floor(float(np.sum(sorted_lengths)) / cell_size)) if cell_size > 0 else 0
+        return face_type, count, cell + offset
+
+    def take_exact(self, face_type, sorted_lengths):
+        """Entnimmt eine noch freie Fläche mit exakt gleicher Signatur oder liefert None."""
+        slots = self._signature_slots.get((face_type, tuple(sorted_lengths)))
+        while slots:
+            face_idx = slots.pop()
+            if self.available[face_idx]:
+                self.available[face_idx] = False
+                return face_idx
+        return None
+
+    def take_within(self, face_type, sorted_lengths):
+        """
+        Entnimmt die freie Fläche gleichen Typs und gleicher Kantenanzahl mit der kleinsten
+        maximalen Abweichung der sortierten Kantenlängen, sofern diese höchstens tolerance beträgt.
+        """
+        best_idx, best_deviation = None, self.tolerance
+        for offset in (-1, 0, 1):
+            cell = self._cells.get(self._cell_key(face_type, sorted_lengths, offset))
+            if cell is None:
+                continue
+            members, lengths = cell
+            deviation = np.abs(lengths - sorted_lengths).max(axis=1)
+            deviation[~self.available[members]] = np.inf
+            best = int(np.argmin(deviation))
+            if deviation[best] <= best_deviation:
+                best_idx, best_deviation = int(members[best]), deviation[best]
+        if best_idx is not None:
+            self.available[best_idx] = False
+        return best_idx
+
+    def available_descriptors(self, face_type):
+        """Flächenindizes und Deskriptoren der noch freien Flächen eines Typs als (Indizes, Matrix) oder None."""
+        entry = self._descriptors.get(face_type)
+        if entry is None:
+            return None
+        members, descriptors = entry
+        free = self.available[members]
+        if not free.any():
+            return None
+        return members[free], descriptors[free]
+
+
+def similarity_matrix(reference_descriptors, current_descriptors, chunk_rows=256):
+    """
+    Ähnlichkeit in [0, 1] zwischen allen Paaren von Deskriptoren gleichen Flächentyps.
+
+    Verglichen wird die relative L1-Abweichung der abgetasteten sortierten Kantenlängen,
+    gewichtet mit dem Verhältnis der Kantenanzahlen. Die Berechnung erfolgt zeilenblockweise,
+    damit der Speicherbedarf auch bei großen Teilen begrenzt bleibt.
+    """
+    reference_descriptors = np.atleast_2d(reference_descriptors)
+    current_descriptors = np.atleast_2d(current_descriptors)
+    similarity = np.empty((len(reference_descriptors), len(current_descriptors)))
+    current_samples = current_descriptors[:, :-1]
+    current_counts = current_descriptors[:, -1]
+    for start in range(0, len(reference_descriptors), chunk_rows):
+        block = reference_descriptors[start:start + chunk_rows]
+        samples = block[:, :-1]
+        counts = block[:, -1:]
+        deviation = np.abs(samples[:, None, :] - current_samples[None, :, :]).sum(axis=2)
+        relative = deviation / np.maximum(samples.sum(axis=1, keepdims=True), 1e-12)
+        count_ratio = np.minimum(counts, current_counts) / np.maximum(np.maximum(counts, current_counts), 1)
+        similarity[start:start + chunk_rows] = np.clip(1.0 - relative, 0.0, 1.0) * count_ratio
+    return similarity
+
+
+def solve_assignment(cost):
+    """
+    Löst das lineare Zuordnungsproblem (Ungarische Methode mit kürzesten augmentierenden Pfaden).
+
+    Für eine n x m Kostenmatrix wird jede Zeile (bzw. bei n > m jede Spalte) genau einmal
+    zugeordnet. Die innere Schleife über die Spalten ist vektorisiert; die Laufzeit beträgt
+    O(min(n, m)^2 * max(n, m)). Liefert die Paare (Zeile, Spalte).
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    rows, cols = cost.shape
+    u = np.zeros(rows + 1)
+    v = np.zeros(cols + 1)
+    owner = np.zeros(cols + 1, dtype=np.int64)   # Zeile (1-basiert), der eine Spalte zugeordnet ist
+    way = np.zeros(cols + 1, dtype=np.int64)
+
+    for row in range(1, rows + 1):
+        owner[0] = row
+        col0 = 0
+        min_slack = np.full(cols + 1, np.inf)
+        used = np.zeros(cols + 1, dtype=bool)
+        while True:
+            used[col0] = True
+            row0 = owner[col0]
+            free = ~used[1:]
+            slack = cost[row0 - 1] - u[row0] - v[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = col0
+            candidates = np.where(free, min_slack[1:], np.inf)
+            col1 = int(np.argmin(candidates)) + 1
+            delta = candidates[col1 - 1]
+            used_cols = np.flatnonzero(used)
+            u[owner[used_cols]] += delta
+            v[used_cols] -= delta
+            min_slack[1:][free] -= delta
+            col0 = col1
+            if owner[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            owner[col0] = owner[col1]
+            col0 = col1
+
+    pairs = [(int(owner[col]) - 1, col - 1) for col in range(1, cols + 1) if owner[col]]
+    if transposed:
+        pairs = [(col, row) for row, col in pairs]
+    return sorted(pairs)
+
+
+def assign_reference_faces(reference_faces, current_faces, decimals=3, tolerance=2e-3):
+    """
+    Eins-zu-eins-Zuordnung der Referenzflächen zu den aktuellen Flächen in einem Durchlauf.
+
+    Zuerst werden exakt gleiche Signaturen entnommen, dann Flächen, deren sortierte Kantenlängen
+    höchstens um tolerance abweichen (bei einem übergebenen FaceIndex um dessen Toleranz); diese
+    Referenzflächen gelten als gefunden und erhalten die Ähnlichkeit 1. Die übrigen werden je
+    Flächentyp optimal den noch freien Flächen zugeordnet, sodass jede fehlende Referenzfläche die
+    ähnlichste verbleibende Fläche mit einer Ähnlichkeit in [0, 1] erhält. Die Summe aller
+    Ähnlichkeiten ist die Gesamtpunktzahl.
+    """
+    index = current_faces if isinstance(current_faces, FaceIndex) else FaceIndex(current_faces, decimals, tolerance)
+    references = [(ref_type, np.sort(np.round(np.asarray(ref_edges, dtype=np.float64), decimals)))
+                  for ref_type, ref_edges in reference_faces]
+    assigned = [None] * len(references)
+    scores = np.zeros(len(references))
+
+    pending = []
+    for ref_idx, (ref_type, ref_lengths) in enumerate(references):
+        assigned[ref_idx] = index.take_exact(ref_type, ref_lengths.tolist())
+        if assigned[ref_idx] is None:
+            pending.append(ref_idx)
+    missing_by_type = defaultdict(list)
+    for ref_idx in pending:
+        ref_type, ref_lengths = references[ref_idx]
+        assigned[ref_idx] = index.take_within(ref_type, ref_lengths)
+        if assigned[ref_idx] is None:
+            missing_by_type[ref_type].append(ref_idx)
+    found = [ref_idx for ref_idx in range(len(references)) if assigned[ref_idx] is not None]
+    scores[found] = 1.0
+
+    # Flächen verschiedenen Typs sind nie ähnlich, daher wird je Typ ein eigener Block gelöst
+    for ref_type, ref_members in missing_by_type.items():
+        entry = index.available_descriptors(ref_type)
+        if entry is None:
+            continue
+        members, current_descriptors = entry
+        reference_descriptors = np.vstack([face_descriptor(references[ref_idx][1]) for ref_idx in ref_members])
+        similarity = similarity_matrix(reference_descriptors, current_descriptors)
+        for row, col in solve_assignment(1.0 - similarity):
+            if similarity[row, col] > 0:
+                assigned[ref_members[row]] = int(members[col])
+                scores[ref_members[row]] = similarity[row, col]
+
+    missing = sorted(ref_idx for ref_members in missing_by_type.values() for ref_idx in ref_members)
+    return FaceAssignment(assigned, scores, float(scores.sum()), found, missing)
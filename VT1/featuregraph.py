@@ -0,0 +1,95 @@
+import hashlib
+import json
+from collections import deque, namedtuple
+
+import numpy as np
+
+# Knoten des Feature-Graphen: Eltern und Kinder als Journal-Identifier, parameter_hash über alle
+# Eingaben des Features (Art, Ausdrücke, Eltern, bei Skizzen die Geometrie), expressions die
+# Namen der Ausdrücke des Features
+FeatureNode = namedtuple("FeatureNode", "journal_id kind timestamp parents children parameter_hash expressions")
+
+
+def parameter_hash(*parts):
+    """Stabiler SHA-256 über JSON-fähige Werte (Tupel und Listen werden gleich behandelt)."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def sketch_signatures(sketch_feature_ids, sketch_curve_offsets, *curve_arrays, decimals=9):
+    """
+    Hash der Kurvengeometrie je Skizze, Schlüssel ist der Journal-Identifier des Skizzen-Features.
+    Damit werden auch Skizzen erkannt, die ohne Bemaßung (also ohne geänderten Ausdruck) verschoben wurden.
+    """
+    signatures = {}
+    for sketch_idx, journal_id in enumerate(sketch_feature_ids):
+        if journal_id is None:
+            continue
+        start, stop = sketch_curve_offsets[sketch_idx], sketch_curve_offsets[sketch_idx + 1]
+        digest = hashlib.sha256()
+        for values in curve_arrays:
+            digest.update(np.round(np.asarray(values, dtype=np.float64)[start:stop], decimals).tobytes())
+        signatures[journal_id] = digest.hexdigest()
+    return signatures
+
+
+class FeatureGraph:
+    """
+    Abhängigkeitsgraph der Features eines Teils (gerichtet, azyklisch, Kanten von Eltern zu Kindern).
+    Die Knoten liegen nach Zeitstempel sortiert vor; die Kinder werden aus den Eltern abgeleitet,
+    damit beim Auslesen nur eine Richtung von NX abgefragt werden muss.
+    """
+
+    def __init__(self, nodes):
+        nodes = sorted(nodes, key=lambda node: node.timestamp)
+        children = {node.journal_id: [] for node in nodes}
+        for node in nodes:
+            for parent in node.parents:
+                if parent in children:
+                    children[parent].append(node.journal_id)
+        self.nodes = {node.journal_id: node._replace(parents=tuple(node.parents),
+                                                     children=tuple(children[node.journal_id]),
+                                                     expressions=tuple(node.expressions))
+                      for node in nodes}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes.values())
+
+    def downstream(self, journal_ids):
+        """Die angegebenen Features und alle direkt oder indirekt von ihnen abhängigen Features."""
+        reached = set()
+        queue = deque(journal_id for journal_id in journal_ids if journal_id in self.nodes)
+        while queue:
+            journal_id = queue.popleft()
+            if journal_id in reached:
+                continue
+            reached.add(journal_id)
+            queue.extend(self.nodes[journal_id].children)
+        return reached
+
+    def changed_since(self, previous):
+        """
+        Features, die gegenüber einem früheren Graphen neu auszulesen sind: neue Features,
+        Features mit geändertem parameter_hash und alles, was von ihnen abhängt.
+        """
+        if previous is None:
+            return set(self.nodes)
+        changed = [journal_id for journal_id, node in self.nodes.items()
+                   if journal_id not in previous.nodes
+                   or previous.nodes[journal_id].parameter_hash != node.parameter_hash]
+        return self.downstream(changed)
+
+    def reusable_records(self, previous, previous_records):
+        """Gespeicherte Records der unveränderten Features als {Journal-Identifier: Record}."""
+        changed = self.changed_since(previous)
+        return {journal_id: previous_records[journal_id] for journal_id in self.nodes
+                if journal_id not in changed and journal_id in previous_records}
+
+    def to_dict(self):
+        return {"nodes": [node._asdict() for node in self]}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(FeatureNode(**node) for node in values["nodes"])
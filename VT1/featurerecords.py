@@ -0,0 +1,99 @@
+from collections import namedtuple
+
+# Unveränderliche Abbilder der Feature-Parameter. Zahlenwerte stammen aus den Ausdrücken der Features,
+# nur für Drehfeatures (Achse, Toleranz) wird noch ein Builder geöffnet; alle Prüfungen lesen nur diese Records.
+
+# Kurve einer Section; length nur für Linien, radius und center nur für Bögen
+SectionCurve = namedtuple("SectionCurve", "kind length radius start end center")
+
+FeatureRecord = namedtuple("FeatureRecord", "journal_id type_name kind error")
+ExtrudeRecord = namedtuple("ExtrudeRecord", "journal_id type_name kind error start_limit end_limit section_curves")
+RevolveRecord = namedtuple("RevolveRecord", "journal_id type_name kind error axis_direction axis_point "
+                                            "start_limit end_limit tolerance section_curves")
+HoleRecord = namedtuple("HoleRecord", "journal_id type_name kind error depth diameter hole_form "
+                                      "counterbore_diameter counterbore_depth")
+PatternRecord = namedtuple("PatternRecord", "journal_id type_name kind error feature_count")
+
+# Zuordnung der Feature-Ausdrücke zu Record-Feldern über Schlüsselwörter ihrer Beschreibung
+# (z. B. "Start Limit", "C-Bore Diameter"); spezifischere Einträge stehen vor allgemeineren
+EXPRESSION_ROLES = {
+    "Extrude": (("start_limit", ("start",)), ("end_limit", ("end",))),
+    "HolePackage": (("counterbore_diameter", ("c-bore diameter", "counterbore diameter")),
+                    ("counterbore_depth", ("c-bore depth", "counterbore depth")),
+                    ("depth", ("depth",)), ("diameter", ("diameter",)))
+}
+# Felder, die Ausdrücke ohne erkennbare Beschreibung in der Reihenfolge von GetExpressions füllen
+EXPRESSION_ORDER = {
+    "Extrude": ("start_limit", "end_limit")
+}
+# Bohrungsform (Enum GeneralHoleForm) anhand der vorhandenen Ausdrücke
+HOLE_FORM_KEYWORDS = ((1, ("c-bore", "counterbore")), (2, ("c-sink", "countersink")), (3, ("taper",)))
+
+RECORD_TYPES = {
+    "Extrude": ExtrudeRecord,
+    "Revolve": RevolveRecord,
+    "HolePackage": HoleRecord,
+    "PatternFeature": PatternRecord
+}
+
+
+def feature_record(kind, journal_id, type_name, error=None, **parameters):
+    """
+    Legt den Record passend zur Feature-Art an. Parameter, die wegen eines Fehlers nicht
+    gelesen werden konnten, bleiben None.
+    """
+    record_type = RECORD_TYPES.get(kind, FeatureRecord)
+    values = {field: None for field in record_type._fields}
+    values.update(journal_id=journal_id, type_name=type_name, kind=kind, error=error)
+    values.update({field: value for field, value in parameters.items() if field in values})
+    if "section_curves" in values:
+        values["section_curves"] = tuple(values["section_curves"] or ())
+    return record_type(**values)
+
+
+def parameters_from_expressions(kind, expressions):
+    """
+    Ordnet die Ausdrücke eines Features, gegeben als (Beschreibung, rechte Seite) in der Reihenfolge
+    von GetExpressions, den Feldern seines Records zu. Jeder Ausdruck belegt höchstens ein Feld;
+    Ausdrücke ohne passende Beschreibung füllen die noch offenen Felder aus EXPRESSION_ORDER.
+    Bei Bohrungen wird zusätzlich die Bohrungsform aus den Beschreibungen abgeleitet.
+    """
+    parameters = {}
+    unassigned = []
+    for descriptor, right_hand_side in expressions:
+        descriptor = (descriptor or "").lower()
+        for field, keywords in EXPRESSION_ROLES.get(kind, ()):
+            if field not in parameters and any(keyword in descriptor for keyword in keywords):
+                parameters[field] = right_hand_side
+                break
+        else:
+            unassigned.append(right_hand_side)
+    open_fields = [field for field in EXPRESSION_ORDER.get(kind, ()) if field not in parameters]
+    parameters.update(zip(open_fields, unassigned))
+    if kind == "HolePackage":
+        descriptors = " ".join((descriptor or "").lower() for descriptor, _ in expressions)
+        parameters["hole_form"] = next((form for form, keywords in HOLE_FORM_KEYWORDS
+                                        if any(keyword in descriptors for keyword in keywords)), 0)
+    return parameters
+
+
+def feature_to_dict(record):
+    """JSON-fähige Darstellung eines Records (für Cache und Referenzpakete)."""
+    values = record._asdict()
+    if "section_curves" in values:
+        values["section_curves"] = [curve._asdict() for curve in values["section_curves"]]
+    return values
+
+
+def feature_from_dict(values):
+    """Stellt einen Record aus feature_to_dict wieder her."""
+    values = dict(values)
+    if values.get("section_curves") is not None:
+        values["section_curves"] = [
+            SectionCurve(**{field: tuple(value) if isinstance(value, list) else value for field, value in curve.items()})
+            for curve in values["section_curves"]
+        ]
+    for field in ("axis_direction", "axis_point"):
+        if isinstance(values.get(field), list):
+            values[field] = tuple(values[field])
+    return feature_record(**values)
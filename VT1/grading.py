@@ -0,0 +1,912 @@
+import math
+from collections import Counter
+
+from edgegeometry import ShapeComparison, compare_shape_descriptors, reference_shape_descriptor, shape_descriptor
+from expressions import ExpressionError
+from facematching import assign_reference_faces
+from referencepacks import load_reference_pack
+from registration import reference_point_grid, register_edges, rotation_angle, transform_points
+from sketchrules import compare_sketch_histograms, evaluate_sketch_rules
+from spatialindex import reference_edge_index
+from topology import iter_bodies, iter_faces, iter_sketch_curves
+
+# Prüfungen und Bewertung der Übungen. Sie arbeiten nur auf der Momentaufnahme eines Teils
+# (PartSnapshot) und kommen ohne NXOpen aus: dividedcode.py ruft sie in NX direkt nach dem
+# Auslesen auf, evaluate.py auf gespeicherten Momentaufnahmen außerhalb von NX.
+
+# 1= Übung 1, 2= Vertiefungsübung 1
+# 3= Übung 2, 4= Vertiefungsübung 2
+EXERCISES = {1: "ue1", 2: "vt1", 3: "ue2", 4: "vt2"}
+EXERCISE_NUMBERS = {exercise: number for number, exercise in EXERCISES.items()}
+
+# Gibt die Linien (und auf Wunsch die Kreise) einer Skizze aus; die Kurvenart wird vorab gefiltert
+def print_sketch_curves(lw, snapshot, sketch_idx, with_arcs=False):
+    lw.WriteLine(f"Skizze {sketch_idx + 1}: {snapshot.sketch_names[sketch_idx]}")
+    for edge_no, curve in enumerate(iter_sketch_curves(snapshot, kinds="Line", sketch=sketch_idx), start=1):
+        lw.WriteLine(f"    Kante {edge_no}: Typ - Linear, Länge - {curve.length:.3f}")
+    for circle_no, curve in enumerate(iter_sketch_curves(snapshot, kinds="Arc", sketch=sketch_idx) if with_arcs else (), start=1):
+        lw.WriteLine(f"    Kreis {circle_no}: Radius - {curve.radius:.3f}, Durchmesser - {2 * curve.radius:.3f}, Umfang - {2 * math.pi * curve.radius:.3f}")
+    lw.WriteLine("\n")
+
+# Gibt Details eines Körpers aus
+def print_body_details(lw, snapshot, body):
+    lw.WriteLine("-" * 50)
+    lw.WriteLine(f"Körper {body.index + 1}/{snapshot.body_count} wird inspiziert: {body.name}")
+    lw.WriteLine(f"Journal Identifier: {body.journal_id}")
+    print_mass_properties(lw, snapshot, body.index)  # Druckt die Masseninformationen
+    for face_no, face in enumerate(iter_faces(snapshot, body=body.index), start=1):
+        print_face_details(lw, snapshot, face, face_no)
+
+# Gibt Details einer Fläche aus
+def print_face_details(lw, snapshot, face, face_no):
+    lw.WriteLine(f"  Fläche {face_no}: Typ - {face.type}")
+    lw.WriteLine(f"  Anzahl der Kanten: {len(face.edge_ids)}")
+    neighbours = snapshot.topology.face_neighbours(face.index) - snapshot.body_face_offsets[face.body] + 1
+    lw.WriteLine(f"  Angrenzende Flächen: {', '.join(str(n) for n in neighbours)}")
+    for edge_no, edge_idx in enumerate(face.edge_ids, start=1):
+        print_edge_details(lw, snapshot, edge_idx, edge_no)
+    lw.WriteLine("\n")
+
+# Gibt Details einer Kante aus
+def print_edge_details(lw, snapshot, edge_idx, edge_no):
+    # Bestimme den Typ der Kante anhand des abgelegten Kantentyps
+    edge_type_name = snapshot.edge_type_name(edge_idx)
+    edge_length = snapshot.edge_lengths[edge_idx]
+    if edge_type_name == "Linear":
+        lw.WriteLine(f"    Kante {edge_no}: Typ - {edge_type_name}, Länge - {edge_length:.3f}")
+    elif edge_type_name == "Circular":
+        lw.WriteLine(f"    Kante {edge_no}: Typ - {edge_type_name}, Länge (Umfang) - {edge_length:.3f}")
+        print_circular_edge_details(lw, edge_length)
+    else:
+        edge_type_name = "Unbekannter Typ"
+        lw.WriteLine(f"    Kante {edge_no}: Typ - {edge_type_name}, Länge - {edge_length:.3f}")
+
+# Gibt Details einer kreisförmigen Kante aus
+def print_circular_edge_details(lw, circumference):
+    radius = circumference / (2 * math.pi)
+    diameter = 2 * radius
+    lw.WriteLine(f"    Radius des Kreises: {radius:.3f}")
+    lw.WriteLine(f"    Durchmesser des Kreises: {diameter:.3f}")
+
+# Gibt die Kurven einer Section aus
+def print_section_curves(lw, section_curves):
+    lw.WriteLine("  Section Curves:")
+    for curve in section_curves:
+        lw.WriteLine(f"    Curve Type: {curve.kind}")
+        if curve.kind == "Line":
+            lw.WriteLine(f"    Line Start Point: {', '.join(str(value) for value in curve.start)}")
+            lw.WriteLine(f"    Line End Point: {', '.join(str(value) for value in curve.end)}")
+            lw.WriteLine(f"    Line Length: {curve.length:.3f}")
+        elif curve.kind == "Arc":
+            lw.WriteLine(f"    Arc Center: {', '.join(str(value) for value in curve.center)}")
+            lw.WriteLine(f"    Radius: {curve.radius}")
+
+# Wert eines Ausdrucks für die Ausgabe; Formeln werden mit angegeben, nicht auswertbare Ausdrücke unverändert
+def format_expression_value(expressions, right_hand_side):
+    try:
+        value = expressions.resolve(right_hand_side)
+    except ExpressionError:
+        return str(right_hand_side)
+    try:
+        float(right_hand_side)
+        return str(value)
+    except ValueError:
+        return f"{value} ({right_hand_side})"
+
+# Analyse und Ausgabe der Details einer Extrusionsfunktion
+def print_extrude_details(lw, feature, expressions):
+    lw.WriteLine(f"Analyzing Extrude Feature: {feature.journal_id}")
+    if feature.error:
+        lw.WriteLine(f"  Error analyzing extrude details: {feature.error}")
+        return
+    try:
+        start_value = expressions.resolve(feature.start_limit)
+        end_value = expressions.resolve(feature.end_limit)
+        lw.WriteLine(f"  Start Distance of Extrusion: {start_value}")
+        lw.WriteLine(f"  End Distance of Extrusion: {end_value}")
+        lw.WriteLine(f"  Extrusion Height: {abs(end_value - start_value)}")
+    except ValueError as e:
+        lw.WriteLine(f"  Error analyzing extrude details: {str(e)}")
+        return
+
+    if feature.section_curves:
+        print_section_curves(lw, feature.section_curves)
+    else:
+        lw.WriteLine("  No Section available for this extrude")
+
+# Analyse und Ausgabe der Details einer Bohrfunktion
+def print_hole_details(lw, feature, expressions):
+    lw.WriteLine(f"Analyzing Hole Feature: {feature.journal_id}")
+    if feature.error:
+        lw.WriteLine(f"Error analyzing hole feature details: {feature.error}")
+        return
+
+    # Enum mapping
+    hole_form_descriptions = {
+        0: "Simple",
+        1: "Counterbored",
+        2: "Countersink",
+        3: "Tapered"
+    }
+
+    lw.WriteLine(f"  Hole Depth: {format_expression_value(expressions, feature.depth)}")
+    lw.WriteLine(f"  Hole Diameter: {format_expression_value(expressions, feature.diameter)}")
+    lw.WriteLine(f"  General Hole Form: {hole_form_descriptions.get(feature.hole_form, 'Unknown Form')}")
+
+    # Counterbore details
+    if feature.counterbore_diameter is not None:
+        lw.WriteLine(f"  Counterbore Diameter: {format_expression_value(expressions, feature.counterbore_diameter)}")
+    if feature.counterbore_depth is not None:
+        lw.WriteLine(f"  Counterbore Depth: {format_expression_value(expressions, feature.counterbore_depth)}")
+
+# Analyse und Ausgabe der Details einer Rotationsfunktion
+def print_revolve_details(lw, feature, expressions):
+    lw.WriteLine(f"Analyzing Revolved Feature: {feature.journal_id}")
+    if feature.error:
+        lw.WriteLine(f"  Error analyzing revolve details: {feature.error}")
+        return
+
+    # Achse und ihre Details
+    if feature.axis_direction is not None:
+        direction_x, direction_y, direction_z = feature.axis_direction
+        point_x, point_y, point_z = feature.axis_point
+        lw.WriteLine(f"  Axis: Direction - X: {direction_x}, Y: {direction_y}, Z: {direction_z}, Point - X: {point_x}, Y: {point_y}, Z: {point_z}")
+
+    # Start und Ende der Begrenzungen
+    if feature.start_limit is not None:
+        lw.WriteLine(f"  Start Extend Value: {format_expression_value(expressions, feature.start_limit)}")
+        lw.WriteLine(f"  End Extend Value: {format_expression_value(expressions, feature.end_limit)}")
+
+    lw.WriteLine(f"  Tolerance: {feature.tolerance}")
+
+    if feature.section_curves:
+        print_section_curves(lw, feature.section_curves)
+    else:
+        lw.WriteLine("  No Section available for this revolve")
+
+# Gibt die Details eines Features anhand seiner Art aus; Ausdrücke werden aus der Ausdruckstabelle aufgelöst
+def print_feature_details(lw, feature, expressions):
+    lw.WriteLine(f"Analyse des Features: {feature.journal_id} vom Typ {feature.type_name}")
+    if feature.kind == "Extrude":
+        print_extrude_details(lw, feature, expressions)
+    elif feature.kind == "Revolve":
+        print_revolve_details(lw, feature, expressions)
+    elif feature.kind == "HolePackage":
+        print_hole_details(lw, feature, expressions)
+
+def section_curve_lengths(feature, include_arcs=True):
+    """
+    Gerundete Längen der Section-Kurven eines Extrusionsfeatures; für Bögen wird der Radius verwendet.
+    """
+    lengths = []
+    for curve in feature.section_curves:
+        if curve.kind == "Line":
+            lengths.append(round(curve.length, 3))
+        elif include_arcs and curve.kind == "Arc":
+            lengths.append(round(curve.radius, 3))  # Hier Radius verwenden
+    return lengths
+
+def feature_signature(feature):
+    """Art und sortierte Section-Längen eines Features; Features ohne Section werden nur nach ihrer Art verglichen."""
+    return feature.kind, tuple(sorted(section_curve_lengths(feature))) if getattr(feature, "section_curves", None) else ()
+
+def check_features_against_reference(snapshot, lw, reference_pack):
+    """
+    Vergleicht die Features des Teils mit den Feature-Parametern der Musterlösung aus dem Referenzpaket.
+    Ein Feature der Musterlösung gilt als vorhanden, wenn das Teil ein noch nicht zugeordnetes Feature
+    gleicher Art mit denselben Section-Längen enthält. Liefert die Anzahl gefundener Features oder None,
+    wenn das Paket keine Feature-Parameter enthält.
+    """
+    reference_features = [feature for feature in reference_pack.features() if not feature.error]
+    if not reference_features:
+        lw.WriteLine("Das Referenzpaket enthält keine Feature-Parameter der Musterlösung (mit --compile-references neu erzeugen).")
+        return None
+    available = Counter(feature_signature(feature) for feature in snapshot.features if not feature.error)
+    missing = []
+    for feature in reference_features:
+        signature = feature_signature(feature)
+        if available[signature]:
+            available[signature] -= 1
+        else:
+            missing.append(feature)
+    for feature in (missing if lw.shows_details(failed=True) else ()):
+        lengths = f" mit Section-Längen {list(feature_signature(feature)[1])}" if feature_signature(feature)[1] else ""
+        lw.WriteLine(f"Feature {feature.journal_id} der Musterlösung ({feature.kind}){lengths} ist nicht vorhanden.")
+    found = len(reference_features) - len(missing)
+    lw.WriteLine(f"Es sind {found} von {len(reference_features)} Features der Musterlösung vorhanden.")
+    return found
+
+def check_sketches_against_reference(snapshot, lw, reference_pack):
+    """
+    Vergleicht die Linienlängen jeder Skizze der Musterlösung (Histogramme im Referenzpaket) mit der
+    ähnlichsten Skizze des Teils. Liefert die Anzahl vollständig enthaltener Skizzen oder None, wenn
+    das Paket keine Skizzenhistogramme enthält.
+    """
+    histograms = reference_pack.sketch_length_histograms()
+    if not histograms:
+        lw.WriteLine("Das Referenzpaket enthält keine Skizzen der Musterlösung (mit --compile-references neu erzeugen).")
+        return None
+    comparisons = compare_sketch_histograms(histograms, snapshot)
+    complete = sum(comparison.matched == comparison.expected for comparison in comparisons)
+    for comparison in (comparisons if lw.shows_details(failed=complete < len(comparisons)) else ()):
+        sketch = f"Skizze {comparison.sketch + 1}" if comparison.sketch is not None else "keine Skizze"
+        lw.WriteLine(f"Skizze {comparison.reference_sketch + 1} der Musterlösung: {comparison.matched} von "
+                     f"{comparison.expected} Linien in {sketch} des Teils")
+    lw.WriteLine(f"Es sind {complete} von {len(comparisons)} Skizzen der Musterlösung vollständig vorhanden.")
+    return complete
+
+def check_passfeder_feature_with_lengths(snapshot, lw):
+    """
+    Überprüft, ob ein Extrusionsfeature (EXTRUDE(7)) mit bestimmten Linienlängen vorhanden ist.
+    """
+    required_lengths = [31, 31, 7, 7]
+    for feature in snapshot.features_of_kind("Extrude"):
+        if feature.error:
+            lw.WriteLine(f"Fehler bei der Analyse des Features {feature.journal_id}: {feature.error}")
+            continue
+        lengths = section_curve_lengths(feature)
+        if all(length in lengths for length in required_lengths):
+            lw.WriteLine("Extrude Feature für Passfeder mit den erforderlichen Längen vorhanden.")
+            return True
+    lw.WriteLine("Extrude Feature für Passfeder ohne die erforderlichen Längen gefunden.")
+    return False
+
+def check_keilwelle_feature_with_lengths(snapshot, lw):
+    """
+    Überprüft, ob ein Extrusionsfeature (EXTRUDE(7)) mit bestimmten Linienlängen vorhanden ist.
+    """
+    required_lengths = [3.106, 3.106, 14.000, 17.000]
+    for feature in snapshot.features_of_kind("Extrude"):
+        if feature.error:
+            lw.WriteLine(f"Fehler bei der Analyse des Features {feature.journal_id}: {feature.error}")
+            continue
+        lengths = section_curve_lengths(feature)
+        if all(length in lengths for length in required_lengths):
+            lw.WriteLine("Extrude Feature für Keilwelle mit den erforderlichen Längen vorhanden.")
+            return True
+    lw.WriteLine("Extrude Feature für Keilwelle ohne die erforderlichen Längen gefunden.")
+
+    return False
+
+def check_faces_against_reference(snapshot, lw, reference_faces):
+    """
+    Überprüft das Vorhandensein von Flächen im vorliegenden Körper gegen eine Musterlösung.
+    Jede Fläche des Teils kann dabei nur eine Fläche der Musterlösung abdecken. Liefert die
+    FaceAssignment mit den gefundenen Flächen und der gewichteten Übereinstimmung.
+    """
+    lw.WriteLine("==================================================")
+    lw.WriteLine("Analyse der vorhandenen Flächen gegen die Musterlösung")
+    lw.WriteLine("==================================================")
+
+
+    lw.WriteLine("Starte Überprüfung der Flächen gegen die Musterlösung...")
+
+    # Zuordnung der Musterflächen zu den Flächen des Werkstücks (mit Toleranz gegen Rundungsrauschen);
+    # nicht gefundene Flächen erhalten die ähnlichste verbleibende Fläche mit Teilpunkten
+    current_faces = [(face.type, face.edge_lengths) for face in iter_faces(snapshot)]
+    total_reference_faces = len(reference_faces)
+    assignment = assign_reference_faces(reference_faces, current_faces)
+
+    # Fehlende Flächen sind Details einer fehlgeschlagenen Prüfung
+    for ref_idx in (assignment.missing if lw.shows_details(failed=True) else ()):
+        ref_type, ref_edges = reference_faces[ref_idx]
+        lw.WriteLine(f"Fläche vom Typ '{ref_type}' mit Kantenlängen {ref_edges} ist nicht vorhanden.")
+        face_idx = assignment.assigned[ref_idx]
+        if face_idx is not None:
+            nearest_lengths = [round(float(length), 3) for length in sorted(current_faces[face_idx][1])]
+            lw.WriteLine(f"  Ähnlichste Fläche im Teil: Fläche {face_idx + 1} mit Kantenlängen {nearest_lengths} (Übereinstimmung {assignment.scores[ref_idx]:.2f})")
+        else:
+            lw.WriteLine(f"  Im Teil gibt es keine weitere Fläche vom Typ '{ref_type}'.")
+
+    found_reference_faces = len(assignment.found)
+    lw.WriteLine(f"Es sind {found_reference_faces} von {total_reference_faces} erwarteten Flächen vorhanden.")
+    if total_reference_faces:
+        lw.WriteLine(f"Gewichtete Übereinstimmung: {assignment.total:.1f} von {total_reference_faces} ({100 * assignment.total / total_reference_faces:.1f} %)")
+    lw.WriteLine("Überprüfung abgeschlossen.")
+
+    return assignment
+
+# Legt die gefundenen Flächen und die gewichtete Übereinstimmung (Anteil in [0, 1]) im Ergebnis ab
+def record_face_assignment(result, assignment):
+    ratio = assignment.total / len(assignment.scores) if len(assignment.scores) else 0.0
+    result.check("flaechen_uebereinstimmung", round(ratio, 4))
+    return len(assignment.found), ratio
+
+# Punktzahl der UE1 aus der gewichteten Flächenübereinstimmung: Rotationslösung 0 bis 10 Punkte,
+# Alternativlösung aus zwei Extrusionen 3 bis 7 Punkte; ohne beide nur 0 Punkte, wenn keine Fläche vorhanden ist
+def score_ue1(rotations_feature_found, alternative_solution_found, found_faces, face_ratio):
+    if rotations_feature_found:
+        return int(round(10 * face_ratio))
+    if alternative_solution_found:
+        return 3 + int(round(4 * face_ratio))
+    return 0 if found_faces == 0 else None
+
+def check_faces_against_reference_ue1(snapshot, lw):
+    """
+    Überprüft das Vorhandensein von Flächen im vorliegenden Körper gegen eine Musterlösung.
+    """
+    return check_faces_against_reference(snapshot, lw, load_reference_pack("ue1").reference_faces())
+
+def check_faces_against_reference_vt1(snapshot, lw):
+    """
+    Überprüft das Vorhandensein von Flächen im vorliegenden Körper gegen eine Musterlösung.
+    """
+    return check_faces_against_reference(snapshot, lw, load_reference_pack("vt1").reference_faces())
+
+def check_faces_against_reference_ue2(snapshot, lw):
+    """
+    Überprüft das Vorhandensein von Flächen im vorliegenden Körper gegen eine Musterlösung.
+    """
+    return check_faces_against_reference(snapshot, lw, load_reference_pack("ue2").reference_faces())
+
+def check_faces_against_reference_vt2(snapshot, lw):
+    """
+    Überprüft das Vorhandensein von Flächen im vorliegenden Körper gegen eine Musterlösung.
+    """
+    return check_faces_against_reference(snapshot, lw, load_reference_pack("vt2").reference_faces())
+
+# Gibt die beim Auslesen gemessenen Masseneigenschaften eines Körpers aus (g, mm)
+def print_mass_properties(lw, snapshot, body_idx):
+    mass_properties = snapshot.body_mass_properties(body_idx)
+    if math.isnan(mass_properties.mass):
+        lw.WriteLine("  Masse: nicht gemessen")
+        return
+    center_of_gravity = mass_properties.center_of_gravity
+    moments = mass_properties.inertia_tensor.diagonal()
+    lw.WriteLine(f"  Masse: {mass_properties.mass:.3f} g")
+    lw.WriteLine(f"  Oberfläche: {mass_properties.area:.3f} mm²")
+    lw.WriteLine(f"  Volumen: {mass_properties.volume:.3f} mm³")
+    lw.WriteLine(f"  Schwerpunkt (mm): X: {center_of_gravity[0]:.3f}, Y: {center_of_gravity[1]:.3f}, Z: {center_of_gravity[2]:.3f}")
+    lw.WriteLine(f"  Trägheitsmomente (Schwerpunkt, g·mm²): Ixx: {moments[0]:.3f}, Iyy: {moments[1]:.3f}, Izz: {moments[2]:.3f}")
+
+def check_circular_pattern_feature(snapshot, lw):
+    if not lw.shows_details():
+        return
+    for pattern_feature in snapshot.features_of_kind("PatternFeature"):
+        if pattern_feature.error:
+            lw.WriteLine(f"Fehler bei der Analyse des Features {pattern_feature.journal_id}: {pattern_feature.error}")
+            continue
+        lw.WriteLine(f"Pattern Feature {pattern_feature.journal_id}")
+        lw.WriteLine(f"Number of Features: {pattern_feature.feature_count}")
+        # Anzahl, Abstand usw. des Musters stehen in den Ausdrücken des Features
+        node = snapshot.feature_graph.nodes.get(pattern_feature.journal_id) if snapshot.feature_graph else None
+        for name in (node.expressions if node else ()):
+            lw.WriteLine(f"Expression {name}: {format_expression_value(snapshot.expression_table, snapshot.expressions.get(name))}")
+
+def count_pattern_and_mirror_features(snapshot, lw):
+    pattern_count = 0
+    mirror_count = 0
+    show_features = lw.shows_details()
+
+    for feature in snapshot.features:
+        if feature.kind == "PatternFeature":
+            if show_features:
+                lw.WriteLine(f"Pattern Feature gefunden: {feature.journal_id}")  # Debugging-Ausgabe
+            pattern_count += 1
+        if feature.kind == "MirrorFeature":
+            if show_features:
+                lw.WriteLine(f"Mirror Feature gefunden: {feature.journal_id}")  # Debugging-Ausgabe
+            mirror_count += 1
+
+    lw.WriteLine(f"Anzahl der Pattern Features: {pattern_count}")
+    lw.WriteLine(f"Anzahl der Mirror Features: {mirror_count}")
+    return pattern_count, mirror_count
+
+def get_pattern_feature_count(snapshot, lw):
+    """
+    Ermittelt, wie oft das Pattern Feature mit bestimmten Dimensionen im Werkstück vorkommt.
+    """
+    required_lengths = [1.5, 6.502, 6.502, 1.2]
+    pattern_count = 0
+
+    # Durchsuchen aller Extrusionsfeatures im Werkstück
+    for feature in snapshot.features_of_kind("Extrude"):
+        if feature.error:
+            lw.WriteLine(f"Error processing feature {feature.journal_id}: {feature.error}")
+            continue
+        # Prüfen, ob alle erforderlichen Längen vorhanden sind
+        if sorted(section_curve_lengths(feature, include_arcs=False)) == sorted(required_lengths):
+            pattern_count += 1
+
+   # lw.WriteLine(f"Pattern Feature mit spezifischen Dimensionen kommt {pattern_count} mal vor.")
+    return pattern_count
+
+def check_relative_positions(reference_pack, snapshot, tolerance=1e-1):
+    """
+    Überprüft, ob die relativen Positionen der Kanten im Testkörper mit der Referenz übereinstimmen.
+    Verglichen werden reihenfolgeunabhängige Formdeskriptoren, sodass die Reihenfolge, in der NX
+    die Kanten liefert, keine Rolle spielt.
+    """
+    reference = reference_shape_descriptor(reference_pack)
+    # Bei abweichender Kantenanzahl kann die Prüfung ohne Paarbildung abgebrochen werden
+    if len(reference_pack.array("edge_lengths")) != snapshot.edge_count:
+        return ShapeComparison(False, float("inf"), float("inf"))
+
+    test = shape_descriptor(snapshot.edge_starts, snapshot.edge_ends, reference.d2_range)
+    return compare_shape_descriptors(reference, test, tolerance)
+
+def check_edges_against_reference(snapshot, lw):
+    """
+    Überprüft die Kantenpositionen des aktuellen Teils gegen die Referenzkanten.
+    """
+    lw.WriteLine("==================================================")
+    lw.WriteLine("Überprüfung der Kantenpositionen gegen Referenzkanten")
+    lw.WriteLine("==================================================")
+
+    # Prüft die relativen Positionen der Kanten gegen die Referenzkanten
+    reference_pack = load_reference_pack("ue1")
+    comparison = check_relative_positions(reference_pack, snapshot)
+
+    if comparison.matches:
+        lw.WriteLine("Die Kantenpositionen stimmen mit den Referenzkanten überein.")
+    else:
+        lw.WriteLine("Die Kantenpositionen stimmen NICHT mit den Referenzkanten überein.")
+    if comparison.profile_deviation != float("inf"):
+        lw.WriteLine(f"Abweichung Radialprofil: {comparison.profile_deviation:.3f}, Abweichung Abstandsverteilung: {comparison.histogram_deviation:.3f}")
+
+    # Richtet die Kanten auf das Koordinatensystem der Referenz aus, damit verschobene oder gedrehte Teile vergleichbar sind
+    registration = register_edges(snapshot.edge_starts, snapshot.edge_ends, reference_point_grid(reference_pack))
+    translation = ", ".join(f"{value:.3f}" for value in registration.translation)
+    lw.WriteLine(f"Ausrichtung auf die Referenz: Verschiebung ({translation}), Drehwinkel {rotation_angle(registration.rotation):.2f}°")
+    lw.WriteLine(f"Mittlere Restabweichung nach der Ausrichtung: {registration.rms:.4f}")
+
+    # Gleicht die ausgerichteten Kanten einzeln gegen die Referenzkanten ab
+    aligned_starts = transform_points(snapshot.edge_starts, registration.rotation, registration.translation)
+    aligned_ends = transform_points(snapshot.edge_ends, registration.rotation, registration.translation)
+    edge_match = reference_edge_index(reference_pack).match(aligned_starts, aligned_ends, snapshot.edge_lengths)
+    reference_edges = reference_pack.reference_edges()
+    lw.WriteLine(f"Es wurden {len(edge_match.pairs)} von {len(reference_edges)} Referenzkanten gefunden.")
+    show_deviations = lw.shows_details(failed=True)
+    for ref_idx in (edge_match.missing if show_deviations else ()):
+        edge = reference_edges[ref_idx]
+        lw.WriteLine(f"Fehlende Referenzkante {ref_idx + 1}: Länge {edge['length']}, Start {edge['start']}, Ende {edge['end']}")
+    for edge_idx in (edge_match.extra if show_deviations else ()):
+        start = tuple(round(float(value), 3) for value in aligned_starts[edge_idx])
+        end = tuple(round(float(value), 3) for value in aligned_ends[edge_idx])
+        lw.WriteLine(f"Zusätzliche Kante {edge_idx + 1} im Teil: Länge {snapshot.edge_lengths[edge_idx]:.3f}, Start {start}, Ende {end}, Restabweichung {registration.residuals[edge_idx]:.3f}")
+    return registration, edge_match
+
+def extract_line_positions(snapshot, lw):
+    """
+    Zählt die Kanten aller Körper, ohne die Positionen als Liste aufzubauen.
+    """
+    lw.WriteLine("==================================================")
+    lw.WriteLine("Extrahieren der Positionen aller Linien im Teil")
+    lw.WriteLine("==================================================")
+
+    # Zählen der Körper
+    body_count = snapshot.body_count
+    lw.WriteLine(f"Anzahl der Körper: {body_count}")
+
+    edge_count = 0
+    show_bodies = lw.shows_details()
+    for body in iter_bodies(snapshot):
+        if show_bodies:
+            lw.WriteLine(f"Körper {body.index + 1} von {body_count}")
+        edge_count += body.edge_count
+
+    lw.WriteLine(f"Anzahl der Kanten gefunden: {edge_count}")
+    
+    return edge_count
+
+#Ausgabe Übung 1
+# Listet Merkmale und Geometrien auf
+def list_features_and_geometries_ue1(lw, snapshot, result):
+    
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Analyse der Körper und Geometrien")
+    lw.WriteLine("=" * 50)
+
+    body_count = snapshot.body_count
+    lw.WriteLine("Gesamtanzahl der Körper im Teil: " + str(body_count))
+
+    #for body in iter_bodies(snapshot):
+     #   print_body_details(lw, snapshot, body)
+    
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Feature-Analyse:")
+    lw.WriteLine("=" * 50)
+    if lw.shows_details():
+        for feature in snapshot.features:
+            print_feature_details(lw, feature, snapshot.expression_table)
+    result.check("features_wie_musterloesung", check_features_against_reference(snapshot, lw, load_reference_pack(result.exercise)))
+
+    # Überprüfen und Zählen der Pattern- und Mirror-Features
+    total_patterns, total_mirrors = count_pattern_and_mirror_features(snapshot, lw)
+    result.check("muster_features", total_patterns)
+    result.check("mirror_features", total_mirrors)
+    lw.WriteLine(f"Anzahl der Pattern Features: {total_patterns}")
+    lw.WriteLine(f"Anzahl der Mirror Features: {total_mirrors}")
+
+
+# Listet Geometrieeigenschaften in Skizzen auf
+def list_geometry_properties_in_sketches_ue1(lw, snapshot, result):
+
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Analyse der Skizzen")
+    lw.WriteLine("=" * 50)
+    
+    # Skizzenregeln der Übung in einem Durchlauf über alle Skizzen auswerten
+    sketch_rules = evaluate_sketch_rules(snapshot, "ue1")
+    rotations_feature_found = sketch_rules["rotationsfeature"]
+    pattern_feature_found = sketch_rules["musterfeature"]
+    result.check("rotationsfeature", rotations_feature_found)
+    result.check("musterfeature", pattern_feature_found)
+
+    # Die Kurven der Skizzen sind Details zu den Skizzenregeln
+    show_sketches = lw.shows_details(failed=not (rotations_feature_found and pattern_feature_found))
+    for sketch_idx in (range(snapshot.sketch_count) if show_sketches else ()):
+        print_sketch_curves(lw, snapshot, sketch_idx, with_arcs=True)
+    result.check("skizzen_wie_musterloesung", check_sketches_against_reference(snapshot, lw, load_reference_pack(result.exercise)))
+
+    # Prüfung auf die Alternativlösung
+    alternative_solution_found = result.check("alternativloesung", not rotations_feature_found and sketch_rules["alternativloesung"])
+
+
+    # Überprüfung der Flächen nur einmal durchführen
+    found_faces, face_ratio = record_face_assignment(result, check_faces_against_reference_ue1(snapshot, lw))
+    faces_check_result = result.check("flaechen_gefunden", found_faces)
+    score = score_ue1(rotations_feature_found, alternative_solution_found, faces_check_result, face_ratio)
+    
+    # Gesamtprüfung für alle Skizzen ausgeben
+    lw.WriteLine("=" * 50)
+    lw.WriteLine(f"Grundlagenprüfung: {EXERCISE_NUMBERS[result.exercise]}")
+    lw.WriteLine("=" * 50)
+    lw.WriteLine(f"Erzeugung Grundkörper:\nRotationsfeature: {'Wie in der Musterlösung, Skizze korrekt.' if rotations_feature_found else 'NEIN'}")
+    lw.WriteLine(f"Erzeugung Muster:\nMusterfeature: {'Wie in der Musterlösung, Skizze korrekt.' if pattern_feature_found else 'NEIN'}")
+   # lw.WriteLine(f"Anzahl der Muster-Features: {get_pattern_feature_count(snapshot, lw)}{' --> Anzahl korrekt.' if total_patterns==12 else 'NEIN'}")
+    
+    if not rotations_feature_found and alternative_solution_found:
+        lw.WriteLine(f"Prüfung nach Alternativlösungen hat folgendes ergeben: Zwei Kreise Extrudiert")
+    
+    lw.WriteLine(f"Rotationsfeature gefunden: {rotations_feature_found}")
+    lw.WriteLine(f"Anzahl der gefundenen Flächen: {faces_check_result}")
+    lw.WriteLine(f"Übereinstimmung der Flächen: {100 * face_ratio:.1f} %")
+
+    # Qualitätsanalyse nur ausgeben, wenn die Bedingungen erfüllt sind
+    if rotations_feature_found and faces_check_result == 53:
+        lw.WriteLine("==================================================")
+        lw.WriteLine("Qualitäts-Analyse:")
+        lw.WriteLine("==================================================")
+        lw.WriteLine("Modellierung entspricht genau den Anforderungen der Aufgabe.")
+        lw.WriteLine("")
+        lw.WriteLine("Es wurde das Rotations-Feature zur Erzeugung des Grundkörpers genutzt.")
+        lw.WriteLine("Alle 53 von 53 erwarteten Flächen sind vorhanden.")
+        lw.WriteLine("")
+        lw.WriteLine("Daraus lässt sich schließen, dass alle Anforderungen an den Aufbau des Modells erfüllt werden.")
+        lw.WriteLine("Insgesamt wird das Modell mit der vollen Punktzahl bewertet, da es genau den Prinzipien guter Konstruktionspraxis folgt.")
+        lw.WriteLine("")
+
+    if alternative_solution_found and faces_check_result == 3:
+        lw.WriteLine("==================================================")
+        lw.WriteLine("Qualitäts-Analyse:")
+        lw.WriteLine("==================================================")
+        lw.WriteLine("Modellierung entspricht nicht den Anforderungen der Aufgabe.")
+        lw.WriteLine("")
+        lw.WriteLine("Anstatt einer Rotation einer einzigen Skizze wurden zwei Kreise extrudiert.")
+        lw.WriteLine("")
+        lw.WriteLine("Nur 3 von 53 erwarteten Flächen sind vorhanden.")
+        lw.WriteLine("Daraus lässt sich schließen, dass das Muster-Feature der Kühlrippen entweder gar nicht oder falsch verwendet wurde.")
+        lw.WriteLine("")
+        lw.WriteLine("Fehlende Flächen und geometrische Elemente weisen auf eine unzureichende Modellierung hin.")
+        lw.WriteLine("")
+        lw.WriteLine("Das Design durch zwei extrudierte Kreise führt zwar optisch zum gleichen Ergebnis, ist aber technisch weniger effizient.")
+        lw.WriteLine("Der Einsatz von zwei Extrusionen anstelle einer Rotationsfunktion führt zu einer unnötigen Komplexität im Modell.")
+        lw.WriteLine("")
+        lw.WriteLine("Das Design ist weniger robust, da es schwieriger ist, nachträglich Änderungen vorzunehmen oder das Modell für andere Zwecke zu modifizieren.")
+        lw.WriteLine("")
+        lw.WriteLine("Insgesamt wird das Modell durch die Verwendung der zwei extrudierten Kreise als nicht ausreichend bewertet, da es nicht den Prinzipien guter Konstruktionspraxis folgt. Außerdem fehlen wesentliche Bestandteile des Modells.")
+        lw.WriteLine("")
+
+    if alternative_solution_found and faces_check_result == 53:
+        lw.WriteLine("==================================================")
+        lw.WriteLine("Qualitäts-Analyse:")
+        lw.WriteLine("==================================================")
+        lw.WriteLine("Modellierung entspricht nicht den Anforderungen der Aufgabe.")
+        lw.WriteLine("")
+        lw.WriteLine("Anstatt einer Rotation einer einzigen Skizze wurden zwei Kreise extrudiert.")
+        lw.WriteLine("")
+        lw.WriteLine("Alle 53 von 53 erwarteten Flächen sind vorhanden.")
+        lw.WriteLine("Daraus lässt sich schließen, dass alle Anforderungen an den Aufbau des Modells erfüllt werden.")
+        lw.WriteLine("")
+        lw.WriteLine("Das Design durch zwei extrudierte Kreise führt zwar optisch zum gleichen Ergebnis, ist aber technisch weniger effizient.")
+        lw.WriteLine("Der Einsatz von zwei Extrusionen anstelle einer Rotationsfunktion führt zu einer unnötigen Komplexität im Modell.")
+        lw.WriteLine("")
+        lw.WriteLine("Das Design ist weniger robust, da es schwieriger ist, nachträglich Änderungen vorzunehmen oder das Modell für andere Zwecke zu modifizieren.")
+        lw.WriteLine("")
+        lw.WriteLine("Insgesamt wird das Modell durch die Verwendung der zwei extrudierten Kreise als nicht ausreichend bewertet, da es nicht den Prinzipien guter Konstruktionspraxis folgt.")
+        lw.WriteLine("")
+
+    if score == 0:
+        lw.WriteLine("==================================================")
+        lw.WriteLine("Qualitäts-Analyse:")
+        lw.WriteLine("==================================================")
+        lw.WriteLine("Modellierung entspricht nicht den Anforderungen der Aufgabe.")
+        lw.WriteLine("")
+        lw.WriteLine("Alle erwarteten Flächen fehlen oder sind falsch modelliert.")
+        lw.WriteLine("Dies deutet darauf hin, dass grundlegende Fehler bei der Modellierung gemacht wurden.")
+        lw.WriteLine("")
+        lw.WriteLine("Weder die Rotationsfunktion noch die richtigen Muster-Features wurden verwendet.")
+        lw.WriteLine("Die gesamte geometrische Struktur des Modells ist fehlerhaft.")
+        lw.WriteLine("")
+        lw.WriteLine("Das Design ist weit von den gestellten Anforderungen entfernt und kann nicht als funktional betrachtet werden.")
+        lw.WriteLine("Jegliche Nachbearbeitung des Modells wäre äußerst komplex und ineffizient.")
+        lw.WriteLine("")
+        lw.WriteLine("Insgesamt wird das Modell als ungenügend bewertet, da es nicht den Prinzipien guter Konstruktionspraxis folgt.")
+        lw.WriteLine("Es fehlen alle wesentlichen Bestandteile und die geometrische Integrität des Modells ist stark beeinträchtigt.")
+        lw.WriteLine("")
+
+    # Die Punktzahl folgt aus der gewichteten Übereinstimmung, nicht nur aus vollständig gefundenen Flächen
+    if score is not None:
+        lw.WriteLine(f"Bewertung: {score:02d}/10")
+        result.set_score(score)
+
+
+    # Zählen von Pattern- und Mirror-Features
+ #   total_patterns, total_mirrors = count_pattern_and_mirror_features(snapshot, lw)
+
+    lw.WriteLine("\n")
+
+    #lw.WriteLine(f"Anzahl der Muster-Features: {total_patterns}")
+    #lw.WriteLine(f"Anzahl der Mirror-Features: {total_mirrors}")
+    lw.WriteLine("\n")
+
+    # Extrahiere die Positionen der Linien aus der Musterlösung
+    extract_line_positions(snapshot, lw)
+    registration, edge_match = check_edges_against_reference(snapshot, lw)
+    result.check("referenzkanten_gefunden", len(edge_match.pairs))
+    result.check("referenzkanten_fehlend", len(edge_match.missing))
+    result.check("kanten_zusaetzlich", len(edge_match.extra))
+    result.check("ausrichtung_rms", registration.rms)
+
+
+
+
+
+#Ab hier: Vertiefungsübung 1
+# Listet Merkmale und Geometrien auf
+def list_features_and_geometries_vt1(lw, snapshot, result):
+    
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Analyse der Körper und Geometrien")
+    lw.WriteLine("=" * 50)
+
+    body_count = snapshot.body_count
+    lw.WriteLine("Gesamtanzahl der Körper im Teil: " + str(body_count))
+
+    # Flächen und Kanten werden nur formatiert, wenn die volle Ausgabe gewünscht ist
+    if lw.shows_details():
+        for body in iter_bodies(snapshot):
+            print_body_details(lw, snapshot, body)
+    
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Feature-Analyse:")
+    lw.WriteLine("=" * 50)
+    if lw.shows_details():
+        for feature in snapshot.features:
+            print_feature_details(lw, feature, snapshot.expression_table)
+    result.check("features_wie_musterloesung", check_features_against_reference(snapshot, lw, load_reference_pack(result.exercise)))
+
+    # Überprüfen und Zählen der Pattern- und Mirror-Features
+    #total_patterns, total_mirrors = count_pattern_and_mirror_features(snapshot, lw)
+    #lw.WriteLine(f"Anzahl der Pattern Features: {total_patterns}")
+    #lw.WriteLine(f"Anzahl der Mirror Features: {total_mirrors}")
+
+
+
+# Listet Geometrieeigenschaften in Skizzen auf
+def list_geometry_properties_in_sketches_vt1(lw, snapshot, result):
+
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Analyse der Skizzen")
+    lw.WriteLine("=" * 50)
+
+    # Skizzenregeln der Übung in einem Durchlauf über alle Skizzen auswerten
+    sketch_rules = evaluate_sketch_rules(snapshot, "vt1")
+    rotations_feature_found = sketch_rules["rotationsfeature"]
+    passfeder_feature_found = sketch_rules["passfeder"]
+    keilwelle_feature_found = sketch_rules["keilwelle"]
+    result.check("rotationsfeature", rotations_feature_found)
+    result.check("passfeder", passfeder_feature_found)
+    result.check("keilwelle", keilwelle_feature_found)
+    extrude_feature_found = False
+
+    # Die Kurven der Skizzen sind Details zu den Skizzenregeln
+    show_sketches = lw.shows_details(failed=not (rotations_feature_found and passfeder_feature_found and keilwelle_feature_found))
+    for sketch_idx in (range(snapshot.sketch_count) if show_sketches else ()):
+        print_sketch_curves(lw, snapshot, sketch_idx)
+    result.check("skizzen_wie_musterloesung", check_sketches_against_reference(snapshot, lw, load_reference_pack(result.exercise)))
+
+    
+    check_circular_pattern_feature(snapshot, lw)
+    found_faces, _ = record_face_assignment(result, check_faces_against_reference_vt1(snapshot, lw))
+    result.check("flaechen_gefunden", found_faces)
+    # Gesamtprüfung für alle Skizzen ausgeben
+    lw.WriteLine("=" * 50)
+    lw.WriteLine(f"Grundlagenprüfung: Preset {EXERCISE_NUMBERS[result.exercise]}")
+    lw.WriteLine("=" * 50)
+    lw.WriteLine(f"Erzeugung Grundkörper:\nRotationsfeature: {'JA, Skizze korrekt.' if rotations_feature_found else 'NEIN'}")
+    # Überprüfung, ob das Extrusionsfeature EXTRUDE(7) mit den erforderlichen Längen vorhanden ist
+    extrude_feature_found = result.check("extrude_passfeder", check_passfeder_feature_with_lengths(snapshot, lw))
+
+    lw.WriteLine(f"Erzeugung Features:\nPassfeder: {'JA, Skizze korrekt.' if passfeder_feature_found else 'NEIN'}")
+    lw.WriteLine(f"Keilwelle: {'JA, Skizze korrekt.' if keilwelle_feature_found else 'NEIN'}")
+    # Überprüfung, ob das Extrusionsfeature EXTRUDE(7) mit den erforderlichen Längen vorhanden ist
+    extrude_feature_found = result.check("extrude_keilwelle", check_keilwelle_feature_with_lengths(snapshot, lw))
+
+    lw.WriteLine(f"Extrude Feature Keilwelle: {'JA, mit richtigen Maßen' if extrude_feature_found else 'NEIN'}")
+
+    # Zählen von Pattern- und Mirror-Features
+    total_patterns, total_mirrors = count_pattern_and_mirror_features(snapshot, lw)
+    result.check("muster_features", total_patterns)
+    result.check("mirror_features", total_mirrors)
+
+    lw.WriteLine(f"Anzahl der Muster-Features: {total_patterns}")
+    lw.WriteLine(f"Anzahl der Mirror-Features: {total_mirrors}")
+    lw.WriteLine("\n")
+
+#Ab hier: Übung 2
+# Listet Merkmale und Geometrien auf
+def list_features_and_geometries_ue2(lw, snapshot, result):
+    
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Analyse der Körper und Geometrien")
+    lw.WriteLine("=" * 50)
+
+    body_count = snapshot.body_count
+    lw.WriteLine("Gesamtanzahl der Körper im Teil: " + str(body_count))
+
+    # Flächen und Kanten werden nur formatiert, wenn die volle Ausgabe gewünscht ist
+    if lw.shows_details():
+        for body in iter_bodies(snapshot):
+            print_body_details(lw, snapshot, body)
+    
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Feature-Analyse:")
+    lw.WriteLine("=" * 50)
+    if lw.shows_details():
+        for feature in snapshot.features:
+            print_feature_details(lw, feature, snapshot.expression_table)
+    result.check("features_wie_musterloesung", check_features_against_reference(snapshot, lw, load_reference_pack(result.exercise)))
+
+    # Überprüfen und Zählen der Pattern- und Mirror-Features
+    total_patterns, total_mirrors = count_pattern_and_mirror_features(snapshot, lw)
+    result.check("muster_features", total_patterns)
+    result.check("mirror_features", total_mirrors)
+    lw.WriteLine(f"Anzahl der Pattern Features: {total_patterns}")
+    lw.WriteLine(f"Anzahl der Mirror Features: {total_mirrors}")
+
+
+
+# Listet Geometrieeigenschaften in Skizzen auf
+def list_geometry_properties_in_sketches_ue2(lw, snapshot, result):
+
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Analyse der Skizzen")
+    lw.WriteLine("=" * 50)
+
+    # Skizzenregeln der Übung in einem Durchlauf über alle Skizzen auswerten
+    sketch_rules = evaluate_sketch_rules(snapshot, "ue2")
+    rotations_feature_found = sketch_rules["rotationsfeature"]
+    pattern_feature_found = sketch_rules["musterfeature"]
+    result.check("rotationsfeature", rotations_feature_found)
+    result.check("musterfeature", pattern_feature_found)
+
+    # Die Kurven der Skizzen sind Details zu den Skizzenregeln
+    show_sketches = lw.shows_details(failed=not (rotations_feature_found and pattern_feature_found))
+    for sketch_idx in (range(snapshot.sketch_count) if show_sketches else ()):
+        print_sketch_curves(lw, snapshot, sketch_idx)
+    result.check("skizzen_wie_musterloesung", check_sketches_against_reference(snapshot, lw, load_reference_pack(result.exercise)))
+
+    # Muster-Features zählen
+    total_patterns = result.check("muster_anzahl", get_pattern_feature_count(snapshot, lw))
+    found_faces, _ = record_face_assignment(result, check_faces_against_reference_ue2(snapshot, lw))
+    result.check("flaechen_gefunden", found_faces)
+    # Gesamtprüfung für alle Skizzen ausgeben
+    lw.WriteLine("=" * 50)
+    lw.WriteLine(f"Grundlagenprüfung: {EXERCISE_NUMBERS[result.exercise]}")
+    lw.WriteLine("=" * 50)
+    lw.WriteLine(f"Erzeugung Grundkörper:\nRotationsfeature: {'JA, Skizze korrekt.' if rotations_feature_found else 'NEIN'}")
+    lw.WriteLine(f"Erzeugung Muster:\nMusterfeature: {'JA, Skizze korrekt.' if pattern_feature_found else 'NEIN'}")
+    lw.WriteLine(f"Anzahl der Muster-Features: {total_patterns}{' --> Anzahl korrekt.' if total_patterns==12 else 'NEIN'}")
+    
+    # Zählen von Pattern- und Mirror-Features
+    total_patterns, total_mirrors = count_pattern_and_mirror_features(snapshot, lw)
+    result.check("muster_features", total_patterns)
+    result.check("mirror_features", total_mirrors)
+
+    lw.WriteLine(f"Anzahl der Muster-Features: {total_patterns}")
+    lw.WriteLine(f"Anzahl der Mirror-Features: {total_mirrors}")
+    lw.WriteLine("\n")
+
+#Ab hier: Vertiefungsübung 2
+# Listet Merkmale und Geometrien auf
+def list_features_and_geometries_vt2(lw, snapshot, result):
+    
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Analyse der Körper und Geometrien")
+    lw.WriteLine("=" * 50)
+
+    body_count = snapshot.body_count
+    lw.WriteLine("Gesamtanzahl der Körper im Teil: " + str(body_count))
+
+    # Flächen und Kanten werden nur formatiert, wenn die volle Ausgabe gewünscht ist
+    if lw.shows_details():
+        for body in iter_bodies(snapshot):
+            print_body_details(lw, snapshot, body)
+    
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Feature-Analyse:")
+    lw.WriteLine("=" * 50)
+    if lw.shows_details():
+        for feature in snapshot.features:
+            print_feature_details(lw, feature, snapshot.expression_table)
+    result.check("features_wie_musterloesung", check_features_against_reference(snapshot, lw, load_reference_pack(result.exercise)))
+
+    # Überprüfen und Zählen der Pattern- und Mirror-Features
+    total_patterns, total_mirrors = count_pattern_and_mirror_features(snapshot, lw)
+    result.check("muster_features", total_patterns)
+    result.check("mirror_features", total_mirrors)
+    lw.WriteLine(f"Anzahl der Pattern Features: {total_patterns}")
+    lw.WriteLine(f"Anzahl der Mirror Features: {total_mirrors}")
+
+
+
+# Listet Geometrieeigenschaften in Skizzen auf
+def list_geometry_properties_in_sketches_vt2(lw, snapshot, result):
+
+    lw.WriteLine("=" * 50)
+    lw.WriteLine("Analyse der Skizzen")
+    lw.WriteLine("=" * 50)
+
+    # Skizzenregeln der Übung in einem Durchlauf über alle Skizzen auswerten
+    sketch_rules = evaluate_sketch_rules(snapshot, "vt2")
+    rotations_feature_found = sketch_rules["rotationsfeature"]
+    pattern_feature_found = sketch_rules["musterfeature"]
+    result.check("rotationsfeature", rotations_feature_found)
+    result.check("musterfeature", pattern_feature_found)
+
+    # Die Kurven der Skizzen sind Details zu den Skizzenregeln
+    show_sketches = lw.shows_details(failed=not (rotations_feature_found and pattern_feature_found))
+    for sketch_idx in (range(snapshot.sketch_count) if show_sketches else ()):
+        print_sketch_curves(lw, snapshot, sketch_idx)
+    result.check("skizzen_wie_musterloesung", check_sketches_against_reference(snapshot, lw, load_reference_pack(result.exercise)))
+
+    # Muster-Features zählen
+    total_patterns = result.check("muster_anzahl", get_pattern_feature_count(snapshot, lw))
+    found_faces, _ = record_face_assignment(result, check_faces_against_reference_vt2(snapshot, lw))
+    result.check("flaechen_gefunden", found_faces)
+    # Gesamtprüfung für alle Skizzen ausgeben
+    lw.WriteLine("=" * 50)
+    lw.WriteLine(f"Grundlagenprüfung: {EXERCISE_NUMBERS[result.exercise]}")
+    lw.WriteLine("=" * 50)
+    lw.WriteLine(f"Erzeugung Grundkörper:\nRotationsfeature: {'JA, Skizze korrekt.' if rotations_feature_found else 'NEIN'}")
+    lw.WriteLine(f"Erzeugung Muster:\nMusterfeature: {'JA, Skizze korrekt.' if pattern_feature_found else 'NEIN'}")
+    lw.WriteLine(f"Anzahl der Muster-Features: {total_patterns}{' --> Anzahl korrekt.' if total_patterns==12 else 'NEIN'}")
+    
+    # Zählen von Pattern- und Mirror-Features
+    total_patterns, total_mirrors = count_pattern_and_mirror_features(snapshot, lw)
+    result.check("muster_features", total_patterns)
+    result.check("mirror_features", total_mirrors)
+
+    lw.WriteLine(f"Anzahl der Muster-Features: {total_patterns}")
+    lw.WriteLine(f"Anzahl der Mirror-Features: {total_mirrors}")
+    lw.WriteLine("\n")
+
+# Prüfungen je Übung: zuerst die Skizzenanalyse, dann die Körper- und Feature-Analyse
+EXERCISE_CHECKS = {
+    1: (list_geometry_properties_in_sketches_ue1, list_features_and_geometries_ue1),
+    2: (list_geometry_properties_in_sketches_vt1, list_features_and_geometries_vt1),
+    3: (list_geometry_properties_in_sketches_ue2, list_features_and_geometries_ue2),
+    4: (list_geometry_properties_in_sketches_vt2, list_features_and_geometries_vt2)
+}
+
+
+# Führt die Prüfungen einer Übung auf einer Momentaufnahme aus; Ausgaben gehen an lw, Ergebnisse an result
+def grade_snapshot(snapshot, exercise_number, lw, result):
+    sketch_checks, feature_checks = EXERCISE_CHECKS[exercise_number]
+    with result.timed("skizzen"):
+        sketch_checks(lw, snapshot, result)
+    with result.timed("features"):
+        feature_checks(lw, snapshot, result)
+    return result
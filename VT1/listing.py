@@ -0,0 +1,128 @@
+import os
+
+# Anzahl gepufferter Zeilen, nach der ein Block an das Ziel geschrieben wird
+DEFAULT_CHUNK_LINES = 512
+
+# Ausführlichkeit der Ausgabe: nur Zusammenfassungen, Details nur zu fehlgeschlagenen Prüfungen, alles
+SUMMARY = "summary"
+FAILURES = "failures"
+FULL = "full"
+VERBOSITY_LEVELS = (SUMMARY, FAILURES, FULL)
+
+
+class ListingWindowSink:
+    """Schreibt Blöcke in das NX Listing Window; ein Block ist ein einziger WriteLine-Aufruf."""
+
+    discards = False
+
+    def __init__(self, listing_window):
+        self.listing_window = listing_window
+
+    def open(self):
+        self.listing_window.Open()
+
+    def write(self, lines):
+        self.listing_window.WriteLine("\n".join(lines))
+
+    def close(self):
+        self.listing_window.Close()
+
+
+class FileSink:
+    """Hängt die Ausgaben an eine Textdatei an (UTF-8), z. B. für Batch-Läufe ohne Oberfläche."""
+
+    discards = False
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def open(self):
+        if self._file is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, lines):
+        self.open()
+        self._file.write("\n".join(lines) + "\n")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class NullSink:
+    """Verwirft alle Ausgaben; BufferedListing puffert dann gar nicht erst."""
+
+    discards = True
+
+    def open(self):
+        pass
+
+    def write(self, lines):
+        pass
+
+    def close(self):
+        pass
+
+
+def sink_from_name(name):
+    """
+    Ziel zu einer Angabe auf der Kommandozeile: "null" verwirft alles, "listing" (oder None)
+    bedeutet das Listing Window (Rückgabe None), alles andere ist ein Dateipfad.
+    """
+    if name is None or name == "listing":
+        return None
+    if name == "null":
+        return NullSink()
+    return FileSink(name)
+
+
+class BufferedListing:
+    """
+    Ersatz für das NX Listing Window mit derselben Schnittstelle (Open, WriteLine, Close).
+    Zeilen werden gesammelt und in Blöcken zu chunk_lines Zeilen an das Ziel geschrieben,
+    statt jede Zeile einzeln an die Oberfläche zu schicken. Close schreibt den Rest.
+
+    verbosity legt fest, welche Details ausgegeben werden. Die Prüfungen fragen vor dem
+    Formatieren von Details shows_details ab, damit nicht benötigte Zeilen gar nicht erst
+    entstehen.
+    """
+
+    def __init__(self, sink, chunk_lines=DEFAULT_CHUNK_LINES, verbosity=FULL):
+        if verbosity not in VERBOSITY_LEVELS:
+            raise ValueError(f"Unbekannte Ausführlichkeit '{verbosity}', erlaubt sind {', '.join(VERBOSITY_LEVELS)}")
+        self.sink = sink
+        self.chunk_lines = chunk_lines
+        self.verbosity = verbosity
+        self._lines = []
+
+    def shows_details(self, failed=False):
+        """
+        True, wenn Details ausgegeben werden sollen: bei FULL immer, bei FAILURES nur zu
+        fehlgeschlagenen Prüfungen (failed), bei SUMMARY und verworfener Ausgabe nie.
+        """
+        if self.sink.discards:
+            return False
+        return self.verbosity == FULL or (self.verbosity == FAILURES and failed)
+
+    def Open(self):
+        self.sink.open()
+
+    def WriteLine(self, text):
+        if self.sink.discards:
+            return
+        self._lines.append(str(text))
+        if len(self._lines) >= self.chunk_lines:
+            self.Flush()
+
+    def Flush(self):
+        if self._lines:
+            lines, self._lines = self._lines, []
+            self.sink.write(lines)
+
+    def Close(self):
+        self.Flush()
+        self.sink.close()
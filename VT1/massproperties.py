@@ -0,0 +1,49 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Masseneigenschaften eines Körpers in g und mm; inertia_tensor ist der Trägheitstensor (g·mm²)
+# bezogen auf den Schwerpunkt und die Achsen des WCS
+MassProperties = namedtuple("MassProperties", "mass area volume center_of_gravity inertia_tensor")
+
+# Einheiten der Messung in NX (UF_MODL_ask_mass_props_3d): 3 = Gramm und Zentimeter
+MEASURE_UNITS = 3
+# Einheit der Dichteabfrage (UF_MODL_ask_body_density): UF_MODL_grams_centimeters (g/cm³) aus uf_modl_types.h
+DENSITY_UNITS = 2
+CM_TO_MM = 10.0
+
+
+def mass_properties_from_values(values):
+    """
+    Wandelt das Ergebnisfeld von AskMassProps3d (47 Werte, Gramm und Zentimeter) um. Die
+    Python-Bindung liefert das Feld zusammen mit den Statistikwerten als Tupel; beides wird angenommen.
+    Benutzt werden Fläche [0], Volumen [1], Masse [2], Schwerpunkt [3:6], Trägheitsmomente [12:15]
+    und Deviationsmomente [19:22] (xy, yz, xz), jeweils auf den Schwerpunkt bezogen.
+    """
+    if len(values) == 2:
+        values = values[0]
+    values = np.asarray(values, dtype=np.float64)
+    ixx, iyy, izz = values[12:15]
+    pxy, pyz, pxz = values[19:22]
+    inertia = np.array([[ixx, -pxy, -pxz],
+                        [-pxy, iyy, -pyz],
+                        [-pxz, -pyz, izz]]) * CM_TO_MM ** 2
+    return MassProperties(float(values[2]), float(values[0]) * CM_TO_MM ** 2, float(values[1]) * CM_TO_MM ** 3,
+                          values[3:6] * CM_TO_MM, inertia)
+
+
+def empty_mass_properties():
+    """Platzhalter für Körper, die nicht gemessen werden (z. B. Flächenkörper)."""
+    return MassProperties(np.nan, np.nan, np.nan, np.full(3, np.nan), np.full((3, 3), np.nan))
+
+
+def mass_property_arrays(properties):
+    """Spaltenweise Ablage einer Liste von MassProperties für die Momentaufnahme."""
+    return {
+        "body_masses": np.array([entry.mass for entry in properties], dtype=np.float64),
+        "body_areas": np.array([entry.area for entry in properties], dtype=np.float64),
+        "body_volumes": np.array([entry.volume for entry in properties], dtype=np.float64),
+        "body_centroids": np.array([entry.center_of_gravity for entry in properties], dtype=np.float64).reshape(-1, 3),
+        "body_inertia": np.array([entry.inertia_tensor for entry in properties], dtype=np.float64).reshape(-1, 3, 3)
+    }
+
@@ -0,0 +1,329 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batchgrading import BatchItem, BatchOutcome, BatchRunner, StandInSession, collect_parts, default_results_file, \
+    failed_result, pop_option
+from referencepacks import MODEL_SOLUTIONS
+from results import GradingResult, ResultRecorder, append_result
+
+# NX-Aufruf für Journale ohne Oberfläche; mit --run-journal oder über UGII_BASE_DIR anpassbar
+RUN_JOURNAL = os.path.join(os.environ["UGII_BASE_DIR"], "NXBIN", "run_journal") if "UGII_BASE_DIR" in os.environ \
+    else "run_journal"
+GRADING_JOURNAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dividedcode.py")
+
+# Ein Teil, das so oft einen Worker zum Absturz gebracht hat, wird nicht mehr verteilt
+MAX_ATTEMPTS = 2
+POLL_INTERVAL = 0.2
+
+# Aufbau der Warteschlange: offene Aufträge, je Worker die gerade bearbeiteten, fertige Ergebnisse
+OPEN_DIR = "offen"
+RESULT_DIR = "ergebnisse"
+JOB_SUFFIX = ".json"
+
+
+def worker_dir(queue_dir, worker_id):
+    return os.path.join(queue_dir, f"worker_{worker_id}")
+
+
+def _write_json(path, values):
+    # erst vollständig schreiben, dann umbenennen: andere Prozesse sehen nie eine halbe Datei
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as json_file:
+        json.dump(values, json_file, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    with open(path, encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def _job_files(directory):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory) if name.endswith(JOB_SUFFIX))
+
+
+def outcome_to_dict(outcome):
+    values = outcome._asdict()
+    values["result"] = outcome.result._asdict()
+    return values
+
+
+def outcome_from_dict(values):
+    return BatchOutcome(**dict(values, result=GradingResult(**values["result"])))
+
+
+def claim_job(queue_dir, claimed_dir):
+    """
+    Übernimmt den nächsten offenen Auftrag. os.rename ist atomar, sodass jeder Auftrag genau
+    einem Worker zufällt; verliert ein Worker das Rennen um eine Datei, versucht er die nächste.
+    """
+    open_dir = os.path.join(queue_dir, OPEN_DIR)
+    for name in _job_files(open_dir):
+        claimed_path = os.path.join(claimed_dir, name)
+        try:
+            os.rename(os.path.join(open_dir, name), claimed_path)
+        except OSError:
+            continue
+        # Zeitpunkt der Übernahme für die Zeitüberwachung im Koordinator
+        os.utime(claimed_path)
+        return claimed_path
+    return None
+
+
+def serve_queue(runner, queue_dir, worker_id):
+    """
+    Arbeitsschleife eines Workers: Aufträge übernehmen und mit dem BatchRunner prüfen, bis die
+    Warteschlange leer ist. Das Ergebnis wird vor dem Löschen des Auftrags geschrieben; stürzt der
+    Worker dazwischen ab, findet der Koordinator den Auftrag im Worker-Verzeichnis wieder.
+    """
+    claimed_dir = worker_dir(queue_dir, worker_id)
+    os.makedirs(claimed_dir, exist_ok=True)
+    graded = 0
+    while True:
+        job_path = claim_job(queue_dir, claimed_dir)
+        if job_path is None:
+            return graded
+        job = _read_json(job_path)
+        outcome = runner.run_item(BatchItem(job["part_path"], job["exercise"]))
+        _write_json(os.path.join(queue_dir, RESULT_DIR, os.path.basename(job_path)), outcome_to_dict(outcome))
+        os.remove(job_path)
+        graded += 1
+
+
+class QueueCoordinator:
+    """
+    Verteilt Teile über eine gemeinsame Warteschlange (Verzeichnis) auf mehrere Worker-Prozesse,
+    jeder mit eigener NX-Sitzung. Die Worker holen sich Aufträge einzeln, sodass schnelle Worker
+    mehr Teile übernehmen. Beendet sich ein Worker mit übernommenen Aufträgen (Absturz oder
+    Zeitüberschreitung), werden diese wieder eingereiht und bei Bedarf ein neuer Worker gestartet.
+    Am Ende werden die Ergebnisse in der Reihenfolge der Teile zusammengeführt.
+
+    worker_command(queue_dir, worker_id) liefert die Kommandozeile eines Workers.
+    """
+
+    def __init__(self, worker_command, workers, queue_dir=None, max_attempts=MAX_ATTEMPTS, part_timeout=None,
+                 poll_interval=POLL_INTERVAL, log=None):
+        self.worker_command = worker_command
+        self.workers = max(1, workers)
+        self.queue_dir = queue_dir
+        self.max_attempts = max_attempts
+        self.part_timeout = part_timeout
+        self.poll_interval = poll_interval
+        self.log = log or (lambda text: None)
+
+    def _enqueue(self, items):
+        open_dir = os.path.join(self.queue_dir, OPEN_DIR)
+        os.makedirs(open_dir, exist_ok=True)
+        os.makedirs(os.path.join(self.queue_dir, RESULT_DIR), exist_ok=True)
+        for item_no, item in enumerate(items):
+            _write_json(os.path.join(open_dir, f"{item_no:06d}{JOB_SUFFIX}"),
+                        {"part_path": item.part_path, "exercise": item.exercise, "attempts": 0})
+
+    def _start_worker(self, worker_id):
+        return subprocess.Popen(self.worker_command(self.queue_dir, worker_id))
+
+    def _recover(self, worker_id, reason):
+        """Reiht die Aufträge eines beendeten Workers wieder ein; liefert deren Anzahl."""
+        claimed_dir = worker_dir(self.queue_dir, worker_id)
+        names = _job_files(claimed_dir)
+        for name in names:
+            job_path = os.path.join(claimed_dir, name)
+            if os.path.exists(os.path.join(self.queue_dir, RESULT_DIR, name)):
+                # Ergebnis schon geschrieben, nur der Auftrag wurde nicht mehr gelöscht
+                os.remove(job_path)
+                continue
+            job = _read_json(job_path)
+            job["attempts"] += 1
+            if job["attempts"] >= self.max_attempts:
+                item = BatchItem(job["part_path"], job["exercise"])
+                error = f"Worker beim Prüfen abgebrochen ({reason}, {job['attempts']} Versuche)"
+                outcome = BatchOutcome(item.part_path, item.exercise, "absturz", error, 0.0,
+                                       failed_result(item, error, None, 0.0))
+                _write_json(os.path.join(self.queue_dir, RESULT_DIR, name), outcome_to_dict(outcome))
+                self.log(f"{item.part_path}: {error}")
+            else:
+                _write_json(os.path.join(self.queue_dir, OPEN_DIR, name), job)
+            os.remove(job_path)
+        return len(names)
+
+    def _overdue(self, worker_id):
+        if self.part_timeout is None:
+            return False
+        claimed_dir = worker_dir(self.queue_dir, worker_id)
+        now = time.time()
+        for name in _job_files(claimed_dir):
+            try:
+                if now - os.path.getmtime(os.path.join(claimed_dir, name)) > self.part_timeout:
+                    return True
+            except OSError:
+                continue
+        return False
+
+    def run(self, items):
+        own_queue = self.queue_dir is None
+        if own_queue:
+            self.queue_dir = tempfile.mkdtemp(prefix="warteschlange_")
+        try:
+            self._enqueue(items)
+            self._dispatch(len(items))
+            return self._collect(items)
+        finally:
+            if own_queue:
+                shutil.rmtree(self.queue_dir, ignore_errors=True)
+                self.queue_dir = None
+
+    def _dispatch(self, item_count):
+        active = {}
+        next_worker_id = 0
+        # Worker, die ohne übernommenen Auftrag fehlschlagen (z. B. keine NX-Lizenz), begrenzen die Neustarts
+        failed_starts = 0
+        reported = None
+        while True:
+            for worker_id, process in list(active.items()):
+                if process.poll() is None and self._overdue(worker_id):
+                    self.log(f"Worker {worker_id}: Zeitüberschreitung, wird beendet")
+                    process.kill()
+                    process.wait()
+                    reason = "Zeitüberschreitung"
+                elif process.poll() is None:
+                    continue
+                else:
+                    reason = f"Rückgabewert {process.returncode}"
+                del active[worker_id]
+                recovered = self._recover(worker_id, reason)
+                if process.returncode != 0:
+                    self.log(f"Worker {worker_id} beendet ({reason}), {recovered} übernommene(s) Teil(e)")
+                    if recovered == 0:
+                        failed_starts += 1
+
+            open_jobs = len(_job_files(os.path.join(self.queue_dir, OPEN_DIR)))
+            if open_jobs and failed_starts >= self.workers * self.max_attempts and not active:
+                self._abandon("kein Worker lauffähig")
+                open_jobs = 0
+            if not open_jobs and not active:
+                break
+            while open_jobs and len(active) < min(self.workers, open_jobs) \
+                    and failed_starts < self.workers * self.max_attempts:
+                active[next_worker_id] = self._start_worker(next_worker_id)
+                next_worker_id += 1
+            done = len(_job_files(os.path.join(self.queue_dir, RESULT_DIR)))
+            if done != reported:
+                self.log(f"[{done}/{item_count}] {len(active)} Worker aktiv")
+                reported = done
+            time.sleep(self.poll_interval)
+
+    def _abandon(self, reason):
+        open_dir = os.path.join(self.queue_dir, OPEN_DIR)
+        for name in _job_files(open_dir):
+            job = _read_json(os.path.join(open_dir, name))
+            item = BatchItem(job["part_path"], job["exercise"])
+            error = f"Teil nicht geprüft: {reason}"
+            _write_json(os.path.join(self.queue_dir, RESULT_DIR, name),
+                        outcome_to_dict(BatchOutcome(item.part_path, item.exercise, "absturz", error, 0.0,
+                                                     failed_result(item, error, None, 0.0))))
+            os.remove(os.path.join(open_dir, name))
+
+    def _collect(self, items):
+        outcomes = []
+        for item_no, item in enumerate(items):
+            result_path = os.path.join(self.queue_dir, RESULT_DIR, f"{item_no:06d}{JOB_SUFFIX}")
+            outcomes.append(outcome_from_dict(_read_json(result_path)))
+        return outcomes
+
+
+def nx_worker_command(run_journal=RUN_JOURNAL, extra_args=()):
+    """
+    Kommandozeile eines NX-Workers: dividedcode.py im Worker-Modus über run_journal. extra_args
+    werden durchgereicht, z. B. ["--extract", Verzeichnis], damit die Worker nur auslesen.
+    """
+    def command(queue_dir, worker_id):
+        return [run_journal, GRADING_JOURNAL, "-args", "--worker", queue_dir, "--worker-id", str(worker_id),
+                *extra_args]
+    return command
+
+
+def stand_in_worker_command(queue_dir, worker_id):
+    """Kommandozeile eines Workers ohne NX (siehe stand_in_grade), für Tests des Ablaufs."""
+    return [sys.executable, os.path.abspath(__file__), "--stand-in-worker", "--worker", queue_dir,
+            "--worker-id", str(worker_id)]
+
+
+def stand_in_grade(part, exercise):
+    """
+    Prüfung ohne NX für StandInSession-Teile. Die Teiledatei steuert den Ablauf: eine Zeile
+    "dauer <Sekunden>" simuliert Rechenzeit, "fehler" eine fehlschlagende Prüfung und "absturz"
+    einen abstürzenden Worker-Prozess.
+    """
+    with open(part.FullPath, encoding="utf-8", errors="replace") as part_file:
+        directives = [line.split() for line in part_file if line.strip()]
+    result = ResultRecorder(exercise, os.path.basename(part.FullPath))
+    for directive in directives:
+        if directive[0] == "dauer":
+            time.sleep(float(directive[1]))
+        elif directive[0] == "fehler":
+            raise RuntimeError("simulierter Prüfungsfehler")
+        elif directive[0] == "absturz":
+            os._exit(3)
+    result.check("geladen", True)
+    return result.record()
+
+
+def run_parallel_grading(source, exercise, workers, results_file=None, worker_command=None, part_timeout=None):
+    """Prüft die Teile aus source parallel und hängt alle Ergebnisse an eine gemeinsame JSON-Lines-Datei an."""
+    results_file = results_file or default_results_file(source)
+    items = collect_parts(source, exercise)
+    coordinator = QueueCoordinator(worker_command or nx_worker_command(), workers, part_timeout=part_timeout,
+                                   log=print)
+    start = time.perf_counter()
+    outcomes = coordinator.run(items)
+    for outcome in outcomes:
+        append_result(results_file, outcome.result)
+    failed = [outcome for outcome in outcomes if outcome.status != "ok"]
+    print(f"{len(outcomes) - len(failed)} von {len(outcomes)} Teilen mit {coordinator.workers} Workern in "
+          f"{time.perf_counter() - start:.1f} s geprüft, Ergebnisse in {results_file}")
+    return outcomes
+
+
+def main():
+    """
+    Koordinator (ohne NX):  python parallelgrading.py --batch <Verzeichnis|Liste> [--workers 4]
+                            [--exercise vt1] [--results Datei] [--timeout Sekunden] [--run-journal Pfad]
+                            [--extract Verzeichnis] [--stand-in]
+    Mit --extract lesen die Worker die Teile nur aus (Prüfung danach mit evaluate.py),
+    mit --stand-in laufen die Worker ohne NX (stand_in_grade).
+    """
+    args = sys.argv[1:]
+    if "--stand-in-worker" in args:
+        args.remove("--stand-in-worker")
+        runner = BatchRunner(StandInSession(), stand_in_grade, log=print)
+        serve_queue(runner, pop_option(args, "--worker"), pop_option(args, "--worker-id") or "0")
+        return
+
+    stand_in = "--stand-in" in args
+    if stand_in:
+        args.remove("--stand-in")
+    source = pop_option(args, "--batch")
+    exercise = pop_option(args, "--exercise") or "ue1"
+    if source is None or exercise not in MODEL_SOLUTIONS:
+        print(main.__doc__)
+        return
+    timeout = pop_option(args, "--timeout")
+    extract_dir = pop_option(args, "--extract")
+    extra_args = ["--extract", os.path.abspath(extract_dir)] if extract_dir else []
+    worker_command = stand_in_worker_command if stand_in else \
+        nx_worker_command(pop_option(args, "--run-journal") or RUN_JOURNAL, extra_args)
+    run_parallel_grading(source, exercise, int(pop_option(args, "--workers") or os.cpu_count() or 1),
+                         pop_option(args, "--results"), worker_command, float(timeout) if timeout else None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from featurerecords import feature_from_dict, feature_to_dict
+from topology import FACE_TYPE_NAMES, face_type_code
+
+# Ablage der Referenzpakete (eine Datei je Übung)
+DEFAULT_PACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "references")
+PACK_SUFFIX = ".nxref"
+
+# Musterlösungen, aus denen die Referenzpakete erzeugt werden (relativ zum Repository)
+MODEL_SOLUTION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Musterlösung")
+MODEL_SOLUTIONS = {
+    "ue1": "GUE01_Musterlsg.prt",
+    "vt1": "VUE01_2024_Musterlsg.prt",
+    "ue2": "GUE02_2024_Musterlsg.prt",
+    "vt2": "VUE02_2024_Musterlsg.prt"
+}
+
+# Dateiaufbau: MAGIC, Formatversion (uint32), Headerlänge (uint32), JSON-Header, ausgerichtete Rohdaten
+PACK_MAGIC = b"NXREFPK\0"
+PACK_FORMAT = 1
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+_pack_cache = {}
+
+
+class ReferencePackError(Exception):
+    pass
+
+
+def _aligned(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_reference_pack(path, exercise, arrays, meta=None, pack_version=1):
+    """
+    Schreibt ein Referenzpaket. arrays ist ein Dictionary aus Namen und NumPy-Arrays,
+    meta enthält zusätzliche JSON-fähige Angaben für den Header.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    header = {
+        "exercise": exercise,
+        "pack_version": pack_version,
+        "face_type_names": list(FACE_TYPE_NAMES),
+        "meta": meta or {},
+        "arrays": {}
+    }
+    # Die Offsets hängen von der Headerlänge ab, daher wird der Header bis zur Stabilität neu berechnet
+    data_start = 0
+    while True:
+        offset = data_start
+        for name, array in arrays.items():
+            header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset = _aligned(offset + array.nbytes)
+        encoded = json.dumps(header, sort_keys=True).encode("utf-8")
+        required_start = _aligned(_PREAMBLE.size + len(encoded))
+        if required_start == data_start:
+            break
+        data_start = required_start
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as pack_file:
+        pack_file.write(_PREAMBLE.pack(PACK_MAGIC, PACK_FORMAT, len(encoded)))
+        pack_file.write(encoded)
+        for name, array in arrays.items():
+            pack_file.seek(header["arrays"][name]["offset"])
+            pack_file.write(array.tobytes())
+        pack_file.truncate(max([data_start] + [entry["offset"] + arrays[name].nbytes
+                                               for name, entry in header["arrays"].items()]))
+
+
+class ReferencePack:
+    """
+    Referenzdaten einer Übung. Die Arrays werden erst beim ersten Zugriff speicherabgebildet
+    (np.memmap) und danach wiederverwendet.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as pack_file:
+            magic, pack_format, header_length = _PREAMBLE.unpack(pack_file.read(_PREAMBLE.size))
+            if magic != PACK_MAGIC or pack_format != PACK_FORMAT:
+                raise ReferencePackError(f"{path} ist kein Referenzpaket im Format {PACK_FORMAT}")
+            self.header = json.loads(pack_file.read(header_length).decode("utf-8"))
+        self.exercise = self.header["exercise"]
+        self.pack_version = self.header["pack_version"]
+        self.meta = self.header["meta"]
+        self._arrays = {}
+
+    def has(self, name):
+        return name in self.header["arrays"]
+
+    def array(self, name):
+        if name not in self._arrays:
+            entry = self.header["arrays"][name]
+            shape = tuple(entry["shape"])
+            if 0 in shape:
+                self._arrays[name] = np.zeros(shape, dtype=entry["dtype"])
+            else:
+                self._arrays[name] = np.memmap(self.path, dtype=entry["dtype"], mode="r",
+                                               offset=entry["offset"], shape=shape)
+        return self._arrays[name]
+
+    def reference_faces(self):
+        """Referenzflächen als Liste von (Flächentyp, Kantenlängen)."""
+        type_names = self.header["face_type_names"]
+        types = self.array("face_types")
+        offsets = self.array("face_edge_offsets")
+        lengths = self.array("face_edge_lengths")
+        return [
+            (type_names[types[idx]], [round(float(length), 3) for length in lengths[offsets[idx]:offsets[idx + 1]]])
+            for idx in range(len(types))
+        ]
+
+    def sketch_length_histogram(self, sketch_idx):
+        """Gerundete Linienlängen einer Skizze der Musterlösung mit ihrer Häufigkeit."""
+        offsets = self.array("sketch_histogram_offsets")
+        values = self.array("sketch_histogram_lengths")[offsets[sketch_idx]:offsets[sketch_idx + 1]]
+        counts = self.array("sketch_histogram_counts")[offsets[sketch_idx]:offsets[sketch_idx + 1]]
+        return {round(float(value), 3): int(count) for value, count in zip(values, counts)}
+
+    def sketch_length_histograms(self):
+        """Histogramme aller Skizzen der Musterlösung; leer bei Paketen, die noch keine Skizzen enthalten."""
+        if not self.has("sketch_histogram_offsets"):
+            return []
+        return [self.sketch_length_histogram(sketch_idx)
+                for sketch_idx in range(len(self.array("sketch_histogram_offsets")) - 1)]
+
+    def features(self):
+        """Feature-Parameter der Musterlösung als Records (featurerecords.py)."""
+        return [feature_from_dict(feature) for feature in self.meta.get("features", ())]
+
+    def reference_edges(self):
+        """Referenzkanten als Liste von Dictionaries mit 'length', 'start' und 'end'."""
+        lengths = self.array("edge_lengths")
+        starts = self.array("edge_starts")
+        ends = self.array("edge_ends")
+        return [
+            {
+                'length': round(float(lengths[idx]), 3),
+                'start': tuple(round(float(value), 3) for value in starts[idx]),
+                'end': tuple(round(float(value), 3) for value in ends[idx])
+            }
+            for idx in range(len(lengths))
+        ]
+
+
+def face_arrays(reference_faces):
+    """Wandelt (Flächentyp, Kantenlängen)-Paare in die Arrays eines Referenzpakets um."""
+    offsets = np.zeros(len(reference_faces) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(edges) for _, edges in reference_faces])
+    return {
+        "face_types": np.array([face_type_code(face_type) for face_type, _ in reference_faces], dtype=np.int8),
+        "face_edge_offsets": offsets,
+        "face_edge_lengths": np.array([length for _, edges in reference_faces for length in edges], dtype=np.float32)
+    }
+
+
+def edge_arrays(reference_edges):
+    """Wandelt Referenzkanten ('length', 'start', 'end') in die Arrays eines Referenzpakets um."""
+    return {
+        "edge_lengths": np.array([edge['length'] for edge in reference_edges], dtype=np.float32).reshape(-1),
+        "edge_starts": np.array([edge['start'] for edge in reference_edges], dtype=np.float32).reshape(-1, 3),
+        "edge_ends": np.array([edge['end'] for edge in reference_edges], dtype=np.float32).reshape(-1, 3)
+    }
+
+
+def sketch_histogram_arrays(snapshot, decimals=3):
+    """Histogramm der gerundeten Linienlängen je Skizze im CSR-Layout."""
+    offsets = [0]
+    values = []
+    counts = []
+    for sketch_idx in range(snapshot.sketch_count):
+        lengths, length_counts = np.unique(np.round(snapshot.sketch_line_lengths(sketch_idx), decimals), return_counts=True)
+        values.extend(lengths)
+        counts.extend(length_counts)
+        offsets.append(len(values))
+    return {
+        "sketch_histogram_offsets": np.array(offsets, dtype=np.int32),
+        "sketch_histogram_lengths": np.array(values, dtype=np.float32),
+        "sketch_histogram_counts": np.array(counts, dtype=np.int32)
+    }
+
+
+def snapshot_pack_arrays(snapshot, decimals=3):
+    """Arrays eines Referenzpakets aus der Momentaufnahme einer Musterlösung."""
+    reference_faces = [(snapshot.face_type_name(face_idx), np.round(snapshot.face_edge_lengths(face_idx), decimals))
+                       for face_idx in range(snapshot.face_count)]
+    arrays = face_arrays(reference_faces)
+    arrays.update({
+        "edge_lengths": np.round(snapshot.edge_lengths, decimals).astype(np.float32),
+        "edge_starts": np.round(snapshot.edge_starts, decimals).astype(np.float32),
+        "edge_ends": np.round(snapshot.edge_ends, decimals).astype(np.float32)
+    })
+    arrays.update(sketch_histogram_arrays(snapshot, decimals))
+    return arrays
+
+
+def pack_is_current(path, part_hash, extractor_version):
+    """Prüft, ob ein vorhandenes Paket bereits aus genau dieser Musterlösung erzeugt wurde."""
+    try:
+        meta = ReferencePack(path).meta
+    except (OSError, ValueError, KeyError, struct.error, ReferencePackError):
+        return False
+    return meta.get("part_hash") == part_hash and meta.get("extractor_version") == extractor_version
+
+
+def compile_reference_pack(snapshot, exercise, part_hash, extractor_version, source_name, pack_dir=DEFAULT_PACK_DIR):
+    """
+    Schreibt das Referenzpaket einer Übung aus der Momentaufnahme ihrer Musterlösung.
+    Die Paketversion wird gegenüber einem vorhandenen Paket hochgezählt.
+    """
+    path = pack_path(exercise, pack_dir)
+    pack_version = 1
+    if os.path.isfile(path):
+        try:
+            pack_version = ReferencePack(path).pack_version + 1
+        except (OSError, ValueError, KeyError, struct.error, ReferencePackError):
+            pass
+    meta = {
+        "source": source_name,
+        "part_hash": part_hash,
+        "extractor_version": extractor_version,
+        "features": [feature_to_dict(feature) for feature in snapshot.features]
+    }
+    write_reference_pack(path, exercise, snapshot_pack_arrays(snapshot), meta, pack_version)
+    _pack_cache.pop(path, None)
+    return path
+
+
+def pack_path(exercise, pack_dir=DEFAULT_PACK_DIR):
+    return os.path.join(pack_dir, exercise + PACK_SUFFIX)
+
+
+def load_reference_pack(exercise, pack_dir=DEFAULT_PACK_DIR):
+    """Lädt das Referenzpaket einer Übung (z. B. "ue1") einmal je Sitzung."""
+    path = pack_path(exercise, pack_dir)
+    if path not in _pack_cache:
+        _pack_cache[path] = ReferencePack(path)
+    return _pack_cache[path]
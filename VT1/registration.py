@@ -0,0 +1,120 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from edgegeometry import edge_points
+from spatialindex import PointGrid
+
+# Ergebnis einer Ausrichtung: x_referenz = rotation @ x + translation, residuals je Punkt bzw. Kante
+Registration = namedtuple("Registration", "rotation translation residuals rms iterations")
+
+# Punktgitter der Referenzpakete, Schlüssel (Paketpfad, Paketversion)
+_reference_grids = {}
+
+
+def transform_points(points, rotation, translation):
+    return np.asarray(points, dtype=np.float64).reshape(-1, 3) @ rotation.T + translation
+
+
+def rotation_angle(rotation):
+    """Drehwinkel einer Rotationsmatrix in Grad."""
+    return math.degrees(math.acos(float(np.clip((np.trace(rotation) - 1) / 2, -1.0, 1.0))))
+
+
+def kabsch(source, target):
+    """Starre Transformation (Rotation, Translation), die source im Sinne kleinster Quadrate auf target abbildet."""
+    source_centroid = source.mean(axis=0)
+    target_centroid = target.mean(axis=0)
+    covariance = (source - source_centroid).T @ (target - target_centroid)
+    u, _, vt = np.linalg.svd(covariance)
+    # Spiegelungen ausschließen
+    correction = np.diag([1.0, 1.0, np.sign(np.linalg.det(vt.T @ u.T)) or 1.0])
+    rotation = vt.T @ correction @ u.T
+    return rotation, target_centroid - rotation @ source_centroid
+
+
+def principal_axes(points):
+    """Schwerpunkt und Hauptachsen (Spalten, absteigende Varianz, rechtshändig) einer Punktwolke."""
+    centroid = points.mean(axis=0)
+    _, axes = np.linalg.eigh(np.cov((points - centroid).T) if len(points) > 1 else np.eye(3))
+    axes = axes[:, ::-1]
+    if np.linalg.det(axes) < 0:
+        axes[:, 2] = -axes[:, 2]
+    return centroid, axes
+
+
+def initial_guesses(source, target):
+    """
+    Startwerte für ICP: reine Verschiebung der Schwerpunkte sowie die vier rechtshändigen
+    Zuordnungen der Hauptachsen (die Vorzeichen der Eigenvektoren sind nicht festgelegt).
+    """
+    source_centroid, source_axes = principal_axes(source)
+    target_centroid, target_axes = principal_axes(target)
+    yield np.eye(3), target_centroid - source_centroid
+    for signs in ((1, 1, 1), (1, -1, -1), (-1, 1, -1), (-1, -1, 1)):
+        rotation = target_axes @ np.diag(signs) @ source_axes.T
+        yield rotation, target_centroid - rotation @ source_centroid
+
+
+def icp(source, grid, rotation, translation, max_iterations=50, tolerance=1e-9, inlier_fraction=0.9):
+    """
+    Iterative Closest Point: ordnet jedem Quellpunkt den nächsten Referenzpunkt zu und
+    bestimmt daraus die Transformation neu, bis die mittlere Abweichung nicht mehr sinkt.
+    Nur der Anteil inlier_fraction der Paare mit dem kleinsten Abstand geht in die Schätzung ein,
+    damit zusätzliche oder fehlende Geometrie die Ausrichtung nicht verzieht.
+    Jede Pose wird vor dem nächsten Schritt bewertet, auch die nach dem letzten Schritt; geliefert
+    wird die Pose mit der kleinsten Abweichung als (rotation, translation, rms, Schritte bis dahin).
+    """
+    best = (rotation, translation, math.inf, 0)
+    previous_rms = math.inf
+    for iteration in range(max_iterations + 1):
+        indices, distances = grid.nearest(transform_points(source, rotation, translation))
+        inliers = distances <= np.quantile(distances, inlier_fraction)
+        rms = float(np.sqrt(np.mean(distances[inliers] ** 2)))
+        if rms < best[2]:
+            best = (rotation, translation, rms, iteration)
+        if iteration == max_iterations or previous_rms - rms <= tolerance:
+            break
+        previous_rms = rms
+        rotation, translation = kabsch(source[inliers], grid.points[indices[inliers]])
+    return best
+
+
+def register_points(source, target, grid=None, max_iterations=50):
+    """
+    Richtet die Punktwolke source starr auf target aus (Hauptachsen als Startwert, danach ICP).
+    Liefert die beste Ausrichtung über alle Startwerte mit dem Restabstand je Quellpunkt;
+    rms bezieht sich auf die für die Schätzung verwendeten Paare.
+    """
+    source = np.asarray(source, dtype=np.float64).reshape(-1, 3)
+    grid = grid if grid is not None else PointGrid(target)
+    if len(source) == 0 or len(grid.points) == 0:
+        return Registration(np.eye(3), np.zeros(3), np.full(len(source), np.inf), math.inf, 0)
+
+    best = None
+    for rotation, translation in initial_guesses(source, grid.points):
+        result = icp(source, grid, rotation, translation, max_iterations)
+        if best is None or result[2] < best[2]:
+            best = result
+    rotation, translation, rms, iterations = best
+    residuals = grid.nearest(transform_points(source, rotation, translation))[1]
+    return Registration(rotation, translation, residuals, rms, iterations)
+
+
+def register_edges(starts, ends, reference_grid, max_iterations=50):
+    """
+    Richtet Kanten über ihre Start-, End- und Mittelpunkte auf das Referenzgitter aus.
+    Der Restabstand einer Kante ist der größte Restabstand ihrer drei Punkte.
+    """
+    edge_count = len(starts)
+    registration = register_points(edge_points(starts, ends), None, reference_grid, max_iterations)
+    return registration._replace(residuals=registration.residuals.reshape(3, edge_count).max(axis=0))
+
+
+def reference_point_grid(pack):
+    """Punktgitter über Start-, End- und Mittelpunkten der Referenzkanten eines Pakets."""
+    key = (pack.path, pack.pack_version)
+    if key not in _reference_grids:
+        _reference_grids[key] = PointGrid(edge_points(pack.array("edge_starts"), pack.array("edge_ends")))
+    return _reference_grids[key]
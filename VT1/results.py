@@ -0,0 +1,98 @@
+import json
+import math
+import os
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+# Ergebnis der Prüfung eines Teils: checks {Prüfung: bool/Zahl}, score/max_score (None ohne Bewertung),
+# timings {Abschnitt: Sekunden}, error der Fehlertext, falls das Teil nicht geprüft werden konnte
+GradingResult = namedtuple("GradingResult", "exercise part_name part_hash extractor_version checks score max_score timings error",
+                           defaults=(None,))
+
+
+def _plain(value):
+    # NumPy-Skalare in JSON-fähige Python-Werte umwandeln; inf und NaN (z. B. Ausrichtung ohne Kanten,
+    # nicht gemessene Flächenkörper) werden zu None, da JSON dafür keinen Wert kennt
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _plain(entry) for key, entry in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(entry) for entry in value]
+    return value
+
+
+class ResultRecorder:
+    """
+    Sammelt während der Prüfung eines Teils die Ergebnisse der einzelnen Prüfungen, die Bewertung
+    und die Laufzeiten der Abschnitte. Die Prüfungen geben ihre Ergebnisse zusätzlich zur Ausgabe
+    im Listing Window hier ab, record() liefert daraus einen GradingResult.
+    """
+
+    def __init__(self, exercise, part_name=None, part_hash=None, extractor_version=None):
+        self.exercise = exercise
+        self.part_name = part_name
+        self.part_hash = part_hash
+        self.extractor_version = extractor_version
+        self.checks = {}
+        self.score = None
+        self.max_score = None
+        self.timings = {}
+
+    def check(self, name, value):
+        """Legt das Ergebnis einer Prüfung ab (inf/NaN als None) und gibt den Wert unverändert zurück."""
+        self.checks[name] = _plain(value)
+        return value
+
+    def set_score(self, score, max_score=10):
+        self.score = score
+        self.max_score = max_score
+
+    @contextmanager
+    def timed(self, name):
+        """Misst die Laufzeit eines Abschnitts; wiederholte Abschnitte werden aufsummiert."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self):
+        return GradingResult(self.exercise, self.part_name, self.part_hash, self.extractor_version,
+                             dict(self.checks), self.score, self.max_score,
+                             {name: round(seconds, 6) for name, seconds in self.timings.items()})
+
+
+def result_to_json(result):
+    """Ein Ergebnis als einzelne JSON-Zeile."""
+    return json.dumps(_plain(result._asdict()), ensure_ascii=False, allow_nan=False)
+
+
+def append_result(path, result):
+    """
+    Hängt ein Ergebnis als Zeile an eine JSON-Lines-Datei an. Die Zeile wird mit einem einzigen
+    write geschrieben, sodass mehrere Läufe dieselbe Datei verwenden können.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as result_file:
+        result_file.write(result_to_json(result) + "\n")
+
+
+def read_results(path):
+    """Liest alle Ergebnisse einer JSON-Lines-Datei; unvollständige Zeilen werden übersprungen."""
+    results = []
+    with open(path, encoding="utf-8") as result_file:
+        for line in result_file:
+            try:
+                results.append(GradingResult(**json.loads(line)))
+            except (ValueError, TypeError):
+                continue
+    return results
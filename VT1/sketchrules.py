@@ -0,0 +1,148 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Eine Skizzenregel: geforderte Linienlängen und Radien jeweils als {Wert: Mindestanzahl}.
+# scope "sketch": erfüllt, wenn eine einzelne Skizze alle Anforderungen erfüllt;
+# scope "part": die Kurven aller Skizzen zählen gemeinsam.
+SketchRule = namedtuple("SketchRule", "name lengths radii rel_tol abs_tol scope")
+# Vergleich einer Skizze der Musterlösung mit der ähnlichsten Skizze des Teils (None, falls das Teil keine Skizzen hat)
+SketchComparison = namedtuple("SketchComparison", "reference_sketch sketch matched expected")
+
+# Entspricht dem Vergleich der auf drei Nachkommastellen gerundeten Längen
+ROUNDED_ABS_TOL = 5e-4
+
+
+def sketch_rule(name, lengths=None, radii=None, rel_tol=1e-5, abs_tol=0.0, scope="sketch"):
+    """
+    Legt eine Regel an. lengths und radii sind Dictionaries {Wert: Anzahl} oder Listen;
+    bei Listen muss jeder Wert mindestens einmal vorkommen.
+    """
+    def counts(values):
+        if values is None:
+            return {}
+        return dict(values) if isinstance(values, dict) else {value: 1 for value in values}
+    return SketchRule(name, counts(lengths), counts(radii), rel_tol, abs_tol, scope)
+
+
+# Regeln je Übung; eine neue Prüfung ist ein weiterer Eintrag
+EXERCISE_SKETCH_RULES = {
+    "ue1": [
+        sketch_rule("rotationsfeature", lengths=[22.5, 11.0, 10.5, 5.0, 12.0, 16.0]),
+        sketch_rule("musterfeature", lengths={1.5: 1, 6.502: 2, 1.2: 1}, rel_tol=0.0, abs_tol=ROUNDED_ABS_TOL),
+        # Alternativlösung: Kreise statt Rotationsskizze, Radien über alle Skizzen
+        sketch_rule("alternativloesung", radii=[12.0, 22.5], scope="part")
+    ],
+    "vt1": [
+        sketch_rule("rotationsfeature", lengths=[444.000, 17.000, 126.000, 0.500, 10.000, 2.000, 21.000, 18.000,
+                                                 5.000, 170.000, 2.500, 12.000, 19.500, 65.000]),
+        sketch_rule("passfeder", lengths={31.0: 2, 55.0: 1}, rel_tol=0.0, abs_tol=ROUNDED_ABS_TOL),
+        sketch_rule("keilwelle", lengths={3.106: 2}, rel_tol=0.0, abs_tol=ROUNDED_ABS_TOL)
+    ],
+    "ue2": [
+        sketch_rule("rotationsfeature", lengths=[22.5, 11.0, 10.5, 5.0, 12.0, 16.0]),
+        sketch_rule("musterfeature", lengths={1.5: 1, 6.502: 2, 1.2: 1}, rel_tol=0.0, abs_tol=ROUNDED_ABS_TOL)
+    ],
+    "vt2": [
+        sketch_rule("rotationsfeature", lengths=[22.5, 11.0, 10.5, 5.0, 12.0, 16.0]),
+        sketch_rule("musterfeature", lengths={1.5: 1, 6.502: 2, 1.2: 1}, rel_tol=0.0, abs_tol=ROUNDED_ABS_TOL)
+    ]
+}
+
+
+class CompiledRequirements:
+    """
+    Alle Anforderungen einer Kurvenart (Längen oder Radien) aus mehreren Regeln als Arrays:
+    Toleranzintervall, Mindestanzahl und zugehörige Regel. Die Anzahl passender Werte einer
+    Skizze ergibt sich für alle Anforderungen gemeinsam aus zwei np.searchsorted-Aufrufen
+    auf den sortierten Werten der Skizze.
+    """
+
+    def __init__(self, rules, field):
+        requirements = [(rule_idx, value, count, max(rule.rel_tol * abs(value), rule.abs_tol))
+                        for rule_idx, rule in enumerate(rules)
+                        for value, count in getattr(rule, field).items()]
+        self.rule_ids = np.array([entry[0] for entry in requirements], dtype=np.int64)
+        self.lower = np.array([entry[1] - entry[3] for entry in requirements], dtype=np.float64)
+        self.upper = np.array([entry[1] + entry[3] for entry in requirements], dtype=np.float64)
+        self.required = np.array([entry[2] for entry in requirements], dtype=np.int64)
+
+    def found_counts(self, values):
+        """Anzahl der Werte im Toleranzintervall jeder Anforderung."""
+        values = np.sort(np.asarray(values, dtype=np.float64))
+        return np.searchsorted(values, self.upper, side="right") - np.searchsorted(values, self.lower, side="left")
+
+    def satisfied_rules(self, found, rule_count):
+        """Regeln, deren Anforderungen dieser Kurvenart alle erfüllt sind."""
+        satisfied = np.ones(rule_count, dtype=bool)
+        np.logical_and.at(satisfied, self.rule_ids, found >= self.required)
+        return satisfied
+
+
+class SketchRuleSet:
+    """Vorkompilierte Regeln, die für alle Skizzen eines Teils in einem Durchlauf ausgewertet werden."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.lengths = CompiledRequirements(self.rules, "lengths")
+        self.radii = CompiledRequirements(self.rules, "radii")
+        self.part_scope = np.array([rule.scope == "part" for rule in self.rules], dtype=bool)
+
+    def evaluate(self, snapshot):
+        """
+        Wertet alle Regeln aus; jede Skizze wird genau einmal gelesen. Liefert {Regelname: bool}.
+        """
+        rule_count = len(self.rules)
+        sketch_satisfied = np.zeros(rule_count, dtype=bool)
+        part_lengths = np.zeros(len(self.lengths.required), dtype=np.int64)
+        part_radii = np.zeros(len(self.radii.required), dtype=np.int64)
+        for sketch_idx in range(snapshot.sketch_count):
+            found_lengths = self.lengths.found_counts(snapshot.sketch_line_lengths(sketch_idx))
+            found_radii = self.radii.found_counts(snapshot.sketch_arc_radii(sketch_idx))
+            part_lengths += found_lengths
+            part_radii += found_radii
+            sketch_satisfied |= self.lengths.satisfied_rules(found_lengths, rule_count) \
+                & self.radii.satisfied_rules(found_radii, rule_count)
+
+        part_satisfied = self.lengths.satisfied_rules(part_lengths, rule_count) \
+            & self.radii.satisfied_rules(part_radii, rule_count)
+        satisfied = np.where(self.part_scope, part_satisfied, sketch_satisfied)
+        return {rule.name: bool(satisfied[rule_idx]) for rule_idx, rule in enumerate(self.rules)}
+
+
+_compiled_rule_sets = {}
+
+
+def evaluate_sketch_rules(snapshot, exercise):
+    """Wertet die Skizzenregeln einer Übung (z. B. "ue1") aus; die Regeln werden einmal kompiliert."""
+    if exercise not in _compiled_rule_sets:
+        _compiled_rule_sets[exercise] = SketchRuleSet(EXERCISE_SKETCH_RULES[exercise])
+    return _compiled_rule_sets[exercise].evaluate(snapshot)
+
+
+def sketch_length_histogram(lengths, decimals=3):
+    """Gerundete Linienlängen mit ihrer Häufigkeit als {Länge: Anzahl}."""
+    values, counts = np.unique(np.round(np.asarray(lengths, dtype=np.float64), decimals), return_counts=True)
+    return {round(float(value), decimals): int(count) for value, count in zip(values, counts)}
+
+
+def compare_sketch_histograms(reference_histograms, snapshot, decimals=3):
+    """
+    Ordnet jeder Skizze der Musterlösung (Histogramm ihrer Linienlängen aus dem Referenzpaket) die
+    Skizze des Teils zu, die die meisten ihrer Linien enthält. Gleiche Längen zählen dabei höchstens
+    so oft, wie sie in beiden Skizzen vorkommen. Skizzen der Musterlösung ohne Linien werden übergangen.
+    """
+    histograms = [sketch_length_histogram(snapshot.sketch_line_lengths(sketch_idx), decimals)
+                  for sketch_idx in range(snapshot.sketch_count)]
+    comparisons = []
+    for reference_idx, reference in enumerate(reference_histograms):
+        expected = sum(reference.values())
+        if not expected:
+            continue
+        best_sketch, best_matched = None, 0
+        for sketch_idx, histogram in enumerate(histograms):
+            matched = sum(min(count, histogram.get(length, 0)) for length, count in reference.items())
+            if best_sketch is None or matched > best_matched:
+                best_sketch, best_matched = sketch_idx, matched
+        comparisons.append(SketchComparison(reference_idx, best_sketch, best_matched, expected))
+    return comparisons
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from featuregraph import FeatureGraph
+from featurerecords import feature_from_dict, feature_to_dict
+from topology import PartSnapshot
+
+# Version der Extraktion; bei Änderungen an extract_part_snapshot (dividedcode.py) erhöhen, damit alte
+# Cache-Einträge verworfen werden und evaluate.py keine Momentaufnahmen im alten Aufbau prüft
+EXTRACTOR_VERSION = 7
+
+# Standardablage der Momentaufnahmen neben dem Journal
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot_cache")
+
+
+def part_file_hash(part_path, chunk_size=1 << 20):
+    """
+    Berechnet den SHA-256 der Teiledatei. Liefert None, wenn die Datei nicht lesbar ist
+    (z. B. bei einem noch nicht gespeicherten Teil).
+    """
+    if not part_path or not os.path.isfile(part_path):
+        return None
+    digest = hashlib.sha256()
+    with open(part_path, "rb") as part_file:
+        for chunk in iter(lambda: part_file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(part_hash, extractor_version, cache_dir=DEFAULT_CACHE_DIR):
+    return os.path.join(cache_dir, f"{part_hash}-v{extractor_version}.npz")
+
+
+def save_snapshot(path, snapshot, extractor_version, part_hash=None, part_name=None, exercise=None):
+    """
+    Schreibt eine Momentaufnahme als komprimierte .npz-Datei. Die Datei wird zuerst
+    temporär geschrieben und dann umbenannt, damit abgebrochene Läufe keine halben
+    Einträge hinterlassen. Mit part_name und exercise ist die Datei in sich vollständig
+    und kann ohne das Teil geprüft werden (evaluate.py).
+    """
+    meta = {field: getattr(snapshot, field) for field in PartSnapshot.META_FIELDS}
+    meta["features"] = [feature_to_dict(feature) for feature in snapshot.features]
+    meta["feature_graph"] = snapshot.feature_graph.to_dict() if snapshot.feature_graph is not None else None
+    meta["extractor_version"] = extractor_version
+    meta["part_hash"] = part_hash
+    meta["part_name"] = part_name
+    meta["exercise"] = exercise
+    arrays = {field: getattr(snapshot, field) for field in PartSnapshot.ARRAY_FIELDS}
+    arrays["meta"] = np.array(json.dumps(meta))
+
+    _write_atomically(path, ".npz", lambda tmp_file: np.savez_compressed(tmp_file, **arrays))
+
+
+def _write_atomically(path, suffix, write):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    handle, tmp_path = tempfile.mkstemp(suffix=suffix, dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as tmp_file:
+            write(tmp_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_snapshot(path, extractor_version=None, part_hash=None):
+    """
+    Lädt eine Momentaufnahme. Liefert None, wenn die Datei fehlt, beschädigt ist oder
+    nicht zur erwarteten Extraktorversion bzw. zum erwarteten Teile-Hash passt.
+    """
+    if not os.path.isfile(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if extractor_version is not None and meta.get("extractor_version") != extractor_version:
+                return None
+            if part_hash is not None and meta.get("part_hash") != part_hash:
+                return None
+            arrays = {field: data[field] for field in PartSnapshot.ARRAY_FIELDS}
+        fields = {field: meta[field] for field in PartSnapshot.META_FIELDS}
+        return PartSnapshot(**fields, **arrays)
+    except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile):
+        return None
+
+
+def snapshot_info(path):
+    """
+    Herkunft einer gespeicherten Momentaufnahme (part_name, part_hash, exercise, extractor_version),
+    ohne die Arrays zu laden. Liefert None, wenn die Datei nicht lesbar ist.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+    return {key: meta.get(key) for key in ("part_name", "part_hash", "exercise", "extractor_version")}
+
+
+def snapshot_export_path(export_dir, part_name, part_hash):
+    """Dateiname einer exportierten Momentaufnahme: Teilename und Hash-Anfang, damit Abgaben gleichen Namens nebeneinander liegen."""
+    stem = os.path.splitext(part_name or "teil")[0]
+    return os.path.join(export_dir, f"{stem}-{(part_hash or 'ohne_hash')[:12]}.npz")
+
+
+def load_cached_snapshot(part_hash, extractor_version, cache_dir=DEFAULT_CACHE_DIR):
+    return load_snapshot(cache_path(part_hash, extractor_version, cache_dir), extractor_version, part_hash)
+
+
+def store_cached_snapshot(snapshot, part_hash, extractor_version, cache_dir=DEFAULT_CACHE_DIR):
+    save_snapshot(cache_path(part_hash, extractor_version, cache_dir), snapshot, extractor_version, part_hash)
+
+
+def feature_graph_path(part_path, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Ablage des Feature-Graphen eines Teils. Schlüssel ist der Pfad der Teiledatei und nicht ihr Hash,
+    damit eine erneute Abgabe unter demselben Namen den Graphen der vorherigen Abgabe wiederfindet.
+    """
+    path_key = hashlib.sha256(os.path.normcase(os.path.abspath(part_path)).encode("utf-8")).hexdigest()[:32]
+    return os.path.join(cache_dir, "feature_graphs", f"{path_key}.json")
+
+
+def save_feature_graph(path, snapshot, extractor_version):
+    """Speichert Feature-Graph und Feature-Records einer Momentaufnahme für die nächste Abgabe."""
+    content = json.dumps({
+        "extractor_version": extractor_version,
+        "feature_graph": snapshot.feature_graph.to_dict(),
+        "features": [feature_to_dict(feature) for feature in snapshot.features]
+    })
+    _write_atomically(path, ".json", lambda tmp_file: tmp_file.write(content.encode("utf-8")))
+
+
+def load_feature_graph(path, extractor_version):
+    """
+    Lädt den gespeicherten Feature-Graphen als (FeatureGraph, {Journal-Identifier: Record}).
+    Liefert (None, {}), wenn nichts Passendes gespeichert ist.
+    """
+    if not os.path.isfile(path):
+        return None, {}
+    try:
+        with open(path, encoding="utf-8") as graph_file:
+            content = json.load(graph_file)
+        if content.get("extractor_version") != extractor_version:
+            return None, {}
+        records = [feature_from_dict(feature) for feature in content["features"]]
+        return FeatureGraph.from_dict(content["feature_graph"]), {record.journal_id: record for record in records}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, {}
@@ -0,0 +1,216 @@
+from collections import namedtuple
+from itertools import product
+
+import numpy as np
+
+from edgegeometry import distance_matrix
+
+# Faktoren für den Hash einer Gitterzelle; Kollisionen liefern nur zusätzliche Kandidaten
+_HASH_FACTORS = np.array([73856093, 19349663, 83492791], dtype=np.int64)
+# Die 27 Zellen um eine Zelle (einschließlich der Zelle selbst)
+_NEIGHBOUR_OFFSETS = np.array(list(product((-1, 0, 1), repeat=3)), dtype=np.int64)
+
+# Ergebnis eines Kantenabgleichs: pairs als (Referenzindex, Kantenindex), missing/extra als Indexlisten
+EdgeMatch = namedtuple("EdgeMatch", "pairs missing extra")
+
+# Zulässige Abweichung von Endpunkten und Länge beim Kantenabgleich
+DEFAULT_EDGE_TOLERANCE = 1e-2
+# Mittlere Anzahl an Punkten, die eine Anfrage in ihrer eigenen Zelle höchstens vorfinden soll
+TARGET_CELL_OCCUPANCY = 4
+# Untergrenze der Zellgröße, damit Punktwolken ohne Ausdehnung nicht durch 0 teilen
+MIN_CELL_SIZE = 1e-9
+
+# Kantenindizes der Referenzpakete, Schlüssel (Paketpfad, Paketversion, Toleranz)
+_reference_edge_indices = {}
+
+
+def _expand_ranges(first, counts):
+    """Löst Bereiche [first, first + counts) je Anfrage in Paare (Anfrageindex, Position) auf."""
+    total = int(counts.sum())
+    ramp = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(np.arange(len(first)), counts), np.repeat(first, counts) + ramp
+
+
+class PointGrid:
+    """
+    Gleichmäßiges Gitter über einer Punktwolke. Die Punkte liegen nach dem Hash ihrer Zelle
+    sortiert vor, sodass die Kandidaten für beliebig viele Anfragepunkte gemeinsam über
+    np.searchsorted bestimmt werden.
+
+    Ohne vorgegebene Zellgröße wird sie so lange halbiert, bis ein Punkt im Mittel höchstens
+    TARGET_CELL_OCCUPANCY Punkte in seiner Zelle teilt. Anfragen, die in dünn besetzten Bereichen
+    keinen ausreichend nahen Kandidaten finden, werden an ein gröberes Gitter weitergereicht.
+    """
+
+    def __init__(self, points, cell_size=None):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.extent = float(np.ptp(self.points, axis=0).max()) if len(self.points) else 0.0
+        if cell_size is None:
+            # Leere Wolken, Einzelpunkte und zusammenfallende Punkte haben keine Ausdehnung
+            cell_size = max(self.extent / max(round(len(self.points) ** (1 / 3)), 1), MIN_CELL_SIZE)
+            for _ in range(16):
+                _, counts = np.unique(self._keys(self._cells(self.points, cell_size)), return_counts=True)
+                if cell_size <= MIN_CELL_SIZE or (counts.astype(np.float64) ** 2).sum() <= TARGET_CELL_OCCUPANCY * len(self.points):
+                    break
+                cell_size /= 2
+        self.cell_size = max(float(cell_size), MIN_CELL_SIZE)
+        keys = self._keys(self._cells(self.points, self.cell_size))
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+        self._coarser = None
+
+    def coarser(self):
+        """Gröberes Gitter (vierfache Zellgröße) über denselben Punkten, einmal aufgebaut."""
+        if self._coarser is None:
+            self._coarser = PointGrid(self.points, self.cell_size * 4)
+        return self._coarser
+
+    def _cells(self, points, cell_size=None):
+        return np.floor(points / (self.cell_size if cell_size is None else cell_size)).astype(np.int64)
+
+    @staticmethod
+    def _keys(cells):
+        return np.bitwise_xor.reduce(cells * _HASH_FACTORS, axis=1)
+
+    def candidates(self, queries):
+        """
+        Kandidatenpaare (Anfrageindex, Punktindex) aller Punkte in den 27 Zellen um jeden
+        Anfragepunkt.
+        """
+        cells = self._cells(np.asarray(queries, dtype=np.float64).reshape(-1, 3))
+        query_ids = [np.zeros(0, dtype=np.int64)]
+        point_ids = [np.zeros(0, dtype=np.int64)]
+        for offset in _NEIGHBOUR_OFFSETS:
+            keys = self._keys(cells + offset)
+            first = np.searchsorted(self._sorted_keys, keys, side="left")
+            counts = np.searchsorted(self._sorted_keys, keys, side="right") - first
+            owners, positions = _expand_ranges(first, counts)
+            query_ids.append(owners)
+            point_ids.append(self._order[positions])
+        return np.concatenate(query_ids), np.concatenate(point_ids)
+
+    def nearest(self, queries):
+        """
+        Nächster Punkt zu jedem Anfragepunkt als (Indizes, Abstände). Liegt der beste Kandidat
+        aus den Nachbarzellen weiter als eine Zellgröße entfernt, kann ein näherer Punkt außerhalb
+        liegen; solche Anfragen gehen an das gröbere Gitter, zuletzt blockweise gegen alle Punkte.
+        """
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+        indices = np.full(len(queries), -1, dtype=np.int64)
+        distances = np.full(len(queries), np.inf)
+        if len(self.points) == 0:
+            return indices, distances
+
+        query_ids, point_ids = self.candidates(queries)
+        candidate_distances = np.sqrt(((queries[query_ids] - self.points[point_ids]) ** 2).sum(axis=1))
+        order = np.lexsort((candidate_distances, query_ids))
+        query_ids = query_ids[order]
+        best = np.flatnonzero(np.r_[True, query_ids[1:] != query_ids[:-1]]) if len(query_ids) else order
+        indices[query_ids[best]] = point_ids[order][best]
+        distances[query_ids[best]] = candidate_distances[order][best]
+
+        unresolved = np.flatnonzero(distances > self.cell_size)
+        if len(unresolved) == 0:
+            return indices, distances
+        if self.cell_size < self.extent:
+            indices[unresolved], distances[unresolved] = self.coarser().nearest(queries[unresolved])
+            return indices, distances
+        for first in range(0, len(unresolved), 256):
+            block = unresolved[first:first + 256]
+            block_distances = distance_matrix(queries[block], self.points)
+            indices[block] = block_distances.argmin(axis=1)
+            distances[block] = block_distances[np.arange(len(block)), indices[block]]
+        return indices, distances
+
+
+class EdgeIndex:
+    """
+    Index über Kanten, dessen Gitterzellen die Größe der Toleranz haben und nach der Kantenmitte
+    vergeben werden. Eine Anfragekante findet so in erwartet konstanter Zeit alle Kanten, deren
+    Mitte höchstens tolerance entfernt liegt; anschließend werden Endpunkte (in beiden
+    Laufrichtungen) und Länge geprüft.
+
+    Bei geschlossenen Kanten (Kreise, Start = Ende) legt NX den Nahtpunkt beliebig auf die Kurve.
+    Sie werden daher über ihre Länge gesucht (sortiert, np.searchsorted) und passen, wenn ihr
+    Nahtpunkt höchstens einen Kreisdurchmesser vom Nahtpunkt der Referenz entfernt liegt.
+    """
+
+    def __init__(self, starts, ends, lengths=None, tolerance=DEFAULT_EDGE_TOLERANCE):
+        self.starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+        self.ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+        self.lengths = None if lengths is None else np.asarray(lengths, dtype=np.float64)
+        self.tolerance = tolerance
+        closed = self._closed(self.starts, self.ends, self.lengths)
+        self._open_ids = np.flatnonzero(~closed)
+        self._grid = PointGrid((self.starts[self._open_ids] + self.ends[self._open_ids]) / 2, cell_size=tolerance)
+        closed_ids = np.flatnonzero(closed)
+        self._closed_ids = closed_ids[np.argsort(self.lengths[closed_ids], kind="stable")] if len(closed_ids) else closed_ids
+        self._closed_lengths = self.lengths[self._closed_ids] if len(closed_ids) else np.zeros(0)
+
+    def _closed(self, starts, ends, lengths):
+        if lengths is None:
+            return np.zeros(len(starts), dtype=bool)
+        return np.sqrt(((starts - ends) ** 2).sum(axis=1)) <= self.tolerance
+
+    def candidates(self, starts, ends, lengths=None):
+        """Passende Paare (Anfrageindex, Kantenindex) mit ihrer Abweichung."""
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+        lengths = None if lengths is None or self.lengths is None else np.asarray(lengths, dtype=np.float64)
+
+        def distance(points_a, points_b):
+            return np.sqrt(((points_a - points_b) ** 2).sum(axis=1))
+
+        closed = self._closed(starts, ends, lengths)
+        open_queries = np.flatnonzero(~closed)
+        query_ids, grid_ids = self._grid.candidates((starts[open_queries] + ends[open_queries]) / 2)
+        query_ids, edge_ids = open_queries[query_ids], self._open_ids[grid_ids]
+        forward = np.maximum(distance(starts[query_ids], self.starts[edge_ids]),
+                             distance(ends[query_ids], self.ends[edge_ids]))
+        backward = np.maximum(distance(starts[query_ids], self.ends[edge_ids]),
+                              distance(ends[query_ids], self.starts[edge_ids]))
+        errors = np.minimum(forward, backward)
+
+        if lengths is not None:
+            errors = np.maximum(errors, np.abs(lengths[query_ids] - self.lengths[edge_ids]))
+            closed_queries = np.flatnonzero(closed)
+            first = np.searchsorted(self._closed_lengths, lengths[closed_queries] - self.tolerance, side="left")
+            counts = np.searchsorted(self._closed_lengths, lengths[closed_queries] + self.tolerance, side="right") - first
+            owners, positions = _expand_ranges(first, counts)
+            closed_query_ids, closed_edge_ids = closed_queries[owners], self._closed_ids[positions]
+            diameters = self.lengths[closed_edge_ids] / np.pi
+            closed_errors = np.maximum(np.abs(lengths[closed_query_ids] - self.lengths[closed_edge_ids]),
+                                       distance(starts[closed_query_ids], self.starts[closed_edge_ids]) - diameters)
+            query_ids = np.concatenate([query_ids, closed_query_ids])
+            edge_ids = np.concatenate([edge_ids, closed_edge_ids])
+            errors = np.concatenate([errors, np.maximum(closed_errors, 0.0)])
+
+        keep = errors <= self.tolerance
+        return query_ids[keep], edge_ids[keep], errors[keep]
+
+    def match(self, starts, ends, lengths=None):
+        """
+        Eins-zu-eins-Zuordnung der Anfragekanten zu den indizierten Kanten, beste Paare zuerst.
+        Liefert die Paare, die nicht gefundenen indizierten Kanten (missing) und die übrigen
+        Anfragekanten (extra).
+        """
+        query_ids, edge_ids, errors = self.candidates(starts, ends, lengths)
+        edge_used = np.zeros(len(self.starts), dtype=bool)
+        query_used = np.zeros(len(np.asarray(starts).reshape(-1, 3)), dtype=bool)
+        pairs = []
+        for pair in np.argsort(errors, kind="stable"):
+            query_idx, edge_idx = query_ids[pair], edge_ids[pair]
+            if not edge_used[edge_idx] and not query_used[query_idx]:
+                edge_used[edge_idx] = query_used[query_idx] = True
+                pairs.append((int(edge_idx), int(query_idx)))
+        pairs.sort()
+        return EdgeMatch(pairs, np.flatnonzero(~edge_used).tolist(), np.flatnonzero(~query_used).tolist())
+
+
+def reference_edge_index(pack, tolerance=DEFAULT_EDGE_TOLERANCE):
+    """Kantenindex über den Referenzkanten eines Pakets, einmal je Paketversion aufgebaut."""
+    key = (pack.path, pack.pack_version, tolerance)
+    if key not in _reference_edge_indices:
+        _reference_edge_indices[key] = EdgeIndex(pack.array("edge_starts"), pack.array("edge_ends"),
+                                                 pack.array("edge_lengths"), tolerance)
+    return _reference_edge_indices[key]
@@ -0,0 +1,319 @@
+from collections import namedtuple
+
+import numpy as np
+
+from expressions import ExpressionTable
+from featuregraph import FeatureGraph
+from featurerecords import feature_from_dict
+from massproperties import MassProperties
+
+# Feste Kodierung der Flächen- und Kantentypen für die spaltenweise Ablage.
+# Die Namen entsprechen den Ausgaben von face_type_to_string / edge_type_to_string.
+FACE_TYPE_NAMES = (
+    "Rubber", "Planar", "Cylindrical", "Conical", "Spherical", "Surface of Revolution",
+    "Parametric", "Blending", "Offset", "Swept", "Convergent", "Undefined"
+)
+EDGE_TYPE_NAMES = (
+    "Rubber", "Linear", "Circular", "Elliptical", "Intersection", "Spline", "SP Curve",
+    "Foreign", "Constant Parameter", "Trimmed Curve", "Convergent", "Undefined"
+)
+
+CURVE_KIND_NAMES = ("Line", "Arc")
+
+# Leichtgewichtige Datensätze der Traversierungs-API; Arrays darin sind Sichten, keine Kopien
+BodyRecord = namedtuple("BodyRecord", "index name journal_id face_count edge_count")
+FaceRecord = namedtuple("FaceRecord", "index body type edge_ids edge_lengths")
+CurveRecord = namedtuple("CurveRecord", "index sketch kind length radius center start end")
+
+_FACE_TYPE_CODES = {name: code for code, name in enumerate(FACE_TYPE_NAMES)}
+_EDGE_TYPE_CODES = {name: code for code, name in enumerate(EDGE_TYPE_NAMES)}
+
+
+def face_type_code(name):
+    """Liefert den Code eines Flächentyps, unbekannte Typen werden als 'Undefined' abgelegt."""
+    return _FACE_TYPE_CODES.get(name, _FACE_TYPE_CODES["Undefined"])
+
+
+def edge_type_code(name):
+    """Liefert den Code eines Kantentyps, unbekannte Typen werden als 'Undefined' abgelegt."""
+    return _EDGE_TYPE_CODES.get(name, _EDGE_TYPE_CODES["Undefined"])
+
+
+def curve_kind_code(name):
+    return CURVE_KIND_NAMES.index(name)
+
+
+def _tags_or_index(tags, count):
+    if tags is None:
+        return np.arange(count, dtype=np.int64)
+    return np.asarray(tags, dtype=np.int64)
+
+
+def _measured(values, shape):
+    if values is None:
+        return np.full(shape, np.nan)
+    return np.asarray(values, dtype=np.float64).reshape(shape)
+
+
+def _csr_from_pairs(keys, values, key_count):
+    """Gruppiert values nach keys und liefert (offsets, values) im CSR-Layout."""
+    order = np.argsort(keys, kind='stable')
+    offsets = np.searchsorted(keys[order], np.arange(key_count + 1))
+    return offsets, values[order]
+
+
+class PartSnapshot:
+    """
+    Spaltenweise Momentaufnahme der Topologie eines Teils.
+
+    Alle Körper, Flächen und Kanten liegen in NumPy-Arrays. Die Kanten eines Körpers
+    bzw. die Flächen eines Körpers sind zusammenhängend abgelegt; die Zuordnung
+    Fläche -> Kanten erfolgt über face_edge_offsets und face_edge_ids (CSR-Layout).
+    Skizzenkurven (Linien und Bögen) sind ebenso je Skizze zusammenhängend abgelegt.
+    features enthält die Parameter der Features als unveränderliche Records (featurerecords.py),
+    feature_graph ihre Abhängigkeiten (featuregraph.py), expressions die Ausdruckstabelle
+    des Teils (Name -> rechte Seite, ausgewertet über expression_table).
+    """
+
+    # Felder, die als Arrays bzw. als JSON-Metadaten gespeichert werden (siehe snapshotcache.py)
+    ARRAY_FIELDS = (
+        "body_face_offsets", "body_edge_offsets", "face_types", "face_edge_offsets", "face_edge_ids",
+        "edge_lengths", "edge_types", "edge_starts", "edge_ends", "body_tags", "face_tags", "edge_tags",
+        "sketch_curve_offsets", "curve_kinds", "curve_lengths", "curve_radii", "curve_centers",
+        "curve_starts", "curve_ends", "body_masses", "body_areas", "body_volumes", "body_centroids", "body_inertia"
+    )
+    META_FIELDS = ("body_names", "body_journal_ids", "sketch_names", "sketch_feature_ids", "features", "feature_graph",
+                   "expressions")
+
+    def __init__(self, body_names, body_journal_ids, body_face_offsets, body_edge_offsets,
+                 face_types, face_edge_offsets, face_edge_ids,
+                 edge_lengths, edge_types, edge_starts, edge_ends,
+                 body_tags=None, face_tags=None, edge_tags=None,
+                 sketch_names=(), sketch_curve_offsets=(0,), curve_kinds=(), curve_lengths=(),
+                 curve_radii=(), curve_centers=(), curve_starts=(), curve_ends=(), features=(),
+                 sketch_feature_ids=None, feature_graph=None, expressions=None,
+                 body_masses=None, body_areas=None, body_volumes=None, body_centroids=None, body_inertia=None):
+        self.body_names = list(body_names)
+        self.body_journal_ids = list(body_journal_ids)
+        self.body_face_offsets = np.asarray(body_face_offsets, dtype=np.int64)
+        self.body_edge_offsets = np.asarray(body_edge_offsets, dtype=np.int64)
+        self.face_types = np.asarray(face_types, dtype=np.int8)
+        self.face_edge_offsets = np.asarray(face_edge_offsets, dtype=np.int64)
+        self.face_edge_ids = np.asarray(face_edge_ids, dtype=np.int64)
+        self.edge_lengths = np.asarray(edge_lengths, dtype=np.float64)
+        self.edge_types = np.asarray(edge_types, dtype=np.int8)
+        self.edge_starts = np.asarray(edge_starts, dtype=np.float64).reshape(-1, 3)
+        self.edge_ends = np.asarray(edge_ends, dtype=np.float64).reshape(-1, 3)
+        # NX-Tags der Objekte; ohne Tags wird der Index als Schlüssel verwendet
+        self.body_tags = _tags_or_index(body_tags, len(self.body_names))
+        self.face_tags = _tags_or_index(face_tags, len(self.face_types))
+        self.edge_tags = _tags_or_index(edge_tags, len(self.edge_lengths))
+        # Masseneigenschaften je Körper (g, mm, siehe massproperties.py); NaN für nicht gemessene Körper
+        body_count = len(self.body_names)
+        self.body_masses = _measured(body_masses, (body_count,))
+        self.body_areas = _measured(body_areas, (body_count,))
+        self.body_volumes = _measured(body_volumes, (body_count,))
+        self.body_centroids = _measured(body_centroids, (body_count, 3))
+        self.body_inertia = _measured(body_inertia, (body_count, 3, 3))
+        # Skizzenkurven; Radius und Mittelpunkt nur für Bögen, Start- und Endpunkt nur für Linien (sonst NaN)
+        self.sketch_names = list(sketch_names)
+        self.sketch_curve_offsets = np.asarray(sketch_curve_offsets, dtype=np.int64)
+        self.curve_kinds = np.asarray(curve_kinds, dtype=np.int8)
+        self.curve_lengths = np.asarray(curve_lengths, dtype=np.float64)
+        self.curve_radii = np.asarray(curve_radii, dtype=np.float64)
+        self.curve_centers = np.asarray(curve_centers, dtype=np.float64).reshape(-1, 3)
+        self.curve_starts = np.asarray(curve_starts, dtype=np.float64).reshape(-1, 3)
+        self.curve_ends = np.asarray(curve_ends, dtype=np.float64).reshape(-1, 3)
+        # Journal-Identifier des Skizzen-Features je Skizze (None, falls unbekannt)
+        self.sketch_feature_ids = list(sketch_feature_ids) if sketch_feature_ids is not None else [None] * len(self.sketch_names)
+        self.features = [feature_from_dict(feature) if isinstance(feature, dict) else feature for feature in features]
+        self.feature_graph = FeatureGraph.from_dict(feature_graph) if isinstance(feature_graph, dict) else feature_graph
+        self.expressions = dict(expressions or {})
+        self._topology = None
+        self._expression_table = None
+
+    @property
+    def body_count(self):
+        return len(self.body_names)
+
+    @property
+    def face_count(self):
+        return len(self.face_types)
+
+    @property
+    def edge_count(self):
+        return len(self.edge_lengths)
+
+    @property
+    def sketch_count(self):
+        return len(self.sketch_names)
+
+    @property
+    def topology(self):
+        """Halbkanten-Modell der Momentaufnahme, wird beim ersten Zugriff aufgebaut."""
+        if self._topology is None:
+            self._topology = HalfEdgeModel(self)
+        return self._topology
+
+    @property
+    def expression_table(self):
+        """Ausdruckstabelle mit zwischengespeicherten Werten, wird beim ersten Zugriff aufgebaut."""
+        if self._expression_table is None:
+            self._expression_table = ExpressionTable(self.expressions)
+        return self._expression_table
+
+    @property
+    def edge_bodies(self):
+        """Körperindex jeder Kante."""
+        return np.repeat(np.arange(self.body_count), np.diff(self.body_edge_offsets))
+
+    def body_face_range(self, body_idx):
+        """Indexbereich der Flächen eines Körpers."""
+        return range(self.body_face_offsets[body_idx], self.body_face_offsets[body_idx + 1])
+
+    def face_body(self, face_idx):
+        """Körperindex einer Fläche."""
+        return int(np.searchsorted(self.body_face_offsets, face_idx, side='right')) - 1
+
+    def body_edge_range(self, body_idx):
+        """Indexbereich der Kanten eines Körpers."""
+        return range(self.body_edge_offsets[body_idx], self.body_edge_offsets[body_idx + 1])
+
+    def face_type_name(self, face_idx):
+        return FACE_TYPE_NAMES[self.face_types[face_idx]]
+
+    def edge_type_name(self, edge_idx):
+        return EDGE_TYPE_NAMES[self.edge_types[edge_idx]]
+
+    def face_edges(self, face_idx):
+        """Kantenindizes einer Fläche in der Reihenfolge von face.GetEdges()."""
+        return self.face_edge_ids[self.face_edge_offsets[face_idx]:self.face_edge_offsets[face_idx + 1]]
+
+    def face_edge_lengths(self, face_idx):
+        return self.edge_lengths[self.face_edges(face_idx)]
+
+    def sketch_curves(self, sketch_idx, kind=None):
+        """Kurvenindizes einer Skizze, optional nur einer Kurvenart ("Line" oder "Arc")."""
+        curves = np.arange(self.sketch_curve_offsets[sketch_idx], self.sketch_curve_offsets[sketch_idx + 1])
+        if kind is not None:
+            curves = curves[self.curve_kinds[curves] == curve_kind_code(kind)]
+        return curves
+
+    def sketch_line_lengths(self, sketch_idx):
+        return self.curve_lengths[self.sketch_curves(sketch_idx, "Line")]
+
+    def sketch_arc_radii(self, sketch_idx):
+        return self.curve_radii[self.sketch_curves(sketch_idx, "Arc")]
+
+    def body_mass_properties(self, body_idx):
+        """Masseneigenschaften eines Körpers aus der Momentaufnahme, ohne NX-Messung."""
+        return MassProperties(float(self.body_masses[body_idx]), float(self.body_areas[body_idx]),
+                              float(self.body_volumes[body_idx]), self.body_centroids[body_idx],
+                              self.body_inertia[body_idx])
+
+    def features_of_kind(self, kind):
+        """Parameter aller Features einer Art, z. B. "Extrude" oder "PatternFeature"."""
+        return [feature for feature in self.features if feature.kind == kind]
+
+
+class HalfEdgeModel:
+    """
+    Halbkanten-Modell über einer PartSnapshot mit ganzzahligen Ids für Kanten und Flächen.
+
+    Jede Kante wird genau einmal gespeichert; jedes Vorkommen einer Kante an einer Fläche ist eine
+    Halbkante. Aus den Halbkanten folgen die an eine Kante angrenzenden Flächen (edge_faces) und
+    die Flächennachbarschaft als CSR-Liste.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        face_count = snapshot.face_count
+        edge_count = snapshot.edge_count
+
+        # Halbkanten in der Reihenfolge von face.GetEdges(), nach Kanten gruppiert
+        half_edge_faces = np.repeat(np.arange(face_count), np.diff(snapshot.face_edge_offsets))
+        edge_half_edge_offsets, edge_half_edges = _csr_from_pairs(
+            snapshot.face_edge_ids, np.arange(len(half_edge_faces)), edge_count)
+
+        # Angrenzende Flächen je Kante (-1 bei Rand- bzw. nicht-mannigfaltigen Kanten)
+        uses = np.diff(edge_half_edge_offsets)
+        first = edge_half_edge_offsets[:-1]
+        manifold = np.flatnonzero(uses == 2)
+        used = np.flatnonzero(uses >= 1)
+        self.edge_faces = np.full((edge_count, 2), -1, dtype=np.int64)
+        self.edge_faces[used, 0] = half_edge_faces[edge_half_edges[first[used]]]
+        self.edge_faces[manifold, 1] = half_edge_faces[edge_half_edges[first[manifold] + 1]]
+
+        # Flächennachbarschaft über gemeinsame Kanten (symmetrisch, ohne Duplikate)
+        pairs = self.edge_faces[manifold]
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        pairs = np.unique(np.concatenate([pairs, pairs[:, ::-1]]), axis=0).reshape(-1, 2)
+        self.face_neighbour_offsets, self.face_neighbour_ids = _csr_from_pairs(
+            pairs[:, 0], pairs[:, 1], face_count)
+
+    def face_neighbours(self, face_idx):
+        """Flächen, die mit face_idx mindestens eine Kante teilen."""
+        return self.face_neighbour_ids[self.face_neighbour_offsets[face_idx]:self.face_neighbour_offsets[face_idx + 1]]
+
+
+def _type_mask(codes, names, code_of):
+    """Maske für eine Typfilterung; None bedeutet keine Einschränkung."""
+    if names is None:
+        return None
+    if isinstance(names, str):
+        names = (names,)
+    return np.isin(codes, [code_of(name) for name in names])
+
+
+def _selected(count, masks, offsets=None, index=None):
+    """
+    Kombiniert Filtermasken und schränkt optional auf einen Bereich offsets[index]:offsets[index + 1] ein.
+    Liefert die Indizes der passenden Einträge.
+    """
+    start, stop = (0, count) if index is None else (int(offsets[index]), int(offsets[index + 1]))
+    mask = np.ones(stop - start, dtype=bool)
+    for extra in masks:
+        if extra is not None:
+            mask &= extra[start:stop]
+    return np.flatnonzero(mask) + start
+
+
+def iter_bodies(snapshot):
+    """Liefert die Körper der Momentaufnahme als BodyRecord."""
+    face_counts = np.diff(snapshot.body_face_offsets)
+    edge_counts = np.diff(snapshot.body_edge_offsets)
+    for body_idx in range(snapshot.body_count):
+        yield BodyRecord(body_idx, snapshot.body_names[body_idx], snapshot.body_journal_ids[body_idx],
+                         int(face_counts[body_idx]), int(edge_counts[body_idx]))
+
+
+def iter_faces(snapshot, types=None, body=None):
+    """
+    Liefert Flächen als FaceRecord, optional gefiltert nach Flächentyp(en) und Körperindex.
+    Die Filter werden vektorisiert ausgewertet, bevor der erste Datensatz erzeugt wird.
+    """
+    face_bodies = None
+    for face_idx in _selected(snapshot.face_count, [_type_mask(snapshot.face_types, types, face_type_code)],
+                              snapshot.body_face_offsets, body):
+        edge_ids = snapshot.face_edges(face_idx)
+        if body is None:
+            if face_bodies is None:
+                face_bodies = np.repeat(np.arange(snapshot.body_count), np.diff(snapshot.body_face_offsets))
+            face_body = int(face_bodies[face_idx])
+        else:
+            face_body = body
+        yield FaceRecord(int(face_idx), face_body, FACE_TYPE_NAMES[snapshot.face_types[face_idx]],
+                         edge_ids, snapshot.edge_lengths[edge_ids])
+
+
+def iter_sketch_curves(snapshot, kinds=None, sketch=None, min_length=None):
+    """Liefert Skizzenkurven als CurveRecord, optional gefiltert nach Kurvenart(en), Skizze und Mindestlänge."""
+    masks = [
+        _type_mask(snapshot.curve_kinds, kinds, curve_kind_code),
+        None if min_length is None else snapshot.curve_lengths >= min_length
+    ]
+    curve_sketches = np.repeat(np.arange(snapshot.sketch_count), np.diff(snapshot.sketch_curve_offsets))
+    for curve_idx in _selected(len(snapshot.curve_kinds), masks, snapshot.sketch_curve_offsets, sketch):
+        yield CurveRecord(int(curve_idx), int(curve_sketches[curve_idx]), CURVE_KIND_NAMES[snapshot.curve_kinds[curve_idx]],
+                          float(snapshot.curve_lengths[curve_idx]), float(snapshot.curve_radii[curve_idx]),
+                          snapshot.curve_centers[curve_idx], snapshot.curve_starts[curve_idx], snapshot.curve_ends[curve_idx])
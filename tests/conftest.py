@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Die Module liegen wie in NX als flache Journal-Skripte in VT1 bzw. UE1
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("VT1", "UE1"):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from topology import PartSnapshot, curve_kind_code, edge_type_code, face_type_code  # noqa: E402
+
+
+def box_snapshot(width=20.0, depth=10.0, height=5.0, sketches=((31.0, 7.0, 31.0, 7.0),)):
+    """
+    Momentaufnahme eines Quaders, wie sie extract_part_snapshot liefern würde, mit je einer
+    Linienskizze pro Eintrag in sketches. Kanten 0-3 liegen unten, 4-7 oben, 8-11 senkrecht.
+    """
+    corners = np.array([(0, 0, 0), (width, 0, 0), (width, depth, 0), (0, depth, 0)], dtype=np.float64)
+    top = corners + (0, 0, height)
+    starts = np.vstack([corners, top, corners])
+    ends = np.vstack([np.roll(corners, -1, axis=0), np.roll(top, -1, axis=0), top])
+    lengths = np.sqrt(((ends - starts) ** 2).sum(axis=1))
+    faces = [[0, 1, 2, 3], [4, 5, 6, 7], [0, 9, 4, 8], [1, 10, 5, 9], [2, 11, 6, 10], [3, 8, 7, 11]]
+
+    sketch_lengths = [length for lengths in sketches for length in lengths]
+    offsets = np.cumsum([0] + [len(lengths) for lengths in sketches])
+    x = np.concatenate([np.cumsum((0.0,) + tuple(lengths[:-1])) for lengths in sketches])
+    curve_starts = [(value, 0.0, 0.0) for value in x]
+    curve_ends = [(value + length, 0.0, 0.0) for value, length in zip(x, sketch_lengths)]
+    return PartSnapshot(
+        ["box"], ["BOX"], [0, 6], [0, 12],
+        [face_type_code("Planar")] * 6, np.arange(0, 25, 4), sum(faces, []),
+        lengths, [edge_type_code("Linear")] * 12, starts, ends,
+        sketch_names=[f"SKETCH_{idx:03d}" for idx in range(len(sketches))], sketch_curve_offsets=offsets,
+        curve_kinds=[curve_kind_code("Line")] * len(sketch_lengths), curve_lengths=sketch_lengths,
+        curve_radii=[np.nan] * len(sketch_lengths), curve_centers=[(np.nan,) * 3] * len(sketch_lengths),
+        curve_starts=curve_starts, curve_ends=curve_ends, sketch_feature_ids=[f"SKETCH({idx + 1})" for idx in range(len(sketches))],
+        expressions={"p1": "31", "p2": "p1/2"},
+        body_masses=[7.85], body_areas=[700.0], body_volumes=[1000.0], body_centroids=[(10.0, 5.0, 2.5)],
+        body_inertia=[np.eye(3)])
+
+
+@pytest.fixture
+def snapshot():
+    return box_snapshot()
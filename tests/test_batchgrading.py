@@ -0,0 +1,29 @@
+from batchgrading import BatchItem, BatchRunner, StandInSession
+from results import GradingResult, read_results
+
+
+def grade(part, exercise):
+    if part.Leaf == "defekt":
+        raise ValueError("keine Körper")
+    return GradingResult(exercise, part.Leaf, None, 7, {"geprueft": True}, 10, 10, {})
+
+
+def test_runner_keeps_going_after_failures_and_closes_every_opened_part(tmp_path):
+    for name in ("gut", "defekt", "gesperrt"):
+        (tmp_path / f"{name}.prt").write_bytes(b"prt")
+    items = [BatchItem(str(tmp_path / f"{name}.prt"), "vt1") for name in ("gut", "fehlt", "defekt", "gesperrt")]
+    session = StandInSession(failing=[items[3].part_path])
+    messages = []
+    results_file = str(tmp_path / "ergebnisse.jsonl")
+    outcomes = BatchRunner(session, grade, results_file=results_file, extractor_version=7, log=messages.append).run(items)
+
+    assert [outcome.status for outcome in outcomes] == ["ok", "ladefehler", "pruefungsfehler", "ladefehler"]
+    assert outcomes[0].error is None and outcomes[0].result.checks == {"geprueft": True}
+    assert outcomes[2].error == "Prüfung fehlgeschlagen: keine Körper"
+    assert outcomes[1].result.extractor_version == 7 and outcomes[1].result.score is None
+    assert session.opened == session.closed == [items[0].part_path, items[2].part_path]
+
+    results = read_results(results_file)
+    assert [result.part_name for result in results] == ["gut", "fehlt.prt", "defekt.prt", "gesperrt.prt"]
+    assert [result.error is None for result in results] == [True, False, False, False]
+    assert len(messages) == 7
@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import box_snapshot
+from evaluate import evaluate_snapshot, evaluate_snapshots, snapshots_in
+from snapshotcache import EXTRACTOR_VERSION, save_snapshot
+
+
+def saved_box(path, exercise, extractor_version=EXTRACTOR_VERSION):
+    save_snapshot(str(path), box_snapshot(), extractor_version, part_hash="abc", part_name="box.prt", exercise=exercise)
+    return str(path)
+
+
+@pytest.mark.parametrize("exercise", ["ue1", "vt1", "ue2", "vt2"])
+def test_box_is_graded_without_nx_and_fails_the_exercise_checks(tmp_path, exercise):
+    path = saved_box(tmp_path / "box.npz", exercise)
+    output = tmp_path / "ausgabe.txt"
+    result = evaluate_snapshot(path, output=str(output))
+    assert result.error is None
+    assert (result.exercise, result.part_name, result.part_hash) == (exercise, "box.prt", "abc")
+    assert result.extractor_version == EXTRACTOR_VERSION
+    assert result.checks["rotationsfeature"] is False
+    assert 0 <= result.checks["flaechen_gefunden"] <= 6
+    assert result.checks["skizzen_wie_musterloesung"] is not True
+    assert output.read_text(encoding="utf-8")
+    if exercise == "ue1":
+        assert result.score == 0 and result.max_score == 10
+
+
+def test_exercise_argument_overrides_stored_exercise(tmp_path):
+    path = saved_box(tmp_path / "box.npz", "ue1")
+    assert evaluate_snapshot(path, exercise="vt1").checks["passfeder"] is False
+    result = evaluate_snapshot(path, exercise="ue9")
+    assert result.error.startswith("Unbekannte Übung 'ue9'")
+    assert result.checks == {}
+
+
+def test_snapshots_of_other_extractor_versions_are_not_graded(tmp_path):
+    result = evaluate_snapshot(saved_box(tmp_path / "alt.npz", "vt1", EXTRACTOR_VERSION - 1))
+    assert result.error.startswith(f"Momentaufnahme mit Extraktorversion {EXTRACTOR_VERSION - 1}")
+    assert result.checks == {}
+    assert evaluate_snapshot(str(tmp_path / "fehlt.npz"), exercise="vt1").error.startswith("Momentaufnahme nicht lesbar")
+
+
+def test_directory_results_keep_path_order_with_workers(tmp_path):
+    (tmp_path / "b").mkdir()
+    paths = [saved_box(tmp_path / "b" / "2.npz", "vt2"), saved_box(tmp_path / "1.npz", "ue2")]
+    (tmp_path / "notiz.txt").write_text("kein Teil")
+    assert snapshots_in(str(tmp_path)) == [paths[1], paths[0]]
+    results = evaluate_snapshots(snapshots_in(str(tmp_path)), output="null", workers=2)
+    assert [result.exercise for result in results] == ["ue2", "vt2"]
+    assert all(result.error is None for result in results)
@@ -0,0 +1,35 @@
+import pytest
+
+from expressions import ExpressionError, ExpressionTable
+
+
+def test_values_follow_dependencies_in_any_order():
+    table = ExpressionTable({"p3": "p2 + sin(30) // Kommentar", "p2": "p1/2", "p1": "31", "p4": "2^3 + sqrt(p1 - 6)"})
+    assert table.values == pytest.approx({"p1": 31.0, "p2": 15.5, "p3": 16.0, "p4": 13.0})
+    assert table.errors == {}
+    assert len(table) == 4 and "p2" in table
+
+
+def test_cycles_and_errors_propagate_to_dependents():
+    table = ExpressionTable({"a": "b + 1", "b": "a * 2", "c": "a + 1", "d": "1 +", "e": "d * 2",
+                             "f": "unbekannt * 2", "g": "1/0", "h": "5"})
+    assert table.values == {"h": 5.0}
+    assert table.errors["a"] == table.errors["b"] == table.errors["c"] == "Zyklische Abhängigkeit"
+    assert "nicht lesbar" in table.errors["d"]
+    assert table.errors["e"] == "Abhängiger Ausdruck 'd' ist nicht auswertbar"
+    assert set(table.errors) == set("abcdefg")
+    with pytest.raises(ExpressionError, match="Zyklische"):
+        table.value("a")
+    with pytest.raises(ExpressionError, match="Unbekannter Ausdruck 'x'"):
+        table.value("x")
+
+
+def test_resolve_answers_numbers_names_and_formulas(snapshot):
+    table = ExpressionTable(snapshot.expressions)
+    assert table.resolve("12.5") == 12.5
+    assert table.resolve("p2") == 15.5
+    assert table.resolve("p2*2") == 31.0
+    assert table.resolve("p2*2") == 31.0
+    for right_hand_side in (None, "p9 + 1", "p1 +"):
+        with pytest.raises(ExpressionError):
+            table.resolve(right_hand_side)
@@ -0,0 +1,74 @@
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from facematching import FaceIndex, assign_reference_faces, face_descriptor, similarity_matrix, solve_assignment
+
+
+def brute_force_cost(cost):
+    rows, cols = cost.shape
+    if rows <= cols:
+        return min(sum(cost[row, col] for row, col in enumerate(perm)) for perm in permutations(range(cols), rows))
+    return min(sum(cost[row, col] for col, row in enumerate(perm)) for perm in permutations(range(rows), cols))
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (4, 4), (3, 5), (5, 3), (6, 6)])
+def test_solve_assignment_is_optimal(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(5):
+        cost = rng.uniform(0, 10, shape)
+        pairs = solve_assignment(cost)
+        assert len(pairs) == min(shape)
+        assert len({row for row, _ in pairs}) == len({col for _, col in pairs}) == len(pairs)
+        assert sum(cost[row, col] for row, col in pairs) == pytest.approx(brute_force_cost(cost))
+
+
+def test_solve_assignment_prefers_diagonal_for_identity_cost():
+    assert solve_assignment(1.0 - np.eye(4)) == [(0, 0), (1, 1), (2, 2), (3, 3)]
+
+
+def test_similarity_matrix_is_one_for_identical_and_drops_with_deviation():
+    descriptors = np.vstack([face_descriptor(np.array(lengths)) for lengths in
+                             ([10.0, 10.0, 20.0, 20.0], [10.0, 10.0, 21.0, 21.0], [1.0, 2.0])])
+    similarity = similarity_matrix(descriptors, descriptors, chunk_rows=1)
+    assert np.allclose(np.diag(similarity), 1.0)
+    assert 0.9 < similarity[0, 1] < 1.0
+    assert similarity[0, 2] < similarity[0, 1]
+    assert ((similarity >= 0.0) & (similarity <= 1.0)).all()
+
+
+def test_assignment_consumes_duplicate_signatures_once():
+    reference = [("Planar", [27.0, 28.958])] * 3
+    current = [("Planar", [28.958, 27.0]), ("Planar", [27.0, 28.958])]
+    assignment = assign_reference_faces(reference, current)
+    assert assignment.found == [0, 1]
+    assert assignment.missing == [2]
+    assert assignment.assigned[2] is None
+    assert assignment.total == pytest.approx(2.0)
+
+
+def test_assignment_accepts_rounding_noise_within_tolerance():
+    assignment = assign_reference_faces([("Planar", [10.0, 20.0])], [("Planar", [10.001, 19.9992])])
+    assert assignment.found == [0]
+    assert assignment.scores[0] == 1.0
+
+
+def test_missing_face_gets_most_similar_remaining_face_of_its_type():
+    reference = [("Planar", [10.0, 10.0, 20.0, 20.0]), ("Cylindrical", [31.4, 31.4])]
+    current = [("Planar", [1.0, 1.0, 2.0, 2.0]), ("Planar", [10.0, 10.0, 21.0, 21.0]), ("Conical", [31.4, 31.4])]
+    assignment = assign_reference_faces(reference, current)
+    assert assignment.found == []
+    assert assignment.missing == [0, 1]
+    assert assignment.assigned[0] == 1
+    assert 0.9 < assignment.scores[0] < 1.0
+    # Flächen anderen Typs werden nie zugeordnet
+    assert assignment.assigned[1] is None and assignment.scores[1] == 0.0
+    assert assignment.total == pytest.approx(assignment.scores.sum())
+
+
+def test_face_index_tolerance_lookup_crosses_cell_boundaries():
+    index = FaceIndex([("Planar", [5.0, 5.0])], tolerance=2e-3)
+    # Der Umfang 9.998 liegt in der Nachbarzelle von 10.0
+    assert index.take_within("Planar", np.array([4.999, 4.999])) == 0
+    assert index.take_within("Planar", np.array([4.999, 4.999])) is None
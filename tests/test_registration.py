@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from registration import icp, register_points, transform_points
+from spatialindex import EdgeIndex, PointGrid
+
+
+def rotation_z(angle):
+    return np.array([[np.cos(angle), -np.sin(angle), 0.0], [np.sin(angle), np.cos(angle), 0.0], [0.0, 0.0, 1.0]])
+
+
+def test_point_grid_nearest_matches_brute_force():
+    rng = np.random.default_rng(3)
+    # Dichte Wolke mit einzelnen weit entfernten Punkten, damit das gröbere Gitter gebraucht wird
+    points = np.vstack([rng.uniform(0, 10, (500, 3)), [[500.0, 0.0, 0.0], [-300.0, 40.0, 9.0]]])
+    queries = np.vstack([rng.uniform(-20, 30, (200, 3)), [[400.0, 10.0, 0.0]]])
+    indices, distances = PointGrid(points).nearest(queries)
+    expected = np.sqrt(((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+    assert np.allclose(distances, expected.min(axis=1))
+    assert np.allclose(expected[np.arange(len(queries)), indices], expected.min(axis=1))
+
+
+def test_point_grid_handles_degenerate_clouds():
+    indices, distances = PointGrid(np.zeros((3, 3))).nearest([[1.0, 0.0, 0.0]])
+    assert indices[0] in (0, 1, 2) and distances[0] == pytest.approx(1.0)
+    indices, distances = PointGrid(np.zeros((0, 3))).nearest([[1.0, 0.0, 0.0]])
+    assert indices[0] == -1 and np.isinf(distances[0])
+
+
+def test_edge_index_matches_reversed_edges_and_closed_curves():
+    starts = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [5.0, 5.0, 0.0]])
+    ends = np.array([[10.0, 0.0, 0.0], [10.0, 10.0, 0.0], [5.0, 5.0, 0.0]])
+    lengths = np.array([10.0, 10.0, 2 * np.pi * 2.0])
+    index = EdgeIndex(starts, ends, lengths, tolerance=1e-2)
+
+    # Kante 0 umgekehrt, der Kreis mit verschobenem Nahtpunkt, dazu eine fremde Kante
+    query_starts = np.array([[10.0, 0.0, 0.0], [7.0, 5.0, 0.0], [50.0, 0.0, 0.0]])
+    query_ends = np.array([[0.0, 0.0, 0.0], [7.0, 5.0, 0.0], [60.0, 0.0, 0.0]])
+    query_lengths = np.array([10.0, 2 * np.pi * 2.0, 10.0])
+    match = index.match(query_starts, query_ends, query_lengths)
+    assert match.pairs == [(0, 0), (2, 1)]
+    assert match.missing == [1]
+    assert match.extra == [2]
+
+
+def test_register_points_recovers_rigid_transform():
+    rng = np.random.default_rng(7)
+    target = rng.uniform(0, 50, (300, 3)) * (1.0, 0.6, 0.3)
+    rotation = rotation_z(0.4)
+    source = (target - (5.0, -3.0, 2.0)) @ rotation
+    registration = register_points(source, target)
+    assert registration.rms < 1e-6
+    assert np.allclose(transform_points(source, registration.rotation, registration.translation), target, atol=1e-6)
+    assert registration.residuals.max() < 1e-6
+
+
+def test_icp_returns_residual_of_the_returned_pose():
+    rng = np.random.default_rng(11)
+    target = rng.uniform(0, 50, (200, 3))
+    source = (target - 4.0) @ rotation_z(0.3)
+    grid = PointGrid(target)
+    for max_iterations in (0, 1, 3):
+        rotation, translation, rms, iterations = icp(source, grid, np.eye(3), np.zeros(3), max_iterations)
+        distances = grid.nearest(transform_points(source, rotation, translation))[1]
+        inliers = distances <= np.quantile(distances, 0.9)
+        assert rms == pytest.approx(np.sqrt(np.mean(distances[inliers] ** 2)))
+        assert iterations <= max_iterations
+
+
+def test_icp_never_returns_a_worse_pose_than_the_start():
+    rng = np.random.default_rng(5)
+    target = rng.uniform(0, 10, (100, 3))
+    grid = PointGrid(target)
+    start_distances = grid.nearest(target)[1]
+    rotation, translation, rms, iterations = icp(target, grid, np.eye(3), np.zeros(3))
+    assert rms <= np.sqrt(np.mean(start_distances ** 2)) + 1e-12
+    assert np.allclose(rotation, np.eye(3)) and np.allclose(translation, 0.0)
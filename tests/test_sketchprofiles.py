@@ -0,0 +1,40 @@
+import math
+
+import pytest
+
+from sketchprofiles import arc_segment, find_closed_profiles, line_segment
+
+
+def polyline(points, first_curve=0):
+    return [line_segment(first_curve + idx, points[idx], points[(idx + 1) % len(points)]) for idx in range(len(points))]
+
+
+def test_rectangle_with_split_side_and_mixed_directions():
+    segments = polyline([(0, 0, 0), (10, 0, 0), (20, 0, 0), (20, 5, 0), (0, 5, 0)])
+    # Umgedrehte Linie: die Orientierung der Kurven ist beliebig
+    segments[3] = line_segment(3, segments[3].end, segments[3].start)
+    (profile,) = find_closed_profiles(segments[::-1])
+    assert profile.shape == "Rechteck"
+    assert sorted(profile.side_lengths) == pytest.approx([5.0, 5.0, 20.0, 20.0])
+    assert sorted(segment.curve for segment in profile.segments) == [0, 1, 2, 3, 4]
+
+
+def test_slot_circle_polygon_and_open_lines_in_one_sketch():
+    radius = 2.0
+    slot = [line_segment("l1", (0, 0, 0), (8, 0, 0)),
+            arc_segment("a1", (8, 0, 0), (8, 4, 0), math.pi * radius, (8, 2, 0), radius),
+            line_segment("l2", (8, 4, 0), (0, 4, 0)),
+            arc_segment("a2", (0, 4, 0), (0, 0, 0), math.pi * radius, (0, 2, 0), radius)]
+    circle = [arc_segment("k", (30, 0, 0), (30, 0, 0), 2 * math.pi, (30, 1, 0), 1.0)]
+    triangle = polyline([(50, 0, 0), (60, 0, 0), (50, 7, 0)], first_curve=10)
+    loose = [line_segment("o1", (70, 0, 0), (75, 0, 0)), line_segment("o2", (75, 0, 0), (75, 3, 0))]
+    profiles = find_closed_profiles(slot + circle + triangle + loose)
+    assert [profile.shape for profile in profiles] == ["Langloch", "Kreis", "Polygon"]
+    assert profiles[1].side_lengths == pytest.approx([2 * math.pi])
+
+
+def test_branching_lines_are_not_a_profile():
+    square = polyline([(0, 0, 0), (4, 0, 0), (4, 4, 0), (0, 4, 0)])
+    # Zusätzliche Linie an einer Ecke: der Zug verzweigt sich
+    assert find_closed_profiles(square + [line_segment(9, (4, 4, 0), (8, 8, 0))]) == []
+    assert [profile.shape for profile in find_closed_profiles(square)] == ["Rechteck"]
@@ -0,0 +1,29 @@
+from conftest import box_snapshot
+from sketchrules import SketchRuleSet, compare_sketch_histograms, sketch_length_histogram, sketch_rule
+
+
+def test_rule_set_checks_lengths_and_counts_within_one_sketch(snapshot):
+    rules = SketchRuleSet([
+        sketch_rule("rechteck", lengths={31.0: 2, 7.0: 2}),
+        sketch_rule("zu_viele", lengths={31.0: 3}),
+        sketch_rule("toleranz", lengths=[31.0004], rel_tol=0.0, abs_tol=5e-4),
+        sketch_rule("ausserhalb", lengths=[31.001], rel_tol=0.0, abs_tol=5e-4),
+        sketch_rule("kreis", radii=[5.0])
+    ])
+    assert rules.evaluate(snapshot) == {"rechteck": True, "zu_viele": False, "toleranz": True,
+                                        "ausserhalb": False, "kreis": False}
+
+
+def test_part_scope_counts_curves_of_all_sketches():
+    merged = box_snapshot(sketches=((31.0, 7.0, 31.0, 7.0), (31.0, 12.0)))
+    rules = SketchRuleSet([sketch_rule("skizze", lengths=[7.0, 12.0]),
+                           sketch_rule("teil", lengths=[7.0, 12.0], scope="part"),
+                           sketch_rule("drei_mal", lengths={31.0: 3}, scope="part")])
+    assert rules.evaluate(merged) == {"skizze": False, "teil": True, "drei_mal": True}
+
+
+def test_histogram_comparison_picks_sketch_with_most_matching_lines(snapshot):
+    assert sketch_length_histogram([31.0, 7.0004, 31.0]) == {7.0: 1, 31.0: 2}
+    references = [{31.0: 2, 7.0: 2}, {31.0: 3, 5.0: 1}, {}]
+    comparisons = compare_sketch_histograms(references, snapshot)
+    assert [(c.reference_sketch, c.sketch, c.matched, c.expected) for c in comparisons] == [(0, 0, 4, 4), (1, 0, 2, 4)]